@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: arranque de cada subcomando de grafo_social.py sobre una cohorte
+sintética chica, donde el costo es casi todo importar bibliotecas.
+Cada subcomando corre en un intérprete nuevo con python -X importtime y se
+reporta: tiempo total, tiempo de imports (suma de los 'self' de importtime) y
+qué bibliotecas pesadas se cargaron. Como referencia, 'imports eager' es lo
+que costaba importar todas ellas al arrancar (como hacían los scripts antes).
+El primer subcomando (ingest) escribe el snapshot; los demás parten de él.
+
+Uso:
+    python benchmarks/bench_arranque.py --persons 3 --accounts 200 --json arranque.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datos_sinteticos import make_cohort
+
+HEAVY = ("pandas", "networkx", "matplotlib", "plotly", "scipy", "pyarrow")
+EAGER = "import pandas, networkx, matplotlib.pyplot, plotly.graph_objects, scipy.sparse"
+SUBCOMMANDS = ["ingest", "similarity", "centrality", "render-png", "render-html", "report"]
+
+
+def run(argv):
+    """(segundos, segundos de imports, bibliotecas pesadas cargadas) de un proceso nuevo"""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    elapsed = time.perf_counter() - t0
+    imports_us, loaded = 0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        imports_us += int(self_us)
+        loaded.add(name.strip())
+    return elapsed, imports_us / 1e6, [m for m in HEAVY if m in loaded]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=3)
+    ap.add_argument("--accounts", type=int, default=200)
+    ap.add_argument("--json", default=None, help="Guarda los resultados en este archivo")
+    args = ap.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir, out_dir = os.path.join(tmp, "data"), os.path.join(tmp, "out")
+        make_cohort(data_dir, persons=args.persons, accounts=args.accounts)
+        cases = [("imports eager", ["-c", EAGER]), ("--help", ["grafo_social.py", "--help"])]
+        cases += [(cmd, ["grafo_social.py", cmd, "--data", data_dir, "--out", out_dir, "--no-cache"])
+                  for cmd in SUBCOMMANDS]
+        print(f"{args.persons} personas, {args.accounts} cuentas por lista")
+        for name, argv in cases:
+            elapsed, imports, loaded = run(argv)
+            results.append(dict(case=name, seconds=round(elapsed, 3), import_seconds=round(imports, 3),
+                                heavy_modules=loaded))
+            print(f"  {name:<14} {elapsed:6.2f}s  imports {imports:5.2f}s  {', '.join(loaded) or '-'}",
+                  flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(dict(persons=args.persons, accounts=args.accounts, results=results), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: betweenness exacta (NetworkX) vs centralidad.betweenness.
+- grafo ego: forma cerrada vs nx.betweenness_centrality
+- grafo unificado: Brandes muestreado con distintos k (y workers), con la
+  correlación de rangos (Spearman) frente al resultado exacto
+
+Uso:
+    python benchmarks/bench_betweenness.py --persons 10 --accounts 1000 --k 32 128 --workers 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+from scipy.stats import spearmanr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_grafo_csr import make_blobs
+from centralidad import betweenness
+from grafo_csr import CSRGraph
+from simbolos import SymbolTable
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def exact_nx(G):
+    btw = nx.betweenness_centrality(G.to_networkx(attrs=False), normalized=True)
+    return np.array([btw[i] for i in range(G.n_nodes)])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=10)
+    ap.add_argument("--accounts", type=int, default=1000)
+    ap.add_argument("--pool", type=int, default=20000)
+    ap.add_argument("--k", type=int, nargs="+", default=[32, 128, 512])
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    table = SymbolTable()
+    blobs = make_blobs(args.persons, args.accounts, args.pool, table)
+
+    ego = CSRGraph.from_blobs(blobs[:1], table)
+    ref, t_ref = timed(lambda: exact_nx(ego))
+    fast, t_fast = timed(lambda: betweenness(ego))
+    print(f"ego: {ego.n_nodes} nodos, {ego.n_edges} aristas")
+    print(f"  networkx      {t_ref:8.3f}s")
+    print(f"  forma cerrada {t_fast:8.3f}s  max |error|={np.abs(fast - ref).max():.2e}")
+
+    G = CSRGraph.from_blobs(blobs, table)
+    ref, t_ref = timed(lambda: exact_nx(G))
+    print(f"unificado: {G.n_nodes} nodos, {G.n_edges} aristas")
+    print(f"  networkx exacta        {t_ref:8.2f}s")
+    exact, t_exact = timed(lambda: betweenness(G, workers=args.workers))
+    print(f"  CSR exacta (w={args.workers})     {t_exact:8.2f}s  max |error|={np.abs(exact - ref).max():.2e}")
+    for k in args.k:
+        est, t_k = timed(lambda: betweenness(G, k=k, seed=args.seed, workers=args.workers))
+        rho = spearmanr(est, ref).statistic
+        print(f"  k={k:<6} (w={args.workers})     {t_k:8.2f}s  spearman={rho:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: clasificación de nodos para los renderers.
+- has_edge: el recorrido original (por nodo, has_edge contra cada persona)
+- NodeClasses: una pasada vectorizada sobre las aristas del CSRGraph
+
+Uso:
+    python benchmarks/bench_clasificacion.py --persons 200 --accounts 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_grafo_csr import make_blobs
+from grafo_csr import CSRGraph
+from simbolos import SymbolTable, KIND_PERSON
+
+
+def has_edge_scan(H, persons):
+    counts, to_person, from_person = {}, {}, {}
+    for n in H.nodes():
+        counts[n] = len({p for p in persons if H.has_edge(p, n) or H.has_edge(n, p)})
+        to_person[n] = any(H.has_edge(n, p) for p in persons)
+        from_person[n] = any(H.has_edge(p, n) for p in persons)
+    return counts, to_person, from_person
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=200)
+    ap.add_argument("--accounts", type=int, default=500)
+    ap.add_argument("--pool", type=int, default=20000)
+    args = ap.parse_args()
+
+    table = SymbolTable()
+    G = CSRGraph.from_blobs(make_blobs(args.persons, args.accounts, args.pool, table), table)
+    H = G.to_networkx(attrs=False)
+    persons = G.nodes_of_type(KIND_PERSON).tolist()
+
+    t0 = time.perf_counter()
+    counts, to_person, from_person = has_edge_scan(H, persons)
+    t_scan = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    classes = G.node_classes()
+    t_table = time.perf_counter() - t0
+
+    assert all(classes.n_persons[n] == counts[n] for n in H.nodes())
+    assert all(classes.follower[n] == to_person[n] and classes.following[n] == from_person[n] for n in H.nodes())
+
+    print(f"{args.persons} personas, {G.n_nodes} nodos, {G.n_edges} aristas")
+    print(f"  has_edge     {t_scan:8.3f}s")
+    print(f"  NodeClasses  {t_table:8.3f}s  (máscara: {classes.person_mask.nbytes / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: exportación del grafo unificado con nx.write_gexf (conversión a
+NetworkX + árbol XML completo) vs exportar_grafo.write_graph (por bloques).
+Cada medición corre en un proceso aparte y reporta tiempo, memoria máxima
+sobre la del grafo ya construido (ru_maxrss) y tamaño del archivo.
+
+Uso:
+    python benchmarks/bench_exportar.py --nodes 10000 100000 1000000 --networkx-max 200000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_layout import make_graph
+from exportar_grafo import write_graph
+
+VARIANTS = {
+    "gexf":     lambda G, base: write_graph(G, base, "gexf"),
+    "gexf.gz":  lambda G, base: write_graph(G, base, "gexf", compress=True),
+    "graphml":  lambda G, base: write_graph(G, base, "graphml"),
+    "edgelist": lambda G, base: write_graph(G, base, "edgelist"),
+    "networkx": lambda G, base: nx.write_gexf(G.to_networkx(node_keys=True), base + ".gexf"),
+}
+
+
+def maxrss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(variant, n_nodes, persons, tmp):
+    """En un proceso aparte, para que ru_maxrss sea de esa sola medición"""
+    G = make_graph(n_nodes, persons)
+    base_mem = maxrss_mb()
+    base = os.path.join(tmp, variant.replace(".", "_"))
+    t0 = time.perf_counter()
+    VARIANTS[variant](G, base)
+    elapsed = time.perf_counter() - t0
+    size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)
+               if f.startswith(os.path.basename(base)))
+    return G.n_nodes, G.n_edges, elapsed, maxrss_mb() - base_mem, size / 2**20
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, nargs="+", default=[10000, 100000])
+    ap.add_argument("--persons", type=int, default=10)
+    ap.add_argument("--networkx-max", type=int, default=200000, help="Máximo de aristas para nx.write_gexf")
+    args = ap.parse_args()
+
+    for n in args.nodes:
+        n_edges = None
+        for variant in VARIANTS:
+            if variant == "networkx" and n_edges > args.networkx_max:
+                print("  networkx        -")
+                continue
+            with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(max_workers=1) as ex:
+                n_nodes, n_edges, t, mem, size = ex.submit(run, variant, n, args.persons, tmp).result()
+            if variant == "gexf":
+                print(f"{n_nodes} nodos, {n_edges} aristas")
+            print(f"  {variant:<9} {t:7.2f}s  +{mem:7.0f} MB  {size:8.1f} MB en disco", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: grafo unificado con NetworkX (build_ego_graph + compose_all) vs
+CSRGraph.from_blobs. Mide tiempo de construcción y memoria retenida.
+
+Uso:
+    python benchmarks/bench_grafo_csr.py --persons 20 --accounts 20000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generar_grafos_instagram import build_ego_graph, compose_graphs
+from grafo_csr import CSRGraph
+from simbolos import SymbolTable, intern_blobs
+
+
+def make_blobs(persons, accounts, pool, table, seed=0):
+    rng = random.Random(seed)
+    blobs = [{
+        "person": f"p{p:05d}",
+        "followers": {f"user_{i}" for i in rng.sample(range(pool), accounts)},
+        "following": {f"user_{i}" for i in rng.sample(range(pool), accounts)},
+        "topics": {f"topic {i}" for i in rng.sample(range(200), 40)},
+    } for p in range(persons)]
+    return intern_blobs(blobs, table)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    G = build()
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return G, elapsed, current, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=20)
+    ap.add_argument("--accounts", type=int, default=20000)
+    ap.add_argument("--pool", type=int, default=200000)
+    args = ap.parse_args()
+
+    table = SymbolTable()
+    blobs = make_blobs(args.persons, args.accounts, args.pool, table)
+
+    G_nx, t_nx, cur_nx, peak_nx = measure(
+        lambda: compose_graphs([build_ego_graph(b, table) for b in blobs]))
+    n_nodes, n_edges = G_nx.number_of_nodes(), G_nx.number_of_edges()
+    del G_nx
+    G_csr, t_csr, cur_csr, peak_csr = measure(lambda: CSRGraph.from_blobs(blobs, table))
+    assert (G_csr.n_nodes, G_csr.n_edges) == (n_nodes, n_edges)
+
+    print(f"{args.persons} personas, {n_nodes} nodos, {n_edges} aristas")
+    print(f"  networkx  {t_nx:7.2f}s  memoria retenida={cur_nx / 2**20:8.1f} MB  pico={peak_nx / 2**20:8.1f} MB")
+    print(f"  CSR       {t_csr:7.2f}s  memoria retenida={cur_csr / 2**20:8.1f} MB  pico={peak_csr / 2**20:8.1f} MB"
+          f"  (arrays: {G_csr.nbytes() / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: agregar una persona a una cohorte existente.
+- completo: índice + matriz de Jaccard + grafo unificado desde todos los blobs
+- incremental: UnifiedState.upsert de la persona nueva + mismas salidas
+
+Uso:
+    python benchmarks/bench_incremental.py --persons 500 --accounts 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_grafo_csr import make_blobs
+from generar_grafos_instagram import compute_person_overlap, compute_similarity_matrix
+from grafo_csr import CSRGraph
+from indice import EntityIndex
+from simbolos import SymbolTable
+from unificado_incremental import UnifiedState
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=500)
+    ap.add_argument("--accounts", type=int, default=2000)
+    ap.add_argument("--pool", type=int, default=50000)
+    args = ap.parse_args()
+
+    table = SymbolTable()
+    blobs = make_blobs(args.persons + 1, args.accounts, args.pool, table)
+    old, new = blobs[:-1], blobs[-1]
+
+    state = UnifiedState(table)
+    for b in old:
+        state.upsert(b)
+
+    t0 = time.perf_counter()
+    overlap_full, _ = compute_person_overlap(blobs, table, index=EntityIndex.from_blobs(blobs))
+    sim_full = compute_similarity_matrix(blobs, table)
+    G_full = CSRGraph.from_blobs(blobs, table)
+    t_full = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    state.upsert(new)
+    t_delta = time.perf_counter() - t0
+    overlap_inc, _ = state.overlap()
+    sim_inc = state.similarity_frame()
+    G_inc = state.unified_graph()
+    t_inc = time.perf_counter() - t0
+
+    assert overlap_inc == overlap_full
+    assert (sim_inc.values == sim_full.values).all()
+    assert (G_inc.n_nodes, G_inc.n_edges) == (G_full.n_nodes, G_full.n_edges)
+
+    print(f"{args.persons} personas + 1 nueva")
+    print(f"  completo     {t_full:7.2f}s")
+    print(f"  incremental  {t_inc:7.2f}s  (delta: {t_delta * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
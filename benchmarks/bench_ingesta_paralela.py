@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: ingesta en serie vs pool de procesos (--workers) para 1..N workers.
+
+Uso:
+    python benchmarks/bench_ingesta_paralela.py --persons 200 --accounts 2000 --max-workers 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datos_sinteticos import make_cohort
+from ingesta import find_triplets_by_person, load_groups
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=200)
+    ap.add_argument("--accounts", type=int, default=2000)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--stream", action="store_true")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_cohort(tmp, persons=args.persons, accounts=args.accounts)
+        groups = find_triplets_by_person(tmp)
+        print(f"{len(groups)} personas × {args.accounts} cuentas (stream={args.stream})")
+
+        reference, base_time = None, None
+        for w in range(1, args.max_workers + 1):
+            t0 = time.perf_counter()
+            blobs = load_groups(groups, stream=args.stream, workers=w)
+            elapsed = time.perf_counter() - t0
+            if reference is None:
+                reference, base_time = blobs, elapsed
+            elif blobs != reference:
+                raise SystemExit(f"ERROR: resultado con {w} workers difiere del serial")
+            print(f"  workers={w:<3} {elapsed:7.2f}s  speedup={base_time / elapsed:5.2f}x")
+    print("Resultados idénticos para todos los números de workers.")
+
+
+if __name__ == "__main__":
+    main()
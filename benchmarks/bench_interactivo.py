@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: HTML interactivo autocontenido (go.Scatter) vs WebGL con datos aparte.
+Mide tiempo de generación y tamaño en disco (en WebGL: html + .bin + .json;
+plotly-<versión>.min.js se copia una vez por carpeta y se informa aparte).
+
+Uso:
+    python benchmarks/bench_interactivo.py --edges 10000 50000 200000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_layout import make_graph
+from generar_grafos_instagram import draw_interactive_graph, draw_interactive_graph_gl
+from interactivo_webgl import plotly_js_name
+
+
+def run(draw, G, positions, out_html):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        draw(G, "bench", out_html, positions=positions)
+    elapsed = time.perf_counter() - t0
+    base = os.path.splitext(out_html)[0]
+    size = sum(os.path.getsize(p) for p in (out_html, base + ".bin", base + ".json") if os.path.exists(p))
+    return elapsed, size
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--edges", type=int, nargs="+", default=[10000, 50000, 200000])
+    ap.add_argument("--persons", type=int, default=10)
+    ap.add_argument("--plotly-max", type=int, default=200000,
+                    help="No genera el HTML autocontenido por encima de estas aristas")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for m in args.edges:
+            G = make_graph(m, args.persons)
+            P = np.random.default_rng(0).random((G.n_nodes, 2))
+            line = f"{G.n_nodes:>8} nodos {G.n_edges:>8} aristas"
+            if G.n_edges <= args.plotly_max:
+                t, size = run(draw_interactive_graph, G, P, os.path.join(tmp, f"plotly_{m}.html"))
+                line += f"  plotly {t:7.2f}s {size / 2**20:8.1f} MB"
+            else:
+                line += "  plotly       -            -  "
+            t, size = run(draw_interactive_graph_gl, G, P, os.path.join(tmp, f"webgl_{m}.html"))
+            line += f"  webgl {t:7.2f}s {size / 2**20:8.1f} MB"
+            print(line, flush=True)
+        plotly_js = plotly_js_name()
+        print(f"(webgl: + {os.path.getsize(os.path.join(tmp, plotly_js)) / 2**20:.1f} MB de {plotly_js}, una vez por carpeta)")
+
+
+if __name__ == "__main__":
+    main()
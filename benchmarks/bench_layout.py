@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: tiempo de layout por tamaño de grafo.
+- spring (nx.spring_layout) solo hasta --spring-max nodos (O(N²) por iteración)
+- barnes-hut (layout_grafo.barnes_hut_layout) en todos los tamaños
+- lectura desde LayoutCache (segunda ejecución con el mismo grafo)
+
+Uso:
+    python benchmarks/bench_layout.py --nodes 1000 10000 100000 1000000 --iterations 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_grafo_csr import make_blobs
+from grafo_csr import CSRGraph
+from layout_grafo import LayoutCache, compute_layout
+from simbolos import SymbolTable
+
+
+def make_graph(n_nodes, persons, seed=0):
+    """Grafo unificado sintético con ~n_nodes nodos repartidos entre 'persons' egos"""
+    table = SymbolTable()
+    accounts = max(1, n_nodes // (2 * persons))
+    blobs = make_blobs(persons, accounts, pool=10 * n_nodes, table=table, seed=seed)
+    return CSRGraph.from_blobs(blobs, table)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--persons", type=int, default=10)
+    ap.add_argument("--iterations", type=int, default=80)
+    ap.add_argument("--spring-max", type=int, default=10000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LayoutCache(tmp)
+        for n in args.nodes:
+            G = make_graph(n, args.persons)
+            line = f"{G.n_nodes:>9} nodos {G.n_edges:>9} aristas"
+            if G.n_nodes <= args.spring_max:
+                t = timed(lambda: compute_layout(G, 42, iterations=args.iterations, engine="spring"))
+                line += f"  spring {t:8.2f}s"
+            else:
+                line += "  spring      -   "
+            t = timed(lambda: compute_layout(G, 42, iterations=args.iterations, engine="barnes-hut", cache=cache))
+            t_cached = timed(lambda: compute_layout(G, 42, iterations=args.iterations, engine="barnes-hut", cache=cache))
+            line += f"  barnes-hut {t:8.2f}s  caché {t_cached:6.3f}s"
+            print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: similitud exacta (matriz dispersa) vs aproximada (MinHash + LSH).
+
+Para cada tamaño de firma mide tiempo, error absoluto de la estimación de
+Jaccard y precisión/recall de los pares emitidos frente al umbral exacto.
+Se ejecuta sobre los datos de data/ y sobre una cohorte sintética con grupos
+de personas parecidas.
+
+Uso:
+    python benchmarks/bench_minhash.py --persons 5000 --perms 32 64 128 256
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ingesta import load_person_blobs
+from simbolos import SymbolTable, intern_blobs
+from similitud import jaccard_matrix, approx_similar_pairs, minhash_signatures
+
+
+def clustered_sets(persons, size, group=5, noise=0.1, pool=1_000_000, seed=0):
+    """Grupos de 'group' personas que comparten ~(1-noise) de sus entidades"""
+    rng = random.Random(seed)
+    out = []
+    while len(out) < persons:
+        base = rng.sample(range(pool), size)
+        for _ in range(min(group, persons - len(out))):
+            s = set(base)
+            for e in rng.sample(base, int(size * noise)):
+                s.discard(e)
+            s.update(rng.sample(range(pool), int(size * noise)))
+            out.append(s)
+    return out
+
+
+def report(name, sets, perms, threshold, exact_limit):
+    print(f"\n{name}: {len(sets)} personas, umbral={threshold}")
+    exact_pairs, J = None, None
+    if len(sets) <= exact_limit:
+        t0 = time.perf_counter()
+        J = jaccard_matrix(sets)
+        t_exact = time.perf_counter() - t0
+        iu = np.triu_indices(len(sets), k=1)
+        exact_pairs = {(int(i), int(j)) for i, j in zip(*iu) if J[i, j] >= threshold}
+        print(f"  exacto        {t_exact:8.3f}s  pares>=umbral={len(exact_pairs)}")
+
+    for num_perm in perms:
+        t0 = time.perf_counter()
+        pairs = approx_similar_pairs(sets, num_perm=num_perm, threshold=threshold)
+        t_approx = time.perf_counter() - t0
+        line = f"  minhash k={num_perm:<4}{t_approx:8.3f}s  pares={len(pairs)}"
+        if J is not None:
+            got = {(i, j) for i, j, _ in pairs}
+            tp = len(got & exact_pairs)
+            precision = tp / len(got) if got else 1.0
+            recall = tp / len(exact_pairs) if exact_pairs else 1.0
+            # error de la estimación sobre todos los pares (no solo los emitidos)
+            sig = minhash_signatures(sets, num_perm=num_perm)
+            iu = np.triu_indices(len(sets), k=1)
+            est = (sig[iu[0]] == sig[iu[1]]).mean(axis=1)
+            err = np.abs(est - J[iu]).mean() if iu[0].size else 0.0
+            line += f"  precisión={precision:.3f}  recall={recall:.3f}  error medio={err:.4f}"
+        print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=5000)
+    ap.add_argument("--size", type=int, default=300, help="Entidades por persona (sintético)")
+    ap.add_argument("--perms", type=int, nargs="+", default=[32, 64, 128, 256])
+    ap.add_argument("--threshold", type=float, default=0.5)
+    ap.add_argument("--exact-limit", type=int, default=5000,
+                    help="No calcular la matriz exacta por encima de este número de personas")
+    ap.add_argument("--data", default=os.path.join(ROOT, "data"))
+    args = ap.parse_args()
+
+    table = SymbolTable()
+    blobs = intern_blobs(load_person_blobs(args.data), table)
+    real_sets = [b["followers"] | b["following"] | b["topics"] for b in sorted(blobs, key=lambda b: b["person"])]
+    # Con tan pocas personas el umbral por defecto no deja pares: se usa uno bajo
+    report("data/", real_sets, args.perms, threshold=0.05, exact_limit=args.exact_limit)
+
+    report("sintético", clustered_sets(args.persons, args.size), args.perms,
+           threshold=args.threshold, exact_limit=args.exact_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: json.load vs lectura por eventos (json_incremental).
+
+Genera un *_followers.json sintético grande y lo parsea con cada modo en un
+subproceso independiente, para medir el pico de memoria (RSS) de cada uno.
+
+Uso:
+    python benchmarks/bench_parseo_incremental.py --n 300000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def write_followers(path, n):
+    """Escribe un followers.json con el mismo esquema que el export de Instagram."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(n):
+            item = {
+                "title": "",
+                "media_list_data": [],
+                "string_list_data": [{
+                    "href": f"https://www.instagram.com/user_{i}",
+                    "value": f"User_{i}",
+                    "timestamp": 1760000000 + i,
+                }],
+            }
+            f.write(json.dumps(item, indent=2))
+            f.write(",\n" if i < n - 1 else "\n")
+        f.write("]\n")
+
+
+def child(mode, path):
+    from ingesta import parse_followers
+    # ru_maxrss está en KB en Linux; se descuenta lo que ya ocupan los imports
+    base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    users = parse_followers(path, stream=(mode == "stream"))
+    elapsed = time.perf_counter() - t0
+    digest = hashlib.sha1("\n".join(sorted(users)).encode("utf-8")).hexdigest()
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_kb
+    print(json.dumps({"mode": mode, "seconds": elapsed, "peak_rss_kb": rss_kb,
+                      "n": len(users), "sha1": digest}))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=300000, help="Número de seguidores sintéticos")
+    ap.add_argument("--child", nargs=2, metavar=("MODO", "RUTA"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_followers.json")
+        write_followers(path, args.n)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"Archivo sintético: {args.n} seguidores, {size_mb:.1f} MB")
+
+        results = []
+        for mode in ("json", "stream"):
+            out = subprocess.run([sys.executable, __file__, "--child", mode, path],
+                                 check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(out))
+
+    for r in results:
+        print(f"  {r['mode']:<7} tiempo={r['seconds']:.2f}s  pico RSS (sobre imports)={r['peak_rss_kb'] / 1024:.1f} MB")
+    if results[0]["sha1"] != results[1]["sha1"]:
+        raise SystemExit("ERROR: los resultados de ambos modos no coinciden")
+    print("  Resultados idénticos en ambos modos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de punta a punta: cada etapa del pipeline sobre cohortes sintéticas
+(datos_sinteticos.make_export) de distintas escalas, con tiempo y memoria.
+
+Etapas (en orden; cada una usa lo que dejaron las anteriores):
+- parse:             parse_* de los JSON de cada persona + internado de nombres
+- ego_networkx:      build_ego_graph de cada persona (grafos NetworkX)
+- compose_networkx:  compose_graphs de esos egos
+- unified_csr:       CSRGraph.from_blobs (el grafo unificado que usa el pipeline)
+- similarity:        compute_similarity_matrix
+- centrality_ego:    export_centrality de cada ego
+- centrality:        export_unified_centrality (unificado + cortes por persona)
+- layout:            compute_layout del grafo unificado (sin caché)
+- png:               draw_graph (o draw_graph_fast con más de FAST_PNG_MIN_EDGES aristas)
+- interactive:       draw_interactive_graph (o la versión WebGL con más de WEBGL_MIN_EDGES)
+
+Cada escala corre en un proceso aparte (tabla de símbolos vacía). Cada etapa
+se mide dos veces: tiempo sin tracemalloc (que lo distorsiona) y memoria
+máxima en una segunda corrida con tracemalloc (--no-memory la omite). Las
+bibliotecas ya están importadas al medir (el costo de importarlas lo mide
+bench_arranque.py) y las etapas NetworkX se saltean en grafos de más de
+--networkx-max aristas.
+
+Los resultados se guardan en JSON (--json) con el commit y las versiones de
+las bibliotecas; --compare <json anterior> muestra la razón de tiempos por
+etapa contra otra versión.
+
+Uso:
+    python benchmarks/bench_pipeline.py --scales 3x300 20x2000 100x5000 --json pipeline.json
+    python benchmarks/bench_pipeline.py --scales 3x300 20x2000 --compare pipeline.json
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datos_sinteticos import make_export
+
+
+# ----------------------------
+# Etapas
+# ----------------------------
+def stage_parse(ctx):
+    from ingesta import find_triplets_by_person, load_groups
+    from simbolos import intern_blobs
+
+    ctx["blobs"] = intern_blobs(load_groups(find_triplets_by_person(ctx["data"])))
+
+
+def stage_ego_networkx(ctx):
+    from generar_grafos_instagram import build_ego_graph
+
+    ctx["egos"] = [build_ego_graph(b) for b in ctx["blobs"]]
+
+
+def stage_compose_networkx(ctx):
+    from generar_grafos_instagram import compose_graphs
+
+    compose_graphs(ctx["egos"])
+
+
+def stage_unified_csr(ctx):
+    from grafo_csr import CSRGraph
+
+    ctx["G"] = CSRGraph.from_blobs(ctx["blobs"])
+
+
+def stage_similarity(ctx):
+    from generar_grafos_instagram import compute_similarity_matrix
+
+    compute_similarity_matrix(ctx["blobs"])
+
+
+def stage_centrality_ego(ctx):
+    from generar_grafos_instagram import export_centrality
+    from grafo_csr import CSRGraph
+
+    for blob in ctx["blobs"]:
+        export_centrality(CSRGraph.from_blobs([blob]), blob["person"], ctx["out"], k=ctx["k"])
+
+
+def stage_centrality(ctx):
+    from generar_grafos_instagram import export_unified_centrality
+
+    export_unified_centrality(ctx["G"], ctx["blobs"], ctx["out"], k=ctx["k"])
+
+
+def stage_layout(ctx):
+    from generar_grafos_instagram import LAYOUT_SEED
+    from layout_grafo import compute_layout
+
+    ctx["classes"] = ctx["G"].node_classes()
+    ctx["positions"] = compute_layout(ctx["G"], LAYOUT_SEED)
+
+
+def stage_png(ctx):
+    from generar_grafos_instagram import FAST_PNG_MIN_EDGES, draw_graph, draw_graph_fast
+
+    G = ctx["G"]
+    draw = draw_graph_fast if G.n_edges > FAST_PNG_MIN_EDGES else draw_graph
+    draw(G, "Grafo Unificado", os.path.join(ctx["out"], "grafo_unificado.png"),
+         classes=ctx["classes"], positions=ctx["positions"])
+
+
+def stage_interactive(ctx):
+    from generar_grafos_instagram import export_interactive
+
+    export_interactive(ctx["G"], ctx["out"], classes=ctx["classes"], positions=ctx["positions"])
+
+
+STAGES = [
+    ("parse", stage_parse),
+    ("ego_networkx", stage_ego_networkx),
+    ("compose_networkx", stage_compose_networkx),
+    ("unified_csr", stage_unified_csr),
+    ("similarity", stage_similarity),
+    ("centrality_ego", stage_centrality_ego),
+    ("centrality", stage_centrality),
+    ("layout", stage_layout),
+    ("png", stage_png),
+    ("interactive", stage_interactive),
+]
+NETWORKX_STAGES = {"ego_networkx", "compose_networkx"}
+
+
+def measure(fn, ctx, memory=True):
+    """(segundos, pico de tracemalloc en MB o None); la consola de la etapa se descarta"""
+    gc.collect()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(ctx)
+    elapsed = time.perf_counter() - t0
+    if not memory:
+        return elapsed, None
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def run_scale(data_dir, out_dir, k, memory, networkx_max):
+    """En un proceso aparte: resultados de cada etapa sobre la cohorte de data_dir"""
+    # Las bibliotecas se importan antes de medir (el arranque lo mide bench_arranque.py)
+    import networkx, pandas, plotly.graph_objects, scipy.sparse  # noqa: F401
+    from render_paralelo import pyplot
+    pyplot()
+
+    ctx = {"data": data_dir, "out": out_dir, "k": k}
+    stages = []
+    for name, fn in STAGES:
+        if name in NETWORKX_STAGES:
+            edges = sum(len(b["followers"]) + len(b["following"]) + len(b["topics"])
+                        for b in ctx["blobs"])
+            if edges > networkx_max:
+                stages.append({"stage": name, "seconds": None, "peak_mb": None})
+                continue
+        seconds, peak = measure(fn, ctx, memory)
+        stages.append({"stage": name, "seconds": round(seconds, 4),
+                       "peak_mb": None if peak is None else round(peak, 2)})
+    return {"nodes": ctx["G"].n_nodes, "edges": ctx["G"].n_edges, "stages": stages}
+
+
+def environment():
+    """Versión del código y de las bibliotecas, para comparar resultados entre versiones"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versions = {}
+    for module in ("numpy", "scipy", "pandas", "networkx", "matplotlib", "plotly"):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return {"commit": commit, "python": platform.python_version(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "libraries": versions}
+
+
+def parse_scale(text):
+    """'PERSONASxSEGUIDORES' -> (personas, seguidores)"""
+    persons, followers = text.lower().split("x")
+    return int(persons), int(followers)
+
+
+def fmt_cell(seconds, peak):
+    if seconds is None:
+        return "        -"
+    return f"{seconds:8.3f}s" + ("" if peak is None else f" {peak:8.1f} MB")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scales", nargs="+", default=["3x300", "20x2000"],
+                    help="Escalas PERSONASxSEGUIDORES (default: 3x300 20x2000)")
+    ap.add_argument("--topics", type=int, default=40)
+    ap.add_argument("--shared", type=float, default=0.5)
+    ap.add_argument("--mutual", type=float, default=0.3)
+    ap.add_argument("--alpha", type=float, default=1.1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--betweenness-k", type=int, default=200,
+                    help="Fuentes de la betweenness muestreada (default: 200; 0 = exacta)")
+    ap.add_argument("--networkx-max", type=int, default=500000,
+                    help="Máximo de aristas para las etapas NetworkX (default: 500000)")
+    ap.add_argument("--no-memory", action="store_true", help="Solo tiempos (una corrida por etapa)")
+    ap.add_argument("--json", default=None, help="Guarda los resultados en este archivo")
+    ap.add_argument("--compare", default=None, help="JSON de una corrida anterior para comparar tiempos")
+    args = ap.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            for scale in json.load(f)["scales"]:
+                previous[scale["scale"]] = {s["stage"]: s["seconds"] for s in scale["stages"]}
+
+    results = {"environment": environment(),
+               "generator": dict(topics=args.topics, shared=args.shared, mutual=args.mutual,
+                                 alpha=args.alpha, seed=args.seed),
+               "betweenness_k": args.betweenness_k or None, "scales": []}
+    for text in args.scales:
+        persons, followers = parse_scale(text)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir, out_dir = os.path.join(tmp, "data"), os.path.join(tmp, "out")
+            os.makedirs(out_dir)
+            make_export(data_dir, persons=persons, followers=followers, topics=args.topics,
+                        shared=args.shared, mutual=args.mutual, alpha=args.alpha, seed=args.seed)
+            json_mb = sum(os.path.getsize(os.path.join(data_dir, f)) for f in os.listdir(data_dir)) / 2**20
+            with ProcessPoolExecutor(max_workers=1) as ex:
+                scale = ex.submit(run_scale, data_dir, out_dir, args.betweenness_k or None,
+                                  not args.no_memory, args.networkx_max).result()
+        scale = {"scale": text, "persons": persons, "followers": followers,
+                 "json_mb": round(json_mb, 2), **scale}
+        results["scales"].append(scale)
+
+        print(f"{text}: {persons} personas, {scale['nodes']} nodos, {scale['edges']} aristas "
+              f"(JSON {json_mb:.1f} MB)")
+        before = previous.get(text, {})
+        for s in scale["stages"]:
+            line = f"  {s['stage']:<17} {fmt_cell(s['seconds'], s['peak_mb'])}"
+            if before.get(s["stage"]) and s["seconds"]:
+                line += f"  x{before[s['stage']] / s['seconds']:5.2f} vs anterior"
+            print(line, flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
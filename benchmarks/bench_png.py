@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: PNG estático con draw_graph (nx.draw_networkx_*, un FancyArrowPatch
+por arista) vs draw_graph_fast (colecciones de matplotlib). Mide tiempo de
+dibujo y memoria máxima del proceso (ru_maxrss) por tamaño de grafo; la
+versión de NetworkX solo hasta --networkx-max aristas.
+
+Uso:
+    python benchmarks/bench_png.py --nodes 1000 10000 100000 --networkx-max 20000
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_layout import make_graph
+from generar_grafos_instagram import draw_graph, draw_graph_fast
+from layout_grafo import compute_layout
+
+
+def run(fn_name, n_nodes, persons, out_path):
+    """En un proceso aparte, para que ru_maxrss sea de esa sola medición"""
+    G = make_graph(n_nodes, persons)
+    positions = compute_layout(G, 42, iterations=10)
+    fn = {"networkx": draw_graph, "fast": draw_graph_fast}[fn_name]
+    t0 = time.perf_counter()
+    fn(G, "bench", out_path, positions=positions)
+    elapsed = time.perf_counter() - t0
+    return G.n_nodes, G.n_edges, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--nodes", type=int, nargs="+", default=[1000, 5000, 20000])
+    ap.add_argument("--persons", type=int, default=10)
+    ap.add_argument("--networkx-max", type=int, default=20000, help="Máximo de aristas para draw_graph")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.nodes:
+            results = {}
+            for name in ("fast", "networkx"):
+                if name == "networkx" and results["fast"][1] > args.networkx_max:
+                    continue
+                with ProcessPoolExecutor(max_workers=1) as ex:
+                    results[name] = ex.submit(run, name, n, args.persons,
+                                              os.path.join(tmp, f"{name}.png")).result()
+            n_nodes, n_edges, t_fast, mem_fast = results["fast"]
+            line = f"{n_nodes:>9} nodos {n_edges:>9} aristas  fast {t_fast:7.2f}s {mem_fast:7.0f} MB"
+            if "networkx" in results:
+                _, _, t_nx, mem_nx = results["networkx"]
+                line += f"  networkx {t_nx:7.2f}s {mem_nx:7.0f} MB  x{t_nx / t_fast:5.1f}"
+            else:
+                line += "  networkx       -"
+            print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: etapa de render de PNG (render_paralelo) según el número de procesos.
+Dibuja un grafo ego por persona más el unificado, como generar_grafos_instagram,
+con --workers procesos; la última línea es una segunda pasada sin cambios (todos
+los PNG se omiten por hash).
+
+Uso:
+    python benchmarks/bench_render.py --persons 8 --nodes 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_grafo_csr import make_blobs
+from grafo_csr import CSRGraph
+from generar_grafos_instagram import draw_graph
+from layout_grafo import compute_layout
+from render_paralelo import RenderJob, render_key, render_pngs
+from simbolos import SymbolTable
+
+
+def make_jobs(n_nodes, persons, out_dir):
+    table = SymbolTable()
+    accounts = max(1, n_nodes // (2 * persons))
+    blobs = make_blobs(persons, accounts, pool=10 * n_nodes, table=table, seed=0)
+    graphs = [(f"ego_{i}", CSRGraph.from_blobs([b], table)) for i, b in enumerate(blobs)]
+    graphs.append(("unificado", CSRGraph.from_blobs(blobs, table)))
+    jobs = []
+    for name, G in graphs:
+        positions = compute_layout(G, 42, iterations=20)
+        out_path = os.path.join(out_dir, f"{name}.png")
+        jobs.append(RenderJob(out_path, render_key(G, positions, title=name), draw_graph,
+                              (G, name, out_path), dict(positions=positions), cost=G.n_edges))
+    return jobs, graphs[-1][1]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=8)
+    ap.add_argument("--nodes", type=int, default=5000, help="Nodos aproximados del grafo unificado")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--start-method", choices=multiprocessing.get_all_start_methods(), default=None)
+    args = ap.parse_args()
+    if args.start_method:
+        multiprocessing.set_start_method(args.start_method)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs, G = make_jobs(args.nodes, args.persons, tmp)
+        print(f"{len(jobs)} PNG; unificado: {G.n_nodes} nodos, {G.n_edges} aristas "
+              f"({os.cpu_count()} CPU)")
+        base = None
+        for w in args.workers:
+            t0 = time.perf_counter()
+            render_pngs(jobs, tmp, workers=w, force=True)
+            t = time.perf_counter() - t0
+            base = base or t
+            print(f"  {w:>3} procesos  {t:8.2f}s  x{base / t:5.2f}", flush=True)
+        t0 = time.perf_counter()
+        rendered, skipped = render_pngs(jobs, tmp, workers=max(args.workers))
+        print(f"  sin cambios  {time.perf_counter() - t0:8.2f}s  ({len(skipped)} omitidos)")
+
+
+if __name__ == "__main__":
+    main()
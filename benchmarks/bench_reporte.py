@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: reporte completo + análisis de consola con el motor de reporte.py
+vs la versión anterior (sets ordenados sección por sección, cada análisis
+recalculando lo suyo y un f.write por línea). La consola se descarta; se mide
+tiempo y memoria máxima (tracemalloc) y se verifica que el texto sea idéntico.
+
+Uso:
+    python benchmarks/bench_reporte.py --persons 50 --accounts 20000
+"""
+
+import argparse
+import contextlib
+import filecmp
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analizar_datos_sociales import analyze_accounts, analyze_topics, generate_summary_report
+from bench_grafo_csr import make_blobs
+from indice import EntityIndex
+from reporte import build_report
+from simbolos import SymbolTable
+
+
+def legacy_report(person_data, output_file, symbols, index):
+    """Reporte de la versión anterior (mismo texto), para comparar"""
+    persons = sorted(person_data)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("="*70 + "\n")
+        f.write("REPORTE COMPLETO DE ANÁLISIS SOCIAL - INSTAGRAM\n")
+        f.write("="*70 + "\n\n")
+        f.write(f"Número de personas analizadas: {len(persons)}\n")
+        f.write(f"Personas: {', '.join(persons)}\n\n")
+        f.write("ESTADÍSTICAS GENERALES:\n")
+        f.write("-"*70 + "\n")
+        for person, data in sorted(person_data.items()):
+            f.write(f"\n{person.upper()}:\n")
+            f.write(f"  Seguidores: {len(data['followers'])}\n")
+            f.write(f"  Siguiendo: {len(data['following'])}\n")
+            f.write(f"  Tópicos de interés: {len(data['topics'])}\n")
+            f.write(f"  Conexiones mutuas: {len(data['followers'] & data['following'])}\n")
+        f.write("\n" + "="*70 + "\n")
+        f.write("TÓPICOS/GUSTOS POR PERSONA (COMPLETO):\n")
+        f.write("="*70 + "\n")
+        for person, data in sorted(person_data.items()):
+            f.write(f"\n{person.upper()} - {len(data['topics'])} tópicos:\n")
+            if data['topics']:
+                for topic in symbols.sorted_names(data['topics']):
+                    f.write(f"  • {topic}\n")
+            else:
+                f.write("  (sin tópicos)\n")
+
+        def all_section(title, category, empty):
+            shared = index.shared_by_all(category)
+            f.write("\n" + "="*70 + "\n")
+            f.write(f"{title} ({len(shared)}):\n")
+            f.write("="*70 + "\n")
+            if shared:
+                for name in symbols.sorted_names(shared):
+                    f.write(f"  • {name}\n")
+            else:
+                f.write(f"\n({empty})\n")
+
+        def pair_section(title, category, what):
+            f.write("\n" + "="*70 + "\n")
+            f.write(title + "\n")
+            f.write("="*70 + "\n")
+            for (p1, p2), common in index.pair_items(category):
+                f.write(f"\n{p1} ↔ {p2}: {len(common)} {what} en común\n")
+                if common:
+                    for name in symbols.sorted_names(common):
+                        f.write(f"  • {name}\n")
+                else:
+                    f.write(f"  (sin {what} en común)\n")
+
+        def first_section(title, get, line, empty):
+            f.write("\n" + "="*70 + "\n")
+            f.write(f"{title} (primeros 5):\n")
+            f.write("="*70 + "\n")
+            for person, data in sorted(person_data.items()):
+                s = get(data)
+                f.write(f"\n{person.upper()} - {line.format(n=len(s))}:\n")
+                if s:
+                    for acc in symbols.sorted_names(s)[:5]:
+                        f.write(f"  • {acc}\n")
+                    if len(s) > 5:
+                        f.write(f"  ... y {len(s) - 5} más\n")
+                else:
+                    f.write(f"  {empty}\n")
+
+        if len(persons) > 1:
+            all_section("TÓPICOS COMPARTIDOS POR TODAS LAS PERSONAS", "topics",
+                        "No hay tópicos compartidos por todas las personas")
+        pair_section("TÓPICOS/GUSTOS COMPARTIDOS ENTRE PARES:", "topics", "tópicos")
+        first_section("CUENTAS QUE SIGUE CADA PERSONA", lambda d: d['following'],
+                      "sigue a {n} cuentas", "(no sigue a nadie)")
+        first_section("SEGUIDORES DE CADA PERSONA", lambda d: d['followers'],
+                      "{n} seguidores", "(sin seguidores)")
+        first_section("CONEXIONES MUTUAS POR PERSONA", lambda d: d['followers'] & d['following'],
+                      "{n} conexiones mutuas", "(sin conexiones mutuas)")
+        if len(persons) > 1:
+            all_section("CUENTAS QUE TODAS LAS PERSONAS SIGUEN", "following",
+                        "No hay cuentas que todas las personas sigan")
+        pair_section("CUENTAS SEGUIDAS EN COMÚN ENTRE PARES (COMPLETO):", "following", "cuentas")
+        pair_section("SEGUIDORES COMPARTIDOS ENTRE PARES (COMPLETO):", "followers", "seguidores")
+
+
+def legacy_console(person_data, symbols, index):
+    """Lo que calculaban analyze_topics / analyze_accounts: listas de nombres completas por par"""
+    for data in person_data.values():
+        symbols.sorted_names(data['topics'])
+        len(data['followers'] & data['following'])
+    for category in ("topics", "following", "followers"):
+        shared = {pair: symbols.sorted_names(ents) for pair, ents in index.shared_pairs(category)}
+        for _, names in sorted(shared.items(), key=lambda x: len(x[1]), reverse=True):
+            print("\n".join(names[:20]))
+    for category in ("topics", "following"):
+        print("\n".join(symbols.sorted_names(index.shared_by_all(category))))
+
+
+def measure(fn):
+    """Tiempo (sin tracemalloc, que lo distorsiona) y memoria máxima (en una segunda corrida)"""
+    gc.collect()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=50)
+    ap.add_argument("--accounts", type=int, default=20000)
+    ap.add_argument("--pool", type=int, default=200000)
+    args = ap.parse_args()
+
+    table = SymbolTable()
+    blobs = make_blobs(args.persons, args.accounts, args.pool, table)
+    person_data = {b["person"]: b for b in blobs}
+    index = EntityIndex.from_person_data(person_data)
+    index.pairs("topics"), index.pairs("following"), index.pairs("followers")  # fuera de la medición
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path, new_path = os.path.join(tmp, "anterior.txt"), os.path.join(tmp, "nuevo.txt")
+
+        def old():
+            legacy_console(person_data, table, index)
+            legacy_report(person_data, old_path, table, index)
+
+        def new():
+            report = build_report(person_data, index=index, symbols=table)
+            analyze_topics(person_data, symbols=table, report=report)
+            analyze_accounts(person_data, symbols=table, report=report)
+            generate_summary_report(person_data, new_path, symbols=table, report=report)
+
+        t_old, m_old = measure(old)
+        t_new, m_new = measure(new)
+        print(f"{args.persons} personas, {args.accounts} cuentas por lista "
+              f"({os.path.getsize(new_path) / 2**20:.1f} MB de reporte)")
+        print(f"  anterior  {t_old:7.2f}s  pico {m_old:8.1f} MB")
+        print(f"  motor     {t_new:7.2f}s  pico {m_new:8.1f} MB  x{t_old / t_new:5.1f}")
+        print(f"  texto idéntico: {filecmp.cmp(old_path, new_path, shallow=False)}")
+
+
+if __name__ == "__main__":
+    main()
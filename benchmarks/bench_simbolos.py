@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: memoria y tiempo de sets de strings (con prefijos "acc:") vs sets de
+IDs enteros de la tabla de símbolos.
+
+Uso:
+    python benchmarks/bench_simbolos.py --persons 50 --accounts 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from simbolos import SymbolTable, intern_blobs
+
+
+def make_blobs(persons, accounts, pool, seed=0):
+    """Blobs como los de la ingesta: cada persona tiene sus propios objetos str"""
+    rng = random.Random(seed)
+    blobs = []
+    for p in range(persons):
+        blobs.append({
+            "person": f"p{p:05d}",
+            "followers": {f"user_{i}" for i in rng.sample(range(pool), accounts)},
+            "following": {f"user_{i}" for i in rng.sample(range(pool), accounts)},
+            "topics": {f"topic {i}" for i in rng.sample(range(200), 40)},
+        })
+    return blobs
+
+
+def string_sets(blobs):
+    """Lo que hacían antes compute_similarity_matrix / compute_person_overlap"""
+    return [{f"acc:{u}" for u in b["followers"] | b["following"]} | {f"topic:{t}" for t in b["topics"]}
+            for b in blobs]
+
+
+def id_sets(blobs):
+    return [b["followers"] | b["following"] | b["topics"] for b in blobs]
+
+
+def measure(build):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def pairwise(sets):
+    t0 = time.perf_counter()
+    total = 0
+    for i in range(len(sets)):
+        for j in range(i + 1, len(sets)):
+            total += len(sets[i] & sets[j])
+    return total, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, default=50)
+    ap.add_argument("--accounts", type=int, default=20000)
+    ap.add_argument("--pool", type=int, default=200000)
+    args = ap.parse_args()
+
+    # Strings: blobs de la ingesta + sets con prefijo
+    (str_blobs, str_sets), str_mem, str_time = measure(
+        lambda: (lambda b: (b, string_sets(b)))(make_blobs(args.persons, args.accounts, args.pool)))
+    str_total, str_pair = pairwise(str_sets)
+    del str_blobs, str_sets
+
+    # IDs: los blobs de strings se descartan tras internarlos
+    table = SymbolTable()
+    (ids, id_blobs), id_mem, id_time = measure(
+        lambda: (lambda b: (id_sets(b), b))(intern_blobs(make_blobs(args.persons, args.accounts, args.pool), table)))
+    id_total, id_pair = pairwise(ids)
+
+    if str_total != id_total:
+        raise SystemExit("ERROR: las intersecciones no coinciden")
+    print(f"{args.persons} personas × {args.accounts} cuentas, {len(table)} símbolos")
+    print(f"  strings  memoria={str_mem / 2**20:8.1f} MB  construcción={str_time:6.2f}s  intersecciones={str_pair:6.2f}s")
+    print(f"  IDs      memoria={id_mem / 2**20:8.1f} MB  construcción={id_time:6.2f}s  intersecciones={id_pair:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: matriz de Jaccard celda a celda con .loc (implementación anterior)
+vs producto de matrices dispersas (similitud.jaccard_matrix).
+
+Uso:
+    python benchmarks/bench_similitud.py --persons 50 200 1000 --accounts 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generar_grafos_instagram import jaccard_similarity
+from similitud import jaccard_matrix
+
+
+def loc_matrix(person_sets):
+    """Implementación anterior de compute_similarity_matrix"""
+    persons = sorted(person_sets)
+    M = pd.DataFrame(index=persons, columns=persons, dtype=float)
+    for a in persons:
+        for b in persons:
+            M.loc[a, b] = jaccard_similarity(person_sets[a], person_sets[b])
+    return M
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, nargs="+", default=[50, 200, 1000])
+    ap.add_argument("--accounts", type=int, default=500)
+    ap.add_argument("--pool", type=int, default=20000)
+    ap.add_argument("--max-loc", type=int, default=300,
+                    help="No ejecutar la versión .loc por encima de este número de personas")
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    for P in args.persons:
+        person_sets = {f"p{i:05d}": set(rng.sample(range(args.pool), args.accounts)) for i in range(P)}
+        persons = sorted(person_sets)
+
+        t0 = time.perf_counter()
+        J = jaccard_matrix([person_sets[p] for p in persons], n_cols=args.pool)
+        t_sparse = time.perf_counter() - t0
+
+        line = f"P={P:<6} disperso={t_sparse:8.3f}s"
+        if P <= args.max_loc:
+            t0 = time.perf_counter()
+            M = loc_matrix(person_sets)
+            t_loc = time.perf_counter() - t0
+            if not np.array_equal(M.to_numpy(), J):
+                raise SystemExit(f"ERROR: resultados distintos con P={P}")
+            line += f"  .loc={t_loc:8.3f}s  speedup={t_loc / t_sparse:8.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
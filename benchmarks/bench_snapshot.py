@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: arranque de una ejecución (grafo unificado + sets por persona listos)
+reconstruyendo desde los JSON vs abriendo el snapshot binario con mmap.
+- json:     parseo de todos los JSON + internado + CSRGraph.from_blobs
+- caché:    lo mismo con la caché de ingesta ya llena (pickle por persona)
+- snapshot: open_snapshot (incluye comprobar las huellas de los JSON) +
+            person_blobs_from_graph
+Cada medición corre en un proceso nuevo (tabla de símbolos vacía); los
+archivos quedan en la caché de páginas del sistema operativo.
+
+Uso:
+    python benchmarks/bench_snapshot.py --persons 20 100 --accounts 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from datos_sinteticos import make_cohort
+from grafo_csr import CSRGraph
+from ingesta import ParseCache, find_triplets_by_person, load_groups
+from simbolos import SymbolTable, intern_blobs
+from snapshot_grafo import (
+    data_fingerprints, open_snapshot, person_blobs_from_graph, snapshot_path, write_snapshot,
+)
+
+
+def rebuild(data_dir, cache_dir=None):
+    groups = find_triplets_by_person(data_dir)
+    table = SymbolTable()
+    cache = ParseCache(cache_dir) if cache_dir else None
+    blobs = intern_blobs(load_groups(groups, cache=cache), table)
+    return CSRGraph.from_blobs(blobs, table), blobs
+
+
+def from_snapshot(data_dir, out_dir):
+    G = open_snapshot(snapshot_path(out_dir), find_triplets_by_person(data_dir), SymbolTable())
+    return G, person_blobs_from_graph(G)
+
+
+def run(mode, data_dir, out_dir, cache_dir):
+    """En un proceso aparte: segundos hasta tener grafo y blobs"""
+    t0 = time.perf_counter()
+    if mode == "snapshot":
+        G, blobs = from_snapshot(data_dir, out_dir)
+    else:
+        G, blobs = rebuild(data_dir, cache_dir if mode == "caché" else None)
+    elapsed = time.perf_counter() - t0
+    return elapsed, G.n_nodes, G.n_edges, sum(len(b["followers"]) for b in blobs)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--persons", type=int, nargs="+", default=[20, 100])
+    ap.add_argument("--accounts", type=int, default=5000)
+    args = ap.parse_args()
+
+    for persons in args.persons:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir, out_dir, cache_dir = (os.path.join(tmp, d) for d in ("data", "out", "cache"))
+            os.makedirs(out_dir)
+            make_cohort(data_dir, persons=persons, accounts=args.accounts)
+            files = data_fingerprints(find_triplets_by_person(data_dir))
+            G, _ = rebuild(data_dir, cache_dir)  # además llena la caché de ingesta
+            write_snapshot(snapshot_path(out_dir), G, files)
+            json_mb = sum(os.path.getsize(os.path.join(data_dir, f)) for f in os.listdir(data_dir)) / 2**20
+            snap_mb = os.path.getsize(snapshot_path(out_dir)) / 2**20
+            print(f"{persons} personas: {G.n_nodes} nodos, {G.n_edges} aristas "
+                  f"(JSON {json_mb:.1f} MB, snapshot {snap_mb:.1f} MB)")
+
+            results = {}
+            for mode in ("json", "caché", "snapshot"):
+                with ProcessPoolExecutor(max_workers=1) as ex:
+                    results[mode] = ex.submit(run, mode, data_dir, out_dir, cache_dir).result()
+            assert len({r[1:] for r in results.values()}) == 1, "los tres modos deben dar el mismo grafo"
+            for mode, (t, *_) in results.items():
+                print(f"  {mode:<9} {t:7.3f}s  x{results['json'][0] / t:6.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark: tablas de salida en CSV vs Parquet vs Arrow (tablas_columnares).
+Tabla sintética con la forma de entidades_compartidas (entity_id, person_a,
+person_b, entity, type), partida por person_a. Mide escritura, lectura
+completa, lectura de las filas de una persona y tamaño en disco.
+
+Uso:
+    python benchmarks/bench_tablas.py --rows 1000000 5000000 --persons 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from tablas_columnares import columnar_available, read_partition, read_table, table_path, write_table
+
+
+def make_frame(rows, persons, entities, seed=0):
+    rng = np.random.default_rng(seed)
+    names = np.array([f"persona_{i:05d}" for i in range(persons)], dtype=object)
+    a = rng.integers(0, persons - 1, rows)
+    b = a + 1 + (rng.integers(0, persons, rows) % (persons - 1 - a))
+    ent = rng.integers(0, entities, rows)
+    return pd.DataFrame({
+        "entity_id": ent,
+        "person_a": names[a],
+        "person_b": names[b],
+        "entity": np.array([f"cuenta_{e}" for e in range(entities)], dtype=object)[ent],
+        "type": np.where(ent % 5 == 0, "topic", "account"),
+    })
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[200000, 1000000])
+    ap.add_argument("--persons", type=int, default=200)
+    ap.add_argument("--entities", type=int, default=50000)
+    args = ap.parse_args()
+
+    formats = ["csv"] + (["parquet", "arrow"] if columnar_available() else [])
+    if len(formats) == 1:
+        print("pyarrow no está instalado: solo se mide csv")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = make_frame(rows, args.persons, args.entities)
+            person = df["person_a"].iloc[0]
+            print(f"{rows} filas, {args.persons} personas")
+            for fmt in formats:
+                path = table_path(tmp, "entidades", fmt)
+                opts = {} if fmt == "csv" else dict(
+                    partition="person_a", dictionary=("person_a", "person_b", "entity", "type"))
+                t_write, _ = timed(lambda: write_table(df, path, fmt, **opts))
+                t_read, _ = timed(lambda: read_table(path))
+                if fmt == "csv":
+                    t_one, part = timed(lambda: (lambda d: d[d["person_a"] == person])(read_table(path)))
+                else:
+                    t_one, part = timed(lambda: read_partition(path, person))
+                size = os.path.getsize(path) / 2**20
+                print(f"  {fmt:<8} escritura {t_write:7.2f}s  lectura {t_read:7.2f}s  "
+                      f"una persona {t_one:7.3f}s ({len(part)} filas)  {size:8.1f} MB", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Datos sintéticos con el mismo esquema que los JSON exportados de Instagram,
+para los benchmarks.
+- make_cohort: cohorte simple, muestreo uniforme de un universo común
+- make_export: cohorte con popularidad de ley de potencias y solapamiento
+  controlado (ver su docstring); también se puede usar desde la línea de
+  comandos para escribir una carpeta de datos:
+
+    python benchmarks/datos_sinteticos.py data_sint --persons 50 --followers 5000 --alpha 1.2
+"""
+
+import argparse
+import json
+import os
+import random
+
+import numpy as np
+
+TIMESTAMP = 1760000000
+TIMESTAMP_RANGE = (1600000000, 1760000000)  # ~2020-09 a 2025-10
+
+
+def write_person(data_dir, person, followers, following, topics, timestamps=None):
+    """
+    Escribe <person>_followers/_following/_topics.json. timestamps: función
+    cuenta -> timestamp (default: TIMESTAMP fijo).
+    """
+    stamp = timestamps or (lambda u: TIMESTAMP)
+    followers_json = [{
+        "title": "",
+        "media_list_data": [],
+        "string_list_data": [{
+            "href": f"https://www.instagram.com/{u}",
+            "value": u,
+            "timestamp": stamp(u),
+        }],
+    } for u in followers]
+    following_json = {"relationships_following": [{
+        "title": u,
+        "string_list_data": [{
+            "href": f"https://www.instagram.com/_u/{u}",
+            "timestamp": stamp(u),
+        }],
+    } for u in following]}
+    topics_json = {"topics_your_topics": [{
+        "title": "",
+        "media_map_data": {},
+        "string_map_data": {"Name": {"href": "", "value": t, "timestamp": 0}},
+    } for t in topics]}
+
+    for suffix, payload in (("followers", followers_json),
+                            ("following", following_json),
+                            ("topics", topics_json)):
+        with open(os.path.join(data_dir, f"{person}_{suffix}.json"), "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
+def make_cohort(data_dir, persons=10, accounts=1000, pool=None, topics=40, seed=0):
+    """
+    Cohorte simple: cada persona toma 'accounts' seguidores y seguidos de un
+    universo común de 'pool' cuentas y 'topics' tópicos de un universo de 200.
+    """
+    rng = random.Random(seed)
+    pool = pool or accounts * 5
+    universe = [f"user_{i}" for i in range(pool)]
+    topic_universe = [f"Topic {i}" for i in range(200)]
+    os.makedirs(data_dir, exist_ok=True)
+    for i in range(persons):
+        write_person(data_dir, f"p{i:05d}",
+                     rng.sample(universe, min(accounts, pool)),
+                     rng.sample(universe, min(accounts, pool)),
+                     rng.sample(topic_universe, min(topics, 200)))
+
+
+def _weighted_sample(rng, log_weights, k, exclude=()):
+    """
+    k índices distintos con probabilidad proporcional a exp(log_weights)
+    (muestreo sin reemplazo con claves de Gumbel, una pasada sobre el universo)
+    """
+    keys = log_weights + rng.gumbel(size=len(log_weights))
+    if len(exclude):
+        keys[np.asarray(list(exclude), dtype=np.int64)] = -np.inf
+    k = min(k, len(keys) - len(exclude))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    return np.argpartition(-keys, k - 1)[:k]
+
+
+def _sizes(rng, n, persons, spread):
+    """Tamaño de una lista por persona: n, o lognormal alrededor de n con spread > 0"""
+    if spread <= 0:
+        return [n] * persons
+    return [max(1, int(round(n * f))) for f in rng.lognormal(0.0, spread, persons)]
+
+
+def make_export(data_dir, persons=10, followers=1000, following=None, topics=40, pool=None,
+                shared=0.5, mutual=0.3, alpha=1.1, topic_pool=200, spread=0.0, seed=0):
+    """
+    Cohorte de exportaciones de Instagram con estructura parecida a la real:
+    - followers / following / topics: tamaño de cada lista por persona
+      (following default: igual a followers); con spread > 0 cada persona
+      tiene tamaños lognormales alrededor de esos valores
+    - shared: fracción de cada lista tomada del universo común de 'pool'
+      cuentas (default: 5 × followers); el resto son cuentas propias de la
+      persona, que no comparte con nadie. Controla el solapamiento entre pares
+    - alpha: exponente de la popularidad (ley de potencias, peso de la cuenta
+      de rango r ∝ (r + 1)^-alpha) en el universo común y en los tópicos;
+      0 es muestreo uniforme
+    - mutual: fracción de los seguidos que también son seguidores (mutuos)
+    - topic_pool: tamaño del universo de tópicos
+    Las personas se llaman p00000, p00001, ...; las cuentas comunes user_<rango>.
+    Devuelve {persona: {"followers": n, "following": n, "topics": n}}.
+    """
+    rng = np.random.default_rng(seed)
+    following = followers if following is None else following
+    pool = pool or followers * 5
+    log_w = -alpha * np.log(np.arange(1, pool + 1, dtype=np.float64))
+    log_topic_w = -alpha * np.log(np.arange(1, topic_pool + 1, dtype=np.float64))
+    universe = [f"user_{i}" for i in range(pool)]
+    topic_universe = [f"Topic {i}" for i in range(topic_pool)]
+    low, high = TIMESTAMP_RANGE
+    os.makedirs(data_dir, exist_ok=True)
+
+    sizes = list(zip(_sizes(rng, followers, persons, spread), _sizes(rng, following, persons, spread),
+                     _sizes(rng, topics, persons, spread)))
+    summary = {}
+    for i, (n_followers, n_following, n_topics) in enumerate(sizes):
+        person = f"p{i:05d}"
+        n_shared = int(round(shared * n_followers))
+        chosen = _weighted_sample(rng, log_w, n_shared)
+        fans = [universe[j] for j in chosen.tolist()]
+        fans += [f"{person}_fan_{j}" for j in range(n_followers - len(fans))]
+
+        # Mutuos: una parte de los seguidores; el resto, comunes y propios en la proporción 'shared'
+        n_mutual = min(int(round(mutual * n_following)), len(fans))
+        follows = [fans[j] for j in rng.choice(len(fans), n_mutual, replace=False).tolist()]
+        rest = n_following - n_mutual
+        n_common = int(round(shared * rest))
+        common = _weighted_sample(rng, log_w, n_common, exclude=set(chosen.tolist()))
+        follows += [universe[j] for j in common.tolist()]
+        follows += [f"{person}_sigue_{j}" for j in range(n_following - len(follows))]
+
+        interests = [topic_universe[j] for j in _weighted_sample(rng, log_topic_w, n_topics).tolist()]
+        stamps = dict(zip(fans + follows, rng.integers(low, high, len(fans) + len(follows)).tolist()))
+        write_person(data_dir, person, fans, follows, interests, timestamps=stamps.get)
+        summary[person] = {"followers": len(fans), "following": len(follows), "topics": len(interests)}
+    return summary
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Escribe una cohorte sintética de exportaciones de Instagram")
+    ap.add_argument("data_dir", help="Carpeta de salida (se crea si no existe)")
+    ap.add_argument("--persons", type=int, default=10)
+    ap.add_argument("--followers", type=int, default=1000, help="Seguidores por persona")
+    ap.add_argument("--following", type=int, default=None, help="Seguidos por persona (default: --followers)")
+    ap.add_argument("--topics", type=int, default=40, help="Tópicos por persona")
+    ap.add_argument("--pool", type=int, default=None, help="Cuentas del universo común (default: 5 × --followers)")
+    ap.add_argument("--shared", type=float, default=0.5, help="Fracción de cada lista tomada del universo común")
+    ap.add_argument("--mutual", type=float, default=0.3, help="Fracción de seguidos que también son seguidores")
+    ap.add_argument("--alpha", type=float, default=1.1, help="Exponente de la popularidad (0: uniforme)")
+    ap.add_argument("--topic-pool", type=int, default=200)
+    ap.add_argument("--spread", type=float, default=0.0, help="Dispersión lognormal de los tamaños por persona")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    summary = make_export(args.data_dir, persons=args.persons, followers=args.followers,
+                          following=args.following, topics=args.topics, pool=args.pool,
+                          shared=args.shared, mutual=args.mutual, alpha=args.alpha,
+                          topic_pool=args.topic_pool, spread=args.spread, seed=args.seed)
+    totals = {k: sum(s[k] for s in summary.values()) for k in ("followers", "following", "topics")}
+    print(f"{len(summary)} personas en {args.data_dir}: {totals['followers']} seguidores, "
+          f"{totals['following']} seguidos, {totals['topics']} tópicos")
+
+
+if __name__ == "__main__":
+    main()
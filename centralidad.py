@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Centralidad sobre un CSRGraph: betweenness y PageRank.
+
+Betweenness (dirigida, normalizada, sin extremos):
+
+- Grafo ego (una sola persona y todas las aristas la tocan): forma cerrada.
+  Todo camino mínimo entre dos cuentas/tópicos es s -> ego -> t, así que solo
+  el ego tiene betweenness > 0:
+
+      b(ego) = (|In| · |Out| - |In ∩ Out|) / ((n - 1) · (n - 2))
+
+  Es exacta y O(E); da los mismos valores que nx.betweenness_centrality.
+- Resto de grafos: Brandes por fuente. Con k se usan k fuentes al azar
+  (semilla fija) y se reescala igual que NetworkX; con workers > 1 las
+  fuentes se reparten en un pool de procesos y se suman los parciales.
+
+PageRank: iteración de potencias vectorizada sobre la matriz de transición
+dispersa (misma aritmética que nx.pagerank, así que sin arranque en caliente
+da los mismos valores). Los nodos sin aristas de salida reparten su masa según
+'dangling' (uniforme por defecto). Se puede arrancar desde los puntajes de una
+ejecución anterior (guardados junto al CSV) para converger en pocas
+iteraciones cuando el grafo cambió poco.
+"""
+
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simbolos import KIND_PERSON
+
+
+# ----------------------------
+# Camino rápido para grafos ego
+# ----------------------------
+def ego_center(G):
+    """Índice del ego si G es un grafo ego (estrella dirigida), si no None"""
+    persons = G.nodes_of_type(KIND_PERSON)
+    if len(persons) != 1:
+        return None
+    ego = int(persons[0])
+    src, dst, _ = G.edges()
+    if not np.all((src == ego) | (dst == ego)):
+        return None
+    return ego
+
+
+def ego_betweenness(G, ego):
+    n = G.n_nodes
+    btw = np.zeros(n, dtype=float)
+    if n <= 2:
+        return btw
+    src, dst, _ = G.edges()
+    inbound = set(src[dst == ego].tolist())
+    outbound = set(dst[src == ego].tolist())
+    pairs = len(inbound) * len(outbound) - len(inbound & outbound)
+    btw[ego] = pairs * (1 / ((n - 1) * (n - 2)))
+    return btw
+
+
+# ----------------------------
+# Brandes por fuente
+# ----------------------------
+_GRAPH = None  # (indptr, indices) como listas, por proceso
+
+
+def _set_graph(indptr, indices):
+    global _GRAPH
+    _GRAPH = (indptr, indices)
+
+
+def _brandes_sources(sources):
+    """Acumulación de Brandes (caminos sin peso) para un lote de fuentes"""
+    indptr, indices = _GRAPH
+    btw = [0.0] * (len(indptr) - 1)
+    for s in sources:
+        stack = []
+        preds = {s: []}
+        sigma = {s: 1.0}
+        dist = {s: 0}
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            stack.append(v)
+            dv, sv = dist[v] + 1, sigma[v]
+            for w in indices[indptr[v]:indptr[v + 1]]:
+                if w not in dist:
+                    dist[w] = dv
+                    sigma[w] = 0.0
+                    preds[w] = []
+                    queue.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sv
+                    preds[w].append(v)
+        delta = dict.fromkeys(stack, 0.0)
+        while stack:
+            w = stack.pop()
+            coeff = (1 + delta[w]) / sigma[w]
+            for v in preds[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                btw[w] += delta[w]
+    return btw
+
+
+def _chunks(seq, n):
+    size = max(1, -(-len(seq) // n))
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+
+def betweenness(G, k=None, seed=0, workers=1):
+    """
+    Betweenness normalizada de cada nodo (array en el orden de G).
+    - k: número de fuentes muestreadas (None = todas, exacta)
+    - workers > 1: fuentes repartidas en un pool de procesos
+    """
+    ego = ego_center(G)
+    if ego is not None:
+        return ego_betweenness(G, ego)
+
+    n = G.n_nodes
+    sources = list(range(n))
+    sampled = k is not None and k < n
+    if sampled:
+        sources = sorted(random.Random(seed).sample(sources, k))
+
+    indptr, indices = G.indptr.tolist(), G.indices.tolist()
+    if workers <= 1 or len(sources) < 2 * workers:
+        _set_graph(indptr, indices)
+        btw = np.asarray(_brandes_sources(sources))
+    else:
+        btw = np.zeros(n, dtype=float)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_graph,
+                                 initargs=(indptr, indices)) as ex:
+            for part in ex.map(_brandes_sources, _chunks(sources, 4 * workers)):
+                btw += part
+
+    # Reescalado de NetworkX (normalized=True, endpoints=False, dirigido)
+    N = n - 1
+    if N < 2:
+        return btw
+    if not sampled:
+        return btw * (1 / (N * (N - 1)))
+    K = len(sources)
+    scale = np.full(n, 1 / (K * (N - 1)))
+    scale[sources] = 1 / ((K - 1) * (N - 1)) if K > 1 else np.nan
+    return btw * scale
+
+
+# ----------------------------
+# PageRank
+# ----------------------------
+def transition_matrix(G):
+    """
+    Matriz de transición por filas (CSR) y máscara de nodos sin salida.
+    Mismos pasos que nx.pagerank, para obtener los mismos valores.
+    """
+    import scipy.sparse as sp
+
+    n = G.n_nodes
+    A = sp.csr_array((np.ones(G.n_edges), G.indices, G.indptr), shape=(n, n))
+    S = A.sum(axis=1)
+    S[S != 0] = 1.0 / S[S != 0]
+    Q = sp.dia_array((S.T, 0), shape=A.shape).tocsr()
+    return Q @ A, S == 0
+
+
+def pagerank(G, alpha=0.85, tol=1.0e-6, max_iter=200, nstart=None, dangling=None):
+    """
+    PageRank de cada nodo (array en el orden de G) y diagnóstico de convergencia.
+    - nstart: vector inicial (arranque en caliente); se normaliza
+    - dangling: pesos con que reparten su masa los nodos sin salida (default: uniforme)
+    - convergencia: error L1 entre iteraciones < n * tol (criterio de NetworkX)
+
+    Si no converge en max_iter iteraciones se devuelve la última iteración con
+    info["converged"] = False, en lugar de descartar el resultado.
+    """
+    t0 = time.perf_counter()
+    n = G.n_nodes
+    info = {"iterations": 0, "error": 0.0, "converged": True, "seconds": 0.0}
+    if n == 0:
+        return np.zeros(0), info
+
+    A, is_dangling = transition_matrix(G)
+    is_dangling = np.flatnonzero(is_dangling)
+    if nstart is None:
+        x = np.repeat(1.0 / n, n)
+    else:
+        x = np.asarray(nstart, dtype=float)
+        x = x / x.sum()
+    p = np.repeat(1.0 / n, n)
+    if dangling is None:
+        dangling_weights = p
+    else:
+        dangling_weights = np.asarray(dangling, dtype=float)
+        dangling_weights = dangling_weights / dangling_weights.sum()
+
+    info["converged"] = False
+    for it in range(1, max_iter + 1):
+        xlast = x
+        # suma secuencial de la masa colgante, igual que NetworkX
+        x = alpha * (x @ A + sum(x[is_dangling].tolist()) * dangling_weights) + (1 - alpha) * p
+        err = float(np.absolute(x - xlast).sum())
+        info["iterations"], info["error"] = it, err
+        if err < n * tol:
+            info["converged"] = True
+            break
+    info["seconds"] = time.perf_counter() - t0
+    return x, info
+
+
+def warm_start_vector(G, previous):
+    """
+    Vector inicial a partir de {clave de nodo: puntaje} de una ejecución
+    anterior; los nodos nuevos arrancan con el valor uniforme.
+    """
+    n = G.n_nodes
+    if not previous or n == 0:
+        return None
+    x = np.fromiter((previous.get(G.node_key(i), 1.0 / n) for i in range(n)), dtype=float, count=n)
+    return x if x.sum() > 0 else None
+
+
+def pagerank_scores_path(csv_path):
+    return csv_path[:-len(".csv")] + ".pagerank.npz" if csv_path.endswith(".csv") else csv_path + ".pagerank.npz"
+
+
+def load_pagerank_scores(path):
+    """{clave de nodo: puntaje} guardado por save_pagerank_scores, o {}"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return dict(zip(data["nodes"].tolist(), data["scores"].tolist()))
+    except (OSError, KeyError, ValueError):
+        return {}
+
+
+def save_pagerank_scores(path, G, scores):
+    nodes = np.array([G.node_key(i) for i in range(G.n_nodes)], dtype=str)
+    tmp = path + ".tmp.npz"  # np.savez agrega .npz si falta
+    np.savez(tmp, nodes=nodes, scores=np.asarray(scores, dtype=float))
+    os.replace(tmp, path)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Exportación del grafo unificado (CSRGraph) para Gephi sin armar el documento
+en memoria.
+
+nx.write_gexf convierte el grafo a NetworkX y arma el árbol XML completo antes
+de escribir. Acá los nodos y aristas se escriben directamente desde los arrays
+de la CSR, en bloques de CHUNK elementos: la memoria extra es la de un bloque,
+sin importar el tamaño del grafo. Formatos:
+- gexf:     mismo documento que nx.write_gexf (GEXF 1.2draft)
+- graphml:  GraphML con las claves type, label, edge_type y direction
+- edgelist: par de CSV <base>.nodes.csv (Id, Label, type) y <base>.edges.csv
+            (Source, Target, Type, edge_type, direction), con los nombres de
+            columna que reconoce la importación de hojas de cálculo de Gephi
+
+Con compress=True la salida se escribe comprimida con gzip (extensión .gz;
+Gephi abre directamente los .gexf.gz y .graphml.gz).
+"""
+
+import csv
+import datetime
+import gzip
+import os
+from xml.sax.saxutils import escape
+
+from simbolos import KIND_NAMES, KIND_PREFIX
+from grafo_csr import EDGE_ATTRS
+
+GRAPH_FORMATS = ("gexf", "graphml", "edgelist")
+CHUNK = 1 << 16
+WRITE_BUFFER = 1 << 20
+GZIP_LEVEL = 6
+CREATOR = "Grafo-Red-Social (exportar_grafo.py)"
+
+# Escapes de ElementTree para valores de atributos
+_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+
+def _attr(s):
+    return escape(s, _ATTR_ENTITIES)
+
+
+def graph_paths(base, fmt, compress=False):
+    """Rutas que escribe write_graph para la base 'base' (sin extensión)"""
+    suffix = ".gz" if compress else ""
+    if fmt == "edgelist":
+        return [base + ".nodes.csv" + suffix, base + ".edges.csv" + suffix]
+    return [base + "." + fmt + suffix]
+
+
+def _open(path, compress):
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=GZIP_LEVEL)
+    return open(path, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER)
+
+
+def _chunks(n):
+    for start in range(0, n, CHUNK):
+        yield start, min(start + CHUNK, n)
+
+
+def _edge_chunks(G):
+    """(claves de origen, claves de destino, tipos, primer id) por bloque de aristas"""
+    src, dst, etype = G.edges()
+    names, kinds = G.symbols.names, G.symbols.kinds
+    node_ids = G.node_ids
+
+    def keys(local):
+        return [KIND_PREFIX[kinds[i]] + names[i] for i in node_ids[local].tolist()]
+
+    for start, stop in _chunks(G.n_edges):
+        yield keys(src[start:stop]), keys(dst[start:stop]), etype[start:stop].tolist(), start
+
+
+# ----------------------------
+# GEXF
+# ----------------------------
+def _write_gexf(G, f):
+    f.write("<?xml version='1.0' encoding='utf-8'?>\n"
+            '<gexf xmlns="http://www.gexf.net/1.2draft" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://www.gexf.net/1.2draft http://www.gexf.net/1.2draft/gexf.xsd" version="1.2">\n'
+            f'  <meta lastmodifieddate="{datetime.date.today()}">\n'
+            f"    <creator>{escape(CREATOR)}</creator>\n"
+            "  </meta>\n"
+            '  <graph defaultedgetype="directed" mode="static" name="">\n'
+            '    <attributes mode="static" class="edge">\n'
+            '      <attribute id="1" title="edge_type" type="string" />\n'
+            '      <attribute id="2" title="direction" type="string" />\n'
+            "    </attributes>\n"
+            '    <attributes mode="static" class="node">\n'
+            '      <attribute id="0" title="type" type="string" />\n'
+            "    </attributes>\n"
+            "    <nodes>\n")
+
+    # Bloques de atributos fijos por tipo de nodo / arista
+    node_tail = [f'">\n        <attvalues>\n          <attvalue for="0" value="{kind}" />\n'
+                 f"        </attvalues>\n      </node>\n" for kind in KIND_NAMES]
+    edge_tail = []
+    for attrs in EDGE_ATTRS:
+        values = "".join(f'          <attvalue for="{i}" value="{attrs[key]}" />\n'
+                         for i, key in ((1, "edge_type"), (2, "direction")) if key in attrs)
+        edge_tail.append(f'">\n        <attvalues>\n{values}        </attvalues>\n      </edge>\n')
+
+    names, kinds = G.symbols.names, G.symbols.kinds
+    for start, stop in _chunks(G.n_nodes):
+        ids = G.node_ids[start:stop].tolist()
+        f.write("".join(f'      <node id="{_attr(KIND_PREFIX[kinds[i]] + names[i])}" label="{_attr(names[i])}'
+                        + node_tail[kinds[i]] for i in ids))
+    f.write("    </nodes>\n    <edges>\n")
+    for sources, targets, types, first in _edge_chunks(G):
+        f.write("".join(f'      <edge source="{_attr(s)}" target="{_attr(t)}" id="{first + k}'
+                        + edge_tail[e] for k, (s, t, e) in enumerate(zip(sources, targets, types))))
+    f.write("    </edges>\n  </graph>\n</gexf>\n")
+
+
+# ----------------------------
+# GraphML
+# ----------------------------
+def _write_graphml(G, f):
+    f.write("<?xml version='1.0' encoding='utf-8'?>\n"
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+            'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+            '  <key id="d0" for="node" attr.name="type" attr.type="string" />\n'
+            '  <key id="d1" for="node" attr.name="label" attr.type="string" />\n'
+            '  <key id="d2" for="edge" attr.name="edge_type" attr.type="string" />\n'
+            '  <key id="d3" for="edge" attr.name="direction" attr.type="string" />\n'
+            '  <graph edgedefault="directed">\n')
+
+    edge_tail = []
+    for attrs in EDGE_ATTRS:
+        values = "".join(f'      <data key="{d}">{attrs[key]}</data>\n'
+                         for d, key in (("d2", "edge_type"), ("d3", "direction")) if key in attrs)
+        edge_tail.append(f'">\n{values}    </edge>\n')
+
+    names, kinds = G.symbols.names, G.symbols.kinds
+    for start, stop in _chunks(G.n_nodes):
+        ids = G.node_ids[start:stop].tolist()
+        f.write("".join(f'    <node id="{_attr(KIND_PREFIX[kinds[i]] + names[i])}">\n'
+                        f'      <data key="d0">{KIND_NAMES[kinds[i]]}</data>\n'
+                        f'      <data key="d1">{escape(names[i])}</data>\n'
+                        "    </node>\n" for i in ids))
+    for sources, targets, types, _ in _edge_chunks(G):
+        f.write("".join(f'    <edge source="{_attr(s)}" target="{_attr(t)}' + edge_tail[e]
+                        for s, t, e in zip(sources, targets, types)))
+    f.write("  </graph>\n</graphml>\n")
+
+
+# ----------------------------
+# Lista de aristas (CSV)
+# ----------------------------
+def _write_nodes_csv(G, f):
+    w = csv.writer(f, lineterminator="\n")
+    w.writerow(["Id", "Label", "type"])
+    names, kinds = G.symbols.names, G.symbols.kinds
+    for start, stop in _chunks(G.n_nodes):
+        w.writerows((KIND_PREFIX[kinds[i]] + names[i], names[i], KIND_NAMES[kinds[i]])
+                    for i in G.node_ids[start:stop].tolist())
+
+
+def _write_edges_csv(G, f):
+    w = csv.writer(f, lineterminator="\n")
+    w.writerow(["Source", "Target", "Type", "edge_type", "direction"])
+    rows = [("Directed", attrs["edge_type"], attrs.get("direction", "")) for attrs in EDGE_ATTRS]
+    for sources, targets, types, _ in _edge_chunks(G):
+        w.writerows((s, t) + rows[e] for s, t, e in zip(sources, targets, types))
+
+
+def write_graph(G, base, fmt="gexf", compress=False):
+    """
+    Escribe G (CSRGraph) en base + extensión del formato (ver graph_paths),
+    por bloques y a un archivo temporal que reemplaza al final. Devuelve las rutas.
+    """
+    writers = {"gexf": [_write_gexf], "graphml": [_write_graphml],
+               "edgelist": [_write_nodes_csv, _write_edges_csv]}[fmt]
+    paths = graph_paths(base, fmt, compress)
+    for write, path in zip(writers, paths):
+        tmp = path + ".tmp"
+        with _open(tmp, compress) as f:
+            write(G, f)
+        os.replace(tmp, path)
+    return paths
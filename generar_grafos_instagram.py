@@ -3,185 +3,91 @@
 
 """
 Grafo social Instagram (para múltiples personas × {followers, following, topics}) con NetworkX.
+
+NetworkX, pandas, matplotlib y plotly se importan dentro de las funciones que
+los usan: importar este módulo (p.ej. desde grafo_social.py) solo carga NumPy.
 """
 
 import argparse
-import json
-import math
 import os
-import re
-from glob import glob
-from collections import defaultdict
-
-import networkx as nx
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import plotly.graph_objects as go
 
-# ----------------------------
-# Patrones de nombres de archivo
-# ----------------------------
-FOLLOWERS_PATTERN = re.compile(r"(.+?)_followers\.json$", re.IGNORECASE)
-FOLLOWING_PATTERN = re.compile(r"(.+?)_following\.json$", re.IGNORECASE)
-TOPICS_PATTERN   = re.compile(r"(.+?)_topics\.json$",   re.IGNORECASE)
+import numpy as np
+
+from ingesta import find_triplets_by_person, load_groups, add_ingest_arguments, cache_from_args
+from simbolos import SYMBOLS, KIND_PERSON, KIND_ACCOUNT, KIND_TOPIC, KIND_NAMES, intern_blobs
+from similitud import jaccard_matrix, approx_similar_pairs
+from indice import EntityIndex
+from grafo_csr import CSRGraph, EDGE_TOPIC, coarsen
+from layout_grafo import (
+    compute_layout, incremental_layout, load_layout_snapshot, save_layout_snapshot,
+    LayoutCache, DEFAULT_LAYOUT_CACHE_DIR,
+)
+from interactivo_webgl import remove_webgl_files, write_webgl_graph
+from exportar_grafo import GRAPH_FORMATS, write_graph
+from snapshot_grafo import (
+    data_fingerprints, open_snapshot, person_blobs_from_graph, snapshot_path, write_snapshot,
+)
+from render_paralelo import RenderJob, pyplot, render_key, render_pngs
+from render_rapido import draw_nodes, draw_edges, draw_arrowheads
+from tablas_columnares import FORMATS, columnar_available, table_path, write_table
+from centralidad import (
+    betweenness, pagerank, warm_start_vector,
+    pagerank_scores_path, load_pagerank_scores, save_pagerank_scores,
+)
+from unificado_incremental import UnifiedState, state_path
 
 LAYOUT_SEED = 42
+WEBGL_MIN_EDGES = 20000  # desde aquí el HTML autocontenido se vuelve inmanejable
+FAST_PNG_MIN_EDGES = 5000  # desde aquí el PNG se dibuja con colecciones (draw_graph_fast)
+RASTERIZE_MIN_EDGES = 200000  # desde aquí las colecciones se rasterizan en salidas vectoriales
 
 
 # ----------------------------
 # Utilidades generales
 # ----------------------------
-def normalize_username(s: str) -> str:
-    if s is None: return ""
-    s = s.strip().lower()
-    if s.startswith("@"):
-        s = s[1:]
-    return s
-
-def normalize_topic(s: str) -> str:
-    if s is None: return ""
-    return s.strip().lower()
-
-def load_json(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
 def ensure_dir(p):
     os.makedirs(p, exist_ok=True)
 
-def find_triplets_by_person(data_dir):
-    files = glob(os.path.join(data_dir, "*.json"))
-    buckets = defaultdict(list)
-    for p in files:
-        base = os.path.basename(p)
-        m = FOLLOWERS_PATTERN.search(base) or FOLLOWING_PATTERN.search(base) or TOPICS_PATTERN.search(base)
-        if m:
-            buckets[m.group(1)].append(p)
-    return dict(buckets)
-
-
-# ----------------------------
-# Parsers EXACTOS al formato indicado
-# ----------------------------
-def parse_followers(path: str) -> set:
-    """
-    followers: lista raíz; cada item con "string_list_data": [{ "value": "<usuario>" }, ...]
-    """
-    data = load_json(path)
-    out = set()
-    if isinstance(data, list):
-        for item in data:
-            sld = item.get("string_list_data") or []
-            if isinstance(sld, list):
-                for e in sld:
-                    val = e.get("value")
-                    if val:
-                        out.add(normalize_username(val))
-    return {u for u in out if u}
-
-def parse_following(path: str) -> set:
-    """
-    following: objeto con "relationships_following": [ {"title": "<usuario>"}, ... ]
-    """
-    data = load_json(path)
-    out = set()
-    rel = data.get("relationships_following") or []
-    if isinstance(rel, list):
-        for item in rel:
-            title = item.get("title")
-            if title:
-                out.add(normalize_username(title))
-    return {u for u in out if u}
-
-def parse_topics(path: str) -> set:
-    """
-    topics: objeto con "topics_your_topics": [
-      {"string_map_data": {"Name": {"value": "<topic>"}}}, ...
-    ]
-    """
-    data = load_json(path)
-    out = set()
-    arr = data.get("topics_your_topics") or []
-    if isinstance(arr, list):
-        for item in arr:
-            smd = item.get("string_map_data") or {}
-            name = (smd.get("Name") or {}).get("value")
-            if name:
-                out.add(normalize_topic(name))
-    return {t for t in out if t}
-
-def parse_person_files(filepaths):
-    """
-    Devuelve dict con:
-      - person: nombre base del archivo (prefijo)
-      - followers, following, topics: sets
-    """
-    person_name = None
-    for p in filepaths:
-        base = os.path.basename(p)
-        for pat in (FOLLOWERS_PATTERN, FOLLOWING_PATTERN, TOPICS_PATTERN):
-            m = pat.search(base)
-            if m:
-                person_name = m.group(1)
-                break
-        if person_name:
-            break
-    if not person_name:
-        person_name = os.path.basename(os.path.dirname(filepaths[0]))
-
-    followers, following, topics = set(), set(), set()
-    for p in filepaths:
-        base = os.path.basename(p)
-        if FOLLOWERS_PATTERN.search(base):
-            followers |= parse_followers(p)
-        elif FOLLOWING_PATTERN.search(base):
-            following |= parse_following(p)
-        elif TOPICS_PATTERN.search(base):
-            topics |= parse_topics(p)
-
-    return {
-        "person": person_name,
-        "followers": followers,
-        "following": following,
-        "topics": topics
-    }
-
 
 # ----------------------------
 # Construcción de grafos
 # ----------------------------
-def build_ego_graph(person_blob):
+def build_ego_graph(person_blob, symbols=SYMBOLS):
     """
-    Crea un DiGraph:
+    Crea un DiGraph cuyos nodos son IDs de la tabla de símbolos:
     - Nodo persona (type=person)
     - Followers: account -> persona (edge_type='follows', direction='inbound')
     - Following: persona -> account (edge_type='follows', direction='outbound')
     - Topics: persona -> topic (edge_type='has_topic')
+    Los nodos se insertan en orden alfabético de nombre (mismo layout y mismas
+    salidas que cuando los nodos eran strings).
+    El pipeline usa CSRGraph.from_blobs; esta versión NetworkX queda como
+    referencia (CSRGraph.to_networkx() produce el mismo grafo).
     """
+    import networkx as nx
+
     G = nx.DiGraph()
-    ego = person_blob["person"]
-    G.add_node(ego, type="person", label=ego)
+    ego = person_blob["person_id"]
+    G.add_node(ego, type="person", label=person_blob["person"])
+    by_name = symbols.name
 
-    for acc in sorted(person_blob["followers"]):
-        an = f"acc:{acc}"
-        G.add_node(an, type="account", label=acc)
-        G.add_edge(an, ego, edge_type="follows", direction="inbound")
+    for acc in sorted(person_blob["followers"], key=by_name):
+        G.add_node(acc, type="account", label=by_name(acc))
+        G.add_edge(acc, ego, edge_type="follows", direction="inbound")
 
-    for acc in sorted(person_blob["following"]):
-        an = f"acc:{acc}"
-        if an not in G:
-            G.add_node(an, type="account", label=acc)
-        G.add_edge(ego, an, edge_type="follows", direction="outbound")
+    for acc in sorted(person_blob["following"], key=by_name):
+        if acc not in G:
+            G.add_node(acc, type="account", label=by_name(acc))
+        G.add_edge(ego, acc, edge_type="follows", direction="outbound")
 
-    for t in sorted(person_blob["topics"]):
-        tn = f"topic:{t}"
-        G.add_node(tn, type="topic", label=t)
-        G.add_edge(ego, tn, edge_type="has_topic")
+    for t in sorted(person_blob["topics"], key=by_name):
+        G.add_node(t, type="topic", label=by_name(t))
+        G.add_edge(ego, t, edge_type="has_topic")
 
     return G
 
 def compose_graphs(graphs):
+    import networkx as nx
     return nx.compose_all(graphs)
 
 
@@ -193,134 +99,176 @@ def jaccard_similarity(A: set, B: set) -> float:
         return 0.0
     return len(A & B) / max(1, len(A | B))
 
-def compute_similarity_matrix(person_blobs):
-    person_sets = {}
-    for p in person_blobs:
-        accs = {f"acc:{u}" for u in p["followers"] | p["following"]}
-        tops = {f"topic:{t}" for t in p["topics"]}
-        person_sets[p["person"]] = accs | tops
+def entity_set(person_blob):
+    """Cuentas (followers ∪ following) y tópicos de una persona, como IDs"""
+    return person_blob["followers"] | person_blob["following"] | person_blob["topics"]
+
+def compute_similarity_matrix(person_blobs, symbols=SYMBOLS):
+    """Jaccard de todas las parejas con un solo producto de matrices dispersas"""
+    import pandas as pd
+
+    person_sets = {p["person"]: entity_set(p) for p in person_blobs}
 
     persons = sorted(person_sets)
-    M = pd.DataFrame(index=persons, columns=persons, dtype=float)
-    for a in persons:
-        for b in persons:
-            M.loc[a, b] = jaccard_similarity(person_sets[a], person_sets[b])
-    return M
-
-def compute_person_overlap(person_blobs):
-    person_sets = {}
-    for p in person_blobs:
-        accs = {f"acc:{u}" for u in p["followers"] | p["following"]}
-        tops = {f"topic:{t}" for t in p["topics"]}
-        person_sets[p["person"]] = accs | tops
+    J = jaccard_matrix([person_sets[p] for p in persons], n_cols=len(symbols))
+    return pd.DataFrame(J, index=persons, columns=persons, dtype=float)
+
+def compute_similarity_edges(person_blobs, num_perm=128, threshold=0.5):
+    """
+    Modo aproximado (MinHash + LSH): lista dispersa de pares de personas con
+    Jaccard estimado >= threshold, en lugar de la matriz completa.
+    """
+    import pandas as pd
 
+    person_sets = {p["person"]: entity_set(p) for p in person_blobs}
     persons = sorted(person_sets)
+    pairs = approx_similar_pairs([person_sets[p] for p in persons],
+                                 num_perm=num_perm, threshold=threshold)
+    return pd.DataFrame(
+        [{"person_a": persons[i], "person_b": persons[j], "jaccard_est": est} for i, j, est in pairs],
+        columns=["person_a", "person_b", "jaccard_est"]
+    )
+
+def compute_person_overlap(person_blobs, symbols=SYMBOLS, index=None):
+    """
+    Entidades compartidas por cada par de personas, leídas del índice
+    invertido (una pasada por las entidades en vez de intersecar cada par).
+    """
+    if index is None:
+        index = EntityIndex.from_blobs(person_blobs)
+
     overlap_counts = {}
     shared_rows = []
-    for i in range(len(persons)):
-        for j in range(i+1, len(persons)):
-            a, b = persons[i], persons[j]
-            inter = person_sets[a] & person_sets[b]
-            overlap_counts[(a, b)] = len(inter)
-            for ent in inter:
-                etype = "account" if ent.startswith("acc:") else "topic"
-                shared_rows.append({
-                    "person_a": a,
-                    "person_b": b,
-                    "entity": ent.split(":", 1)[1],
-                    "type": etype
-                })
+    for (a, b), inter in index.pair_items("entities"):
+        overlap_counts[(a, b)] = len(inter)
+        for ent in inter:
+            shared_rows.append({
+                "person_a": a,
+                "person_b": b,
+                "entity": symbols.name(ent),
+                "type": symbols.kind_name(ent)
+            })
     return overlap_counts, shared_rows
 
-def export_centrality(G, person_name, out_dir):
-    btw = nx.betweenness_centrality(G, normalized=True)
-    try:
-        pr = nx.pagerank(G, alpha=0.85, max_iter=200)
-    except nx.PowerIterationFailedConvergence:
-        pr = {n: 0.0 for n in G.nodes()}
+def centrality_scores(G, name, scores_path, k=None, seed=0, workers=1,
+                      pagerank_tol=1.0e-6, warm_start=False):
+    """
+    Betweenness y PageRank de un CSRGraph con los motores de centralidad.py
+    (forma cerrada para egos, Brandes muestreado con k; PageRank disperso).
+    Con warm_start, PageRank arranca desde los puntajes de scores_path (si
+    existen) y guarda ahí los nuevos para la siguiente ejecución; sin
+    warm_start no se lee ni se escribe nada.
+    """
+    btw = betweenness(G, k=k, seed=seed, workers=workers)
+    nstart = warm_start_vector(G, load_pagerank_scores(scores_path)) if warm_start else None
+    pr, info = pagerank(G, alpha=0.85, tol=pagerank_tol, max_iter=200, nstart=nstart)
+    if not info["converged"]:
+        print(f"[WARN] PageRank de {name} no convergió en {info['iterations']} iteraciones "
+              f"(error L1 {info['error']:.3g}); se usa la última iteración")
+    if warm_start:
+        save_pagerank_scores(scores_path, G, pr)
+    return btw, pr
+
+
+def centrality_frame(G, btw, pr, nodes=None, degrees=None, node_ids=False):
+    """
+    Tabla de centralidad de los nodos indicados (default: todos). Los grados
+    salen de los arrays CSR; se pueden pasar ya calculados para reutilizarlos.
+    Con node_ids se agrega la columna node_id (ID entero de la tabla de símbolos).
+    """
+    import pandas as pd
+
+    if nodes is None:
+        nodes = range(G.n_nodes)
+    degree, in_degree, out_degree = degrees or (G.degree(), G.in_degree(), G.out_degree())
     rows = []
-    for n in G.nodes():
+    for n in nodes:
+        row = {"node_id": int(G.node_ids[n])} if node_ids else {}
         rows.append({
-            "node": n,
-            "label": G.nodes[n].get("label", n),
-            "type": G.nodes[n].get("type", ""),
-            "degree": G.degree(n),
-            "in_degree": G.in_degree(n) if isinstance(G, nx.DiGraph) else None,
-            "out_degree": G.out_degree(n) if isinstance(G, nx.DiGraph) else None,
-            "betweenness": btw.get(n, 0.0),
-            "pagerank": pr.get(n, 0.0),
+            **row,
+            "node": G.node_key(n),
+            "label": G.label(n),
+            "type": G.type_name(n),
+            "degree": int(degree[n]),
+            "in_degree": int(in_degree[n]),
+            "out_degree": int(out_degree[n]),
+            "betweenness": float(btw[n]),
+            "pagerank": float(pr[n]),
         })
-    pd.DataFrame(rows).sort_values(
+    return pd.DataFrame(rows).sort_values(
         ["type", "degree", "pagerank"], ascending=[True, False, False]
-    ).to_csv(os.path.join(out_dir, f"centralidad_{person_name}.csv"), index=False)
+    )
 
 
-# ----------------------------
-# Posicionamiento anclado de personas
-# ----------------------------
-def anchored_person_positions(persons, radius=3.2):
+def write_centrality(df, out_dir, name, fmt):
+    """centralidad_<name> en el formato pedido (columnares: type/label por diccionario)"""
+    write_table(df, table_path(out_dir, f"centralidad_{name}", fmt), fmt, dictionary=("type", "label"))
+
+
+def export_centrality(G, person_name, out_dir, fmt="csv", **opts):
+    """Centralidad de un grafo ego, calculada sobre el propio ego"""
+    csv_path = os.path.join(out_dir, f"centralidad_{person_name}.csv")
+    btw, pr = centrality_scores(G, person_name, pagerank_scores_path(csv_path), **opts)
+    write_centrality(centrality_frame(G, btw, pr, node_ids=fmt != "csv"), out_dir, person_name, fmt)
+
+
+def export_unified_centrality(G, person_blobs, out_dir, per_person=True, fmt="csv", **opts):
     """
-    Devuelve posiciones ancla en círculo para los nodos persona.
-    - 1 persona: centro (0,0)
-    - 2+ personas: ubicadas en círculo de radio 'radius'
+    Centralidad del grafo unificado, calculada una sola vez:
+    - centralidad_unificado.csv con todos los nodos (ranking entre personas)
+    - con per_person, centralidad_<persona>.csv como corte de ese resultado
+      (los nodos del ego de cada persona, con sus métricas en el grafo unificado)
+    Con fmt parquet/arrow se escriben .parquet/.arrow en lugar de .csv.
     """
-    pos = {}
-    n = len(persons)
-    if n == 1:
-        pos[persons[0]] = (0.0, 0.0)
-        return pos
-    for i, p in enumerate(sorted(persons)):
-        theta = 2.0 * math.pi * i / n
-        pos[p] = (radius * math.cos(theta), radius * math.sin(theta))
-    return pos
+    csv_path = os.path.join(out_dir, "centralidad_unificado.csv")
+    btw, pr = centrality_scores(G, "grafo unificado", pagerank_scores_path(csv_path), **opts)
+    degrees = (G.degree(), G.in_degree(), G.out_degree())
+    node_ids = fmt != "csv"
+    write_centrality(centrality_frame(G, btw, pr, degrees=degrees, node_ids=node_ids),
+                     out_dir, "unificado", fmt)
+    if per_person:
+        for blob in person_blobs:
+            write_centrality(centrality_frame(G, btw, pr, G.ego_nodes(blob), degrees, node_ids),
+                             out_dir, blob["person"], fmt)
 
 
 # ----------------------------
-# Dibujo PNG con colores, tamaños, leyenda y anclaje
+# Colores por nodo (compartidos por PNG e interactivo)
 # ----------------------------
-def draw_graph(G, title, out_path, show_labels=False, label_persons=True):
+# Leyenda del grafo interactivo: (nombre, color, símbolo)
+LEGEND_ITEMS = [
+    ("Follower (te sigue)", "#2ecc71", "circle"),
+    ("Following (sigues tú)", "#3498db", "circle"),
+    ("Conexión mutua", "#9b59b6", "circle"),
+    ("Tópico individual", "#7f8c8d", "triangle-up"),
+    ("Cuenta compartida por 2 personas", "#f1c40f", "circle"),
+    ("Cuenta compartida por 3+ personas", "#e74c3c", "circle"),
+    ("Tópico compartido por 2 personas", "#f39c12", "triangle-up"),
+    ("Tópico compartido por 3+ personas", "#c0392b", "triangle-up"),
+    ("Ego (persona principal)", "#2f4858", "square"),
+]
+
+
+def legend_handles():
+    """Parches de la leyenda de los PNG (mismos nombres y colores que LEGEND_ITEMS)"""
+    import matplotlib.patches as mpatches
+    return [mpatches.Patch(color=color, label=name) for name, color, _ in LEGEND_ITEMS]
+
+
+def node_colors(G, classes):
     """
-    Dibuja el grafo con colores diferenciados, tamaños reducidos, leyenda y
-    posiciones ancladas para las personas (evita solapamientos entre egos).
-    - show_labels: si True, etiqueta TODOS los nodos (no recomendado en grafos grandes)
-    - label_persons: si True, muestra SIEMPRE la etiqueta de cada ego sobre su nodo
+    Color de cada nodo cuenta/tópico a partir de la tabla NodeClasses:
+    - cuentas: follower verde, following azul, mutuo púrpura;
+      compartidas por 2 personas amarillo, por 3+ rojo
+    - tópicos: gris; compartidos por 2 naranja, por 3+ rojo oscuro
+    Devuelve una lista indexada por nodo (None para personas).
     """
-    plt.figure(figsize=(13, 9))
-
-    # Identificar tipos de nodos para anclar personas
-    persons = [n for n, d in G.nodes(data=True) if d.get("type") == "person"]
-    accounts = [n for n, d in G.nodes(data=True) if d.get("type") == "account"]
-    topics   = [n for n, d in G.nodes(data=True) if d.get("type") == "topic"]
-    person_nodes = set(persons)
-
-    # Layout con personas ancladas
-    pos_init = anchored_person_positions(persons, radius=3.2)
-    pos = nx.spring_layout(
-        G,
-        seed=LAYOUT_SEED,
-        k=0.45,
-        iterations=80,
-        pos=pos_init,
-        fixed=persons
-    )
-
-    # Conexiones de cada nodo con personas (para marcar compartidos)
-    connection_count = {}
-    for n in G.nodes():
-        if G.nodes[n].get("type") != "person":
-            linked_persons = {p for p in person_nodes if G.has_edge(p, n) or G.has_edge(n, p)}
-            connection_count[n] = len(linked_persons)
-
-    # Colores para followers/following
-    account_colors = []
-    for n in accounts:
-        conns = connection_count.get(n, 0)
-        in_to_person = any(G.has_edge(n, p) for p in persons)
-        out_from_person = any(G.has_edge(p, n) for p in persons)
-
-        if in_to_person and not out_from_person:
+    colors = [None] * G.n_nodes
+    for n in G.nodes_of_type(KIND_ACCOUNT).tolist():
+        conns = classes.n_persons[n]
+        if classes.follower[n] and not classes.following[n]:
             base_color = "#2ecc71"  # verde followers
-        elif out_from_person and not in_to_person:
+        elif classes.following[n] and not classes.follower[n]:
             base_color = "#3498db"  # azul following
         else:
             base_color = "#9b59b6"  # púrpura (mutuo)
@@ -329,12 +277,10 @@ def draw_graph(G, title, out_path, show_labels=False, label_persons=True):
             base_color = "#f1c40f"  # amarillo (compartido por 2)
         elif conns >= 3:
             base_color = "#e74c3c"  # rojo (compartido por 3+)
-        account_colors.append(base_color)
+        colors[n] = base_color
 
-    # Colores para tópicos
-    topic_colors = []
-    for n in topics:
-        conns = connection_count.get(n, 0)
+    for n in G.nodes_of_type(KIND_TOPIC).tolist():
+        conns = classes.n_persons[n]
         if conns == 0:
             base_color = "#7f8c8d"  # gris
         elif conns == 2:
@@ -343,55 +289,99 @@ def draw_graph(G, title, out_path, show_labels=False, label_persons=True):
             base_color = "#c0392b"  # rojo oscuro (3+)
         else:
             base_color = "#95a5a6"  # gris medio
-        topic_colors.append(base_color)
+        colors[n] = base_color
+    return colors
+
+
+# ----------------------------
+# Dibujo PNG con colores, tamaños, leyenda y anclaje
+# ----------------------------
+def aggregate_sizes(weight, base):
+    """Tamaño (puntos²) de los nodos de la vista agregada: crece con log2 de las cuentas que representan"""
+    return base * (1 + np.log2(np.maximum(weight, 1)))
+
+
+def draw_aggregate_labels(ax, G, positions, weights):
+    """Etiqueta de cada supernodo con las cuentas que agrupa ("persona: n categoría")"""
+    for n in np.flatnonzero(weights > 1).tolist():
+        x, y = positions[n]
+        ax.text(x, y - 0.05, G.label(n), ha="center", va="top", fontsize=8, color="#333")
+
+
+def draw_graph(G, title, out_path, show_labels=False, label_persons=True, classes=None,
+               positions=None, weights=None):
+    """
+    Dibuja el grafo (CSRGraph) con colores diferenciados, tamaños reducidos, leyenda y
+    posiciones ancladas para las personas (evita solapamientos entre egos).
+    - show_labels: si True, etiqueta TODOS los nodos (no recomendado en grafos grandes)
+    - label_persons: si True, muestra SIEMPRE la etiqueta de cada ego sobre su nodo
+    - classes: tabla NodeClasses ya calculada (se reutiliza entre renderers)
+    - positions: array n × 2 de layout_grafo.compute_layout (se calcula si falta)
+    - weights: cuentas que representa cada nodo en la vista agregada (grafo_csr.coarsen)
+    """
+    import networkx as nx
+    plt = pyplot()
+
+    plt.figure(figsize=(13, 9))
+
+    # Identificar tipos de nodos para anclar personas (nodos = índices del CSRGraph)
+    persons = G.nodes_of_type(KIND_PERSON).tolist()
+    accounts = G.nodes_of_type(KIND_ACCOUNT).tolist()
+    topics   = G.nodes_of_type(KIND_TOPIC).tolist()
+    H = G.to_networkx(attrs=False)
+
+    # Layout con personas ancladas (calculado una vez y compartido entre renderers)
+    if positions is None:
+        positions = compute_layout(G, LAYOUT_SEED)
+    pos = dict(enumerate(positions))
+
+    # Clasificación de cada nodo respecto de las personas (una pasada por aristas)
+    colors = node_colors(G, G.node_classes() if classes is None else classes)
+    account_colors = [colors[n] for n in accounts]
+    topic_colors = [colors[n] for n in topics]
 
     # Tamaños (reducidos)
     ego_size = 700
     account_size = 120
     topic_size = 90
+    if weights is not None:
+        account_size = aggregate_sizes(weights[accounts], account_size)
 
     # Nodos
-    nx.draw_networkx_nodes(G, pos, nodelist=persons, node_shape="s", node_size=ego_size,
+    nx.draw_networkx_nodes(H, pos, nodelist=persons, node_shape="s", node_size=ego_size,
                            node_color="#2f4858", alpha=0.95, label="Ego (persona principal)")
-    nx.draw_networkx_nodes(G, pos, nodelist=accounts, node_shape="o", node_size=account_size,
+    nx.draw_networkx_nodes(H, pos, nodelist=accounts, node_shape="o", node_size=account_size,
                            node_color=account_colors, alpha=0.85)
-    nx.draw_networkx_nodes(G, pos, nodelist=topics, node_shape="^", node_size=topic_size,
+    nx.draw_networkx_nodes(H, pos, nodelist=topics, node_shape="^", node_size=topic_size,
                            node_color=topic_colors, alpha=0.85)
 
     # Aristas
-    follows_edges = [(u, v) for u, v, d in G.edges(data=True) if d.get("edge_type") == "follows"]
-    topic_edges   = [(u, v) for u, v, d in G.edges(data=True) if d.get("edge_type") == "has_topic"]
-    nx.draw_networkx_edges(G, pos, edgelist=follows_edges, width=0.4, alpha=0.25,
+    src, dst, etype = G.edges()
+    is_topic_edge = etype == EDGE_TOPIC
+    follows_edges = list(zip(src[~is_topic_edge].tolist(), dst[~is_topic_edge].tolist()))
+    topic_edges   = list(zip(src[is_topic_edge].tolist(), dst[is_topic_edge].tolist()))
+    nx.draw_networkx_edges(H, pos, edgelist=follows_edges, width=0.4, alpha=0.25,
                            arrows=True, arrowstyle="-|>", edge_color="#bdc3c7")
-    nx.draw_networkx_edges(G, pos, edgelist=topic_edges, width=0.7, alpha=0.3,
+    nx.draw_networkx_edges(H, pos, edgelist=topic_edges, width=0.7, alpha=0.3,
                            arrows=True, arrowstyle="-|>", edge_color="#7f8c8d")
 
     # Etiquetas (opcional: todos los nodos)
     if show_labels:
-        labels = {n: G.nodes[n].get("label", n) for n in G.nodes()}
-        nx.draw_networkx_labels(G, pos, labels=labels, font_size=7)
+        labels = {n: G.label(n) for n in range(G.n_nodes)}
+        nx.draw_networkx_labels(H, pos, labels=labels, font_size=7)
 
     # Etiquetas SIEMPRE visibles para egos
     if label_persons and persons:
         for p in persons:
-            lbl = G.nodes[p].get("label", p)
+            lbl = G.label(p)
             x, y = pos[p]
             plt.text(x, y + 0.06, lbl, ha="center", va="bottom",
                      fontsize=10, fontweight="bold", color="#111")
+    if weights is not None:
+        draw_aggregate_labels(plt.gca(), G, positions, weights)
 
     # Leyenda
-    legend_handles = [
-        mpatches.Patch(color="#2ecc71", label="Follower (te sigue)"),
-        mpatches.Patch(color="#3498db", label="Following (sigues tú)"),
-        mpatches.Patch(color="#9b59b6", label="Conexión mutua"),
-        mpatches.Patch(color="#7f8c8d", label="Tópico individual"),
-        mpatches.Patch(color="#f1c40f", label="Cuenta compartida por 2 personas"),
-        mpatches.Patch(color="#e74c3c", label="Cuenta compartida por 3+ personas"),
-        mpatches.Patch(color="#f39c12", label="Tópico compartido por 2 personas"),
-        mpatches.Patch(color="#c0392b", label="Tópico compartido por 3+ personas"),
-        mpatches.Patch(color="#2f4858", label="Ego (persona principal)")
-    ]
-    plt.legend(handles=legend_handles, loc="upper right", fontsize=8, frameon=True)
+    plt.legend(handles=legend_handles(), loc="upper right", fontsize=8, frameon=True)
 
     plt.title(title, fontsize=14)
     plt.axis("off")
@@ -400,12 +390,79 @@ def draw_graph(G, title, out_path, show_labels=False, label_persons=True):
     plt.close()
 
 
+def draw_graph_fast(G, title, out_path, show_labels=False, label_persons=True, classes=None,
+                    positions=None, weights=None, arrows=True, rasterized=None):
+    """
+    Misma figura que draw_graph (paleta, tamaños, leyenda y etiquetas de egos)
+    dibujada con colecciones (render_rapido): un LineCollection por estilo de
+    arista, puntas de flecha livianas opcionales y un scatter por forma de nodo.
+    - rasterized: colecciones como imagen en salidas vectoriales (SVG/PDF);
+      None = solo con más de RASTERIZE_MIN_EDGES aristas
+    """
+    if rasterized is None:
+        rasterized = G.n_edges > RASTERIZE_MIN_EDGES
+    plt = pyplot()
+    fig = plt.figure(figsize=(13, 9))
+    ax = fig.gca()
+
+    if positions is None:
+        positions = compute_layout(G, LAYOUT_SEED)
+    positions = np.asarray(positions, dtype=float)
+    colors = node_colors(G, G.node_classes() if classes is None else classes)
+
+    # Nodos: un scatter por forma (tamaños como en draw_graph)
+    sizes = np.array([700.0, 120.0, 90.0])[G.node_type]  # por KIND_*: ego, cuenta, tópico
+    if weights is not None:
+        accounts = G.nodes_of_type(KIND_ACCOUNT)
+        sizes[accounts] = aggregate_sizes(weights[accounts], 120.0)
+    persons = G.nodes_of_type(KIND_PERSON)
+    draw_nodes(ax, positions, persons, "s", sizes[persons], "#2f4858", alpha=0.95,
+               rasterized=rasterized)
+    for kind, marker in ((KIND_ACCOUNT, "o"), (KIND_TOPIC, "^")):
+        nodes = G.nodes_of_type(kind)
+        draw_nodes(ax, positions, nodes, marker, sizes[nodes], [colors[n] for n in nodes.tolist()],
+                   alpha=0.85, rasterized=rasterized)
+
+    # Aristas: un LineCollection por estilo
+    src, dst, etype = G.edges()
+    is_topic_edge = etype == EDGE_TOPIC
+    edge_styles = [(~is_topic_edge, 0.4, 0.25, "#bdc3c7"), (is_topic_edge, 0.7, 0.3, "#7f8c8d")]
+    for mask, width, alpha, color in edge_styles:
+        draw_edges(ax, positions, src[mask], dst[mask], width=width, alpha=alpha, color=color,
+                   rasterized=rasterized)
+
+    # Etiquetas (opcional: todos los nodos) y SIEMPRE visibles para egos
+    if show_labels:
+        for n in range(G.n_nodes):
+            ax.text(positions[n, 0], positions[n, 1], G.label(n), ha="center", va="center", fontsize=7)
+    if label_persons:
+        for p in persons.tolist():
+            x, y = positions[p]
+            ax.text(x, y + 0.06, G.label(p), ha="center", va="bottom",
+                    fontsize=10, fontweight="bold", color="#111")
+    if weights is not None:
+        draw_aggregate_labels(ax, G, positions, weights)
+
+    ax.legend(handles=legend_handles(), loc="upper right", fontsize=8, frameon=True)
+    ax.set_title(title, fontsize=14)
+    ax.axis("off")
+    fig.tight_layout()
+
+    # Puntas de flecha al final: dependen de la escala definitiva de los ejes
+    if arrows:
+        for mask, _, alpha, color in edge_styles:
+            draw_arrowheads(ax, positions, src[mask], dst[mask], sizes[dst[mask]],
+                            color=color, alpha=alpha, rasterized=rasterized)
+    fig.savefig(out_path, dpi=180)
+    plt.close(fig)
+
+
 # ----------------------------
 # Dibujo INTERACTIVO (HTML) con la misma paleta y etiquetas fijas en egos
 # ----------------------------
-def draw_interactive_graph(G, title, out_html):
+def draw_interactive_graph(G, title, out_html, classes=None, positions=None):
     """
-    Versión interactiva HTML con el mismo esquema de colores/tipos que el PNG:
+    Versión interactiva HTML (desde un CSRGraph) con el mismo esquema de colores/tipos que el PNG:
     - Followers (solo edge hacia persona): verde
     - Following (solo edge desde persona): azul
     - Conexión mutua (ambas): púrpura
@@ -413,24 +470,22 @@ def draw_interactive_graph(G, title, out_html):
     - Nodos compartidos por 2/3 personas: amarillo/rojo
     - Egos: cuadrados gris oscuro con etiqueta fija encima
     Posiciones de personas ancladas para evitar superposición.
+    Los colores salen de la tabla NodeClasses (classes, o se calcula si falta) y
+    las posiciones de positions (o de layout_grafo.compute_layout).
     """
-    persons = [n for n, d in G.nodes(data=True) if d.get("type") == "person"]
-    accounts = [n for n, d in G.nodes(data=True) if d.get("type") == "account"]
-    topics   = [n for n, d in G.nodes(data=True) if d.get("type") == "topic"]
-    person_nodes = set(persons)
-
-    # Posiciones (ancladas como en PNG)
-    pos_init = anchored_person_positions(persons, radius=3.2)
-    pos = nx.spring_layout(
-        G, seed=LAYOUT_SEED, k=0.45, iterations=80, pos=pos_init, fixed=persons
-    )
+    import plotly.graph_objects as go
+
+    persons = G.nodes_of_type(KIND_PERSON).tolist()
+    accounts = G.nodes_of_type(KIND_ACCOUNT).tolist()
+    topics   = G.nodes_of_type(KIND_TOPIC).tolist()
+
+    # Posiciones (ancladas como en PNG; las mismas si se pasan ya calculadas)
+    if positions is None:
+        positions = compute_layout(G, LAYOUT_SEED)
+    pos = dict(enumerate(positions))
 
-    # Conteo de en cuántas personas aparece cada nodo (para marcar compartidos)
-    connection_count = {}
-    for n in G.nodes():
-        if G.nodes[n].get("type") != "person":
-            linked_persons = {p for p in person_nodes if G.has_edge(p, n) or G.has_edge(n, p)}
-            connection_count[n] = len(linked_persons)
+    # Colores desde la tabla de clasificación (la misma que usa el PNG)
+    colors = node_colors(G, G.node_classes() if classes is None else classes)
 
     # Listas para un único scatter de nodos
     node_x, node_y, node_color, node_symbol, node_size, node_text = [], [], [], [], [], []
@@ -442,44 +497,20 @@ def draw_interactive_graph(G, title, out_html):
 
     # Egos
     for n in persons:
-        add_node(n, "#2f4858", "square", 16, f"{G.nodes[n].get('label', n)} (persona)")
+        add_node(n, "#2f4858", "square", 16, f"{G.label(n)} (persona)")
 
     # Accounts (followers/following/mutuos + compartidos)
     for n in accounts:
-        conns = connection_count.get(n, 0)
-        in_to_person = any(G.has_edge(n, p) for p in persons)
-        out_from_person = any(G.has_edge(p, n) for p in persons)
-
-        if in_to_person and not out_from_person:
-            base_color = "#2ecc71"  # follower
-        elif out_from_person and not in_to_person:
-            base_color = "#3498db"  # following
-        else:
-            base_color = "#9b59b6"  # mutuo
-
-        if conns == 2:
-            base_color = "#f1c40f"  # compartido por 2
-        elif conns >= 3:
-            base_color = "#e74c3c"  # compartido por 3
-
-        add_node(n, base_color, "circle", 8, f"{G.nodes[n].get('label', n)} (cuenta)")
+        add_node(n, colors[n], "circle", 8, f"{G.label(n)} (cuenta)")
 
     # Topics
     for n in topics:
-        conns = connection_count.get(n, 0)
-        if conns == 0:
-            base_color = "#7f8c8d"
-        elif conns == 2:
-            base_color = "#f39c12"
-        elif conns >= 3:
-            base_color = "#c0392b"
-        else:
-            base_color = "#95a5a6"
-        add_node(n, base_color, "triangle-up", 7, f"{G.nodes[n].get('label', n)} (tópico)")
+        add_node(n, colors[n], "triangle-up", 7, f"{G.label(n)} (tópico)")
 
     # Aristas
     edge_x, edge_y = [], []
-    for u, v in G.edges():
+    src, dst, _ = G.edges()
+    for u, v in zip(src.tolist(), dst.tolist()):
         x0, y0 = pos[u]; x1, y1 = pos[v]
         edge_x += [x0, x1, None]; edge_y += [y0, y1, None]
 
@@ -504,7 +535,7 @@ def draw_interactive_graph(G, title, out_html):
     # Etiquetas fijas para PERSONAS (egos)
     ego_x = [pos[n][0] for n in persons]
     ego_y = [pos[n][1] for n in persons]
-    ego_text = [G.nodes[n].get("label", n) for n in persons]
+    ego_text = [G.label(n) for n in persons]
     fig.add_trace(go.Scatter(
         x=ego_x, y=ego_y,
         mode="text",
@@ -515,18 +546,7 @@ def draw_interactive_graph(G, title, out_html):
     ))
 
     # Leyenda manual
-    legend_items = [
-        ("Follower (te sigue)", "#2ecc71", "circle"),
-        ("Following (sigues tú)", "#3498db", "circle"),
-        ("Conexión mutua", "#9b59b6", "circle"),
-        ("Tópico individual", "#7f8c8d", "triangle-up"),
-        ("Cuenta compartida por 2 personas", "#f1c40f", "circle"),
-        ("Cuenta compartida por 3+ personas", "#e74c3c", "circle"),
-        ("Tópico compartido por 2 personas", "#f39c12", "triangle-up"),
-        ("Tópico compartido por 3+ personas", "#c0392b", "triangle-up"),
-        ("Ego (persona principal)", "#2f4858", "square"),
-    ]
-    for name, color, symbol in legend_items:
+    for name, color, symbol in LEGEND_ITEMS:
         fig.add_trace(go.Scatter(
             x=[None], y=[None], mode="markers",
             marker=dict(size=10, color=color, symbol=symbol),
@@ -545,89 +565,391 @@ def draw_interactive_graph(G, title, out_html):
     print(f"Grafo interactivo guardado en {out_html}")
 
 
+def draw_interactive_graph_gl(G, title, out_html, classes=None, positions=None):
+    """
+    Versión WebGL del grafo interactivo para grafos grandes (interactivo_webgl):
+    misma paleta y leyenda, datos en archivos aparte (.bin/.json) y nivel de
+    detalle por grado al alejar la vista.
+    """
+    colors = node_colors(G, G.node_classes() if classes is None else classes)
+    if positions is None:
+        positions = compute_layout(G, LAYOUT_SEED)
+    write_webgl_graph(G, title, out_html, positions, colors, LEGEND_ITEMS)
+    print(f"Grafo interactivo (WebGL) guardado en {out_html} (abrir servido por HTTP)")
+
+
 # ----------------------------
-# Programa principal
+# Meta-grafo de personas
 # ----------------------------
-def main():
-    ap = argparse.ArgumentParser()
+def draw_person_connections(persons, overlap_counts, out_path):
+    """Meta-grafo de personas ponderado por entidades compartidas ({(a, b): conteo})"""
+    import networkx as nx
+    plt = pyplot()
+
+    H = nx.Graph()
+    for p in persons:
+        H.add_node(p, type="person")
+    for (a, b), w in overlap_counts.items():
+        H.add_edge(a, b, weight=w)
+
+    plt.figure(figsize=(6, 5))
+    posH = nx.spring_layout(H, seed=LAYOUT_SEED)
+    weights = [H[u][v]["weight"] for u, v in H.edges()] if H.number_of_edges() else []
+    nx.draw_networkx_nodes(H, posH, node_color="#2f4858", node_size=900)
+    nx.draw_networkx_labels(H, posH, font_size=10, font_color="white")
+    if weights:
+        nx.draw_networkx_edges(H, posH, width=[0.8 + 0.4*w for w in weights], edge_color="#888888")
+        nx.draw_networkx_edge_labels(H, posH, edge_labels={(u, v): H[u][v]["weight"] for u, v in H.edges()}, font_size=9)
+    plt.title("Personas conectadas por entidades compartidas (peso = conteo)")
+    plt.axis("off")
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=140)
+    plt.close()
+
+
+# ----------------------------
+# Etapas del pipeline (también las usa grafo_social.py, una por subcomando)
+# ----------------------------
+def load_unified(groups, out_dir, stream=False, cache=None, workers=1, snapshot=True):
+    """
+    Blobs internados (ordenados por persona) y grafo unificado de {persona: rutas}.
+    Con snapshot, si el de out_dir está al día grafo y símbolos salen del mmap
+    sin parsear nada; si no, se parsea y se escribe uno nuevo.
+    """
+    path = snapshot_path(out_dir)
+    G = open_snapshot(path, groups) if snapshot else None
+    if G is not None:
+        print(f"Snapshot: {G.n_nodes} nodos y {G.n_edges} aristas cargados de {path}")
+        return person_blobs_from_graph(G), G
+    files = data_fingerprints(groups) if snapshot else None
+    person_blobs = intern_blobs(load_groups(groups, stream=stream, cache=cache, workers=workers))
+    G = CSRGraph.from_blobs(person_blobs)  # directo desde los blobs, sin compose_all
+    if snapshot:
+        write_snapshot(path, G, files)
+    return person_blobs, G
+
+
+def graph_layout(G, name, out_dir, engine="auto", cache=None, incremental=False):
+    """Posiciones de G; con incremental parte de la foto anterior en out_dir y solo reubica lo que cambió"""
+    if not incremental:
+        return compute_layout(G, LAYOUT_SEED, engine=engine, cache=cache)
+    path = os.path.join(out_dir, f".layout_{name}.npz")
+    positions, moved = incremental_layout(G, load_layout_snapshot(path), LAYOUT_SEED,
+                                          engine=engine, cache=cache)
+    if moved:
+        print(f"Layout {name}: {moved} de {G.n_nodes} nodos reubicados")
+        save_layout_snapshot(path, G, positions)
+    return positions
+
+
+def png_job(G, title, out_path, renderer="auto", classes=None, positions=None, weights=None):
+    """RenderJob del PNG de G (draw_graph_fast con más de FAST_PNG_MIN_EDGES aristas en modo auto)"""
+    fast = renderer == "fast" or (renderer == "auto" and G.n_edges > FAST_PNG_MIN_EDGES)
+    key = render_key(G, positions, title=title, show_labels=False, label_persons=True,
+                     renderer="fast" if fast else "networkx")
+    return RenderJob(out_path, key, draw_graph_fast if fast else draw_graph,
+                     (G, title, out_path),
+                     dict(show_labels=False, label_persons=True,
+                          classes=classes, positions=positions, weights=weights),
+                     cost=G.n_edges)
+
+
+def person_connections_job(persons, overlap_counts, out_dir):
+    """RenderJob del meta-grafo de personas ponderado por entidades compartidas"""
+    out_path = os.path.join(out_dir, "conexiones_entre_personas.png")
+    return RenderJob(out_path, render_key(persons=persons, overlap=sorted(overlap_counts.items())),
+                     draw_person_connections, (persons, overlap_counts, out_path),
+                     cost=len(overlap_counts))
+
+
+def unified_view(G, out_dir, view="full", fmt="csv"):
+    """
+    Grafo que se dibuja: (grafo, pesos, nombre). Completo, o agregado (cuentas
+    de una sola persona agrupadas en supernodos por persona y categoría, con
+    los conteos en grafo_agregado).
+    """
+    if view != "aggregated":
+        return G, None, "unificado"
+    import pandas as pd
+
+    G_view, weights, groups = coarsen(G)
+    write_table(pd.DataFrame(groups, columns=["person", "category", "accounts"]),
+                table_path(out_dir, "grafo_agregado", fmt), fmt, dictionary=("person", "category"))
+    print(f"Vista agregada: {sum(c for _, _, c in groups)} cuentas de una sola persona "
+          f"en {len(groups)} supernodos; se dibujan {G_view.n_nodes} de {G.n_nodes} nodos")
+    return G_view, weights, "unificado_agregado"
+
+
+def export_interactive(G, out_dir, mode="auto", classes=None, positions=None):
+    """
+    Interactivo con tooltips y etiquetas fijas de egos (WebGL en grafos grandes).
+    Al volver al HTML autocontenido se quitan los archivos de una salida WebGL anterior.
+    """
+    use_gl = mode == "webgl" or (mode == "auto" and G.n_edges > WEBGL_MIN_EDGES)
+    out_html = os.path.join(out_dir, "grafo_interactivo.html")
+    if not use_gl:
+        remove_webgl_files(out_html)
+    (draw_interactive_graph_gl if use_gl else draw_interactive_graph)(
+        G,
+        "Grafo interactivo (pasa el cursor para ver nombres)",
+        out_html,
+        classes=classes,
+        positions=positions
+    )
+
+
+def export_similarity(person_blobs, out_dir, fmt="csv", similarity="exact", num_perm=128,
+                      threshold=0.5, state=None):
+    """
+    Similitud (matriz de Jaccard o pares aproximados) y entidades compartidas;
+    en modo incremental salen del estado actualizado. Devuelve overlap_counts.
+    """
+    import pandas as pd
+
+    if state is not None:
+        overlap_counts, shared_rows = state.overlap()
+    else:
+        index = EntityIndex.from_blobs(person_blobs)
+        overlap_counts, shared_rows = compute_person_overlap(person_blobs, index=index)
+    # En formatos columnares las tablas por pares se parten por person_a
+    # (row groups / batches), con person_b como partición secundaria porque
+    # guardan cada par una vez; la matriz de similitud se escribe en formato
+    # largo, que ya tiene las dos orientaciones
+    pair_opts = dict(partition=("person_a", "person_b"), dictionary=("person_a", "person_b")) if fmt != "csv" else {}
+    if similarity == "approx":
+        write_table(compute_similarity_edges(person_blobs, num_perm=num_perm, threshold=threshold),
+                    table_path(out_dir, "similitud_aproximada", fmt), fmt, **pair_opts)
+    else:
+        simM = state.similarity_frame() if state is not None else compute_similarity_matrix(person_blobs)
+        if fmt == "csv":
+            simM.to_csv(os.path.join(out_dir, "matriz_similitud.csv"))
+        else:
+            sim_long = simM.rename_axis(index="person_a", columns="person_b").stack()
+            write_table(sim_long.rename("jaccard").reset_index(),
+                        table_path(out_dir, "matriz_similitud", fmt), fmt,
+                        **dict(pair_opts, partition="person_a"))
+
+    # Columnas explícitas: sin entidades compartidas la tabla queda vacía pero con su esquema
+    shared_df = pd.DataFrame(shared_rows, columns=["person_a", "person_b", "entity", "type"])
+    shared_df = shared_df.sort_values(["type", "entity", "person_a", "person_b"])
+    if fmt != "csv":
+        shared_df.insert(0, "entity_id", np.array([SYMBOLS.lookup(KIND_NAMES.index(t), e)
+                                                   for t, e in zip(shared_df["type"], shared_df["entity"])],
+                                                  dtype=np.int64))
+        pair_opts["dictionary"] += ("entity", "type")
+    write_table(shared_df, table_path(out_dir, "entidades_compartidas", fmt), fmt, **pair_opts)
+    return overlap_counts
+
+
+# ----------------------------
+# Opciones de línea de comandos (por etapa)
+# ----------------------------
+def add_io_arguments(ap):
     ap.add_argument("--data", default="./data", help="Carpeta con JSON (default: ./data)")
     ap.add_argument("--out", default="./out",  help="Carpeta de salida (default: ./out)")
-    args = ap.parse_args()
+    ap.add_argument("--no-snapshot", action="store_true",
+                    help="No lee ni escribe el snapshot binario del grafo unificado (out/.grafo_unificado.snap)")
+    add_ingest_arguments(ap)
 
-    ensure_dir(args.out)
 
+def add_format_arguments(ap):
+    ap.add_argument("--format", choices=FORMATS, default="csv",
+                    help="Formato de las tablas (centralidad, similitud, entidades compartidas): "
+                         "csv, o columnar parquet/arrow (requiere pyarrow)")
+
+
+def add_similarity_arguments(ap):
+    ap.add_argument("--similarity", choices=["exact", "approx"], default="exact",
+                    help="exact: matriz completa de Jaccard; approx: MinHash/LSH con lista de pares")
+    ap.add_argument("--minhash-perm", type=int, default=128,
+                    help="Tamaño de la firma MinHash en modo approx (default: 128)")
+    ap.add_argument("--similarity-threshold", type=float, default=0.5,
+                    help="Jaccard mínimo de los pares emitidos en modo approx (default: 0.5)")
+
+
+def add_centrality_arguments(ap):
+    ap.add_argument("--centrality", choices=["unified", "ego"], default="unified",
+                    help="CSV por persona: corte de la centralidad del grafo unificado, o calculada sobre cada ego")
+    ap.add_argument("--betweenness-k", type=int, default=None,
+                    help="Betweenness muestreada con k fuentes (default: exacta; los egos usan siempre la forma cerrada)")
+    ap.add_argument("--betweenness-seed", type=int, default=0,
+                    help="Semilla del muestreo de fuentes (default: 0)")
+    ap.add_argument("--pagerank-tol", type=float, default=1.0e-6,
+                    help="Tolerancia de PageRank (error L1 < n * tol; default: 1e-6)")
+    ap.add_argument("--pagerank-warm-start", action="store_true",
+                    help="Arranca PageRank desde los puntajes de la ejecución anterior con esta opción "
+                         "(los guarda en centralidad_<nombre>.pagerank.npz)")
+
+
+def add_layout_arguments(ap):
+    ap.add_argument("--layout", choices=["auto", "spring", "barnes-hut"], default="auto",
+                    help="Motor de layout (auto: spring hasta 5000 nodos, barnes-hut en grafos mayores)")
+    ap.add_argument("--layout-cache-dir", default=DEFAULT_LAYOUT_CACHE_DIR,
+                    help=f"Carpeta de la caché de posiciones (default: {DEFAULT_LAYOUT_CACHE_DIR}; --no-cache la desactiva)")
+    ap.add_argument("--layout-incremental", action="store_true",
+                    help="Parte del layout anterior guardado en --out y solo reubica los nodos que cambiaron")
+    ap.add_argument("--unified-view", choices=["full", "aggregated"], default="full",
+                    help="Grafo unificado completo, o agregado: las cuentas de una sola persona "
+                         "se agrupan en un nodo por persona y categoría")
+
+
+def add_png_arguments(ap):
+    ap.add_argument("--png-renderer", choices=["auto", "networkx", "fast"], default="auto",
+                    help=f"PNG con nx.draw_networkx_* o con colecciones de matplotlib "
+                         f"(auto: colecciones con más de {FAST_PNG_MIN_EDGES} aristas)")
+    ap.add_argument("--render-workers", type=int, default=None,
+                    help="Procesos para dibujar los PNG (default: igual que --workers)")
+    ap.add_argument("--force-render", action="store_true",
+                    help="Vuelve a dibujar todos los PNG aunque sus entradas no hayan cambiado")
+
+
+def add_html_arguments(ap):
+    ap.add_argument("--interactive", choices=["auto", "plotly", "webgl"], default="auto",
+                    help=f"HTML interactivo: plotly autocontenido o WebGL con datos aparte "
+                         f"(auto: WebGL con más de {WEBGL_MIN_EDGES} aristas)")
+
+
+def centrality_options(args):
+    return dict(k=args.betweenness_k, seed=args.betweenness_seed, workers=args.workers,
+                pagerank_tol=args.pagerank_tol, warm_start=args.pagerank_warm_start,
+                fmt=args.format)
+
+
+def check_format(args):
+    if args.format != "csv" and not columnar_available():
+        raise SystemExit(f"--format {args.format} requiere pyarrow (pip install pyarrow)")
+
+
+def find_groups(args):
     groups = find_triplets_by_person(args.data)
     if not groups:
         raise SystemExit("No se detectaron JSON válidos en --data (nombres *_followers/_following/_topics).")
+    return groups
 
-    # Procesa todas las personas encontradas en los archivos
-    persons = sorted(groups.keys())
-    person_blobs, ego_graphs = [], []
 
-    for person in persons:
-        blob = parse_person_files(groups[person])
-        person_blobs.append(blob)
+# ----------------------------
+# Programa principal
+# ----------------------------
+def main():
+    ap = argparse.ArgumentParser()
+    add_io_arguments(ap)
+    add_format_arguments(ap)
+    add_similarity_arguments(ap)
+    add_centrality_arguments(ap)
+    add_layout_arguments(ap)
+    add_png_arguments(ap)
+    add_html_arguments(ap)
+    ap.add_argument("--incremental", action="store_true",
+                    help="Actualiza el grafo unificado guardado en --out aplicando solo los cambios por persona")
+    ap.add_argument("--graph-format", choices=GRAPH_FORMATS, default="gexf",
+                    help="Exportación del grafo unificado para Gephi: gexf, graphml o edgelist "
+                         "(grafo_unificado.nodes.csv + grafo_unificado.edges.csv)")
+    ap.add_argument("--graph-compress", action="store_true",
+                    help="Comprime la exportación del grafo unificado con gzip (.gz)")
+    args = ap.parse_args()
+    if args.render_workers is None:
+        args.render_workers = args.workers
+    check_format(args)
 
-        Gp = build_ego_graph(blob)
-        ego_graphs.append(Gp)
+    ensure_dir(args.out)
+    centrality_opts = centrality_options(args)
+    layout_cache = None if args.no_cache else LayoutCache(args.layout_cache_dir)
+
+    def layout(G, name):
+        return graph_layout(G, name, args.out, engine=args.layout, cache=layout_cache,
+                            incremental=args.layout_incremental)
+
+    # PNG pendientes: se dibujan juntos al final (render_paralelo)
+    render_jobs = []
 
-        # Ego PNG (sin etiqueta fija de persona para evitar redundancia con el título)
-        draw_graph(Gp,
-                   f"Grafo: {blob['person']}",
-                   os.path.join(args.out, f"grafo_individual_{blob['person']}.png"),
-                   show_labels=False,
-                   label_persons=True)
+    def add_png_job(G, title, out_path, classes=None, positions=None, weights=None):
+        render_jobs.append(png_job(G, title, out_path, args.png_renderer,
+                                   classes=classes, positions=positions, weights=weights))
 
-        export_centrality(Gp, blob['person'], args.out)
+    groups = find_groups(args)
 
-    # Grafo unificado
-    G_merged = compose_graphs(ego_graphs)
-    nx.write_gexf(G_merged, os.path.join(args.out, "grafo_unificado.gexf"))
+    # Procesa todas las personas encontradas en los archivos
+    # (parseo en paralelo con --workers; orden por persona igual que en serie)
+    # Los nombres se internan una vez: de aquí en adelante todo son IDs enteros
+    state = None
+    if args.incremental:
+        # Solo se parsean y aplican las personas nuevas/cambiadas/eliminadas
+        state = UnifiedState.load(state_path(args.out))
+        changed, removed = state.refresh(groups, stream=args.stream,
+                                         cache=cache_from_args(args), workers=args.workers)
+        print(f"Incremental: {len(changed)} persona(s) actualizadas, {len(removed)} eliminadas")
+        for person in removed:
+            for name in (f"grafo_individual_{person}.png", f"centralidad_{person}.csv",
+                         f"centralidad_{person}.parquet", f"centralidad_{person}.arrow",
+                         f"centralidad_{person}.pagerank.npz", f".layout_{person}.npz"):
+                if os.path.exists(os.path.join(args.out, name)):
+                    os.remove(os.path.join(args.out, name))
+        person_blobs = state.person_blobs()
+        ego_persons = set(changed)
+        G_merged = state.unified_graph()
+        if not args.no_snapshot:
+            write_snapshot(snapshot_path(args.out), G_merged, state.files)
+    else:
+        # Snapshot de la ejecución anterior: si los JSON no cambiaron, grafo y
+        # símbolos salen del mmap sin parsear nada
+        person_blobs, G_merged = load_unified(groups, args.out, stream=args.stream,
+                                              cache=cache_from_args(args), workers=args.workers,
+                                              snapshot=not args.no_snapshot)
+        ego_persons = {b["person"] for b in person_blobs}
+
+    for blob in person_blobs:
+        if blob["person"] not in ego_persons:
+            continue  # ego sin cambios: sus salidas siguen vigentes
+        Gp = CSRGraph.from_blobs([blob])
+
+        # Ego PNG (sin etiqueta fija de persona para evitar redundancia con el título);
+        # se dibuja en la etapa de render
+        add_png_job(Gp, f"Grafo: {blob['person']}",
+                    os.path.join(args.out, f"grafo_individual_{blob['person']}.png"),
+                    positions=layout(Gp, blob['person']))
+
+        if args.centrality == "ego":
+            export_centrality(Gp, blob['person'], args.out, **centrality_opts)
+
+    write_graph(G_merged, os.path.join(args.out, "grafo_unificado"), args.graph_format,
+                compress=args.graph_compress)
+
+    # Centralidad del grafo unificado (una vez); en modo "unified" los CSV por
+    # persona son cortes de este resultado
+    export_unified_centrality(G_merged, person_blobs, args.out,
+                              per_person=args.centrality == "unified", **centrality_opts)
+
+    # Grafo que se dibuja: completo o agregado
+    G_view, view_weights, view_name = unified_view(G_merged, args.out, args.unified_view, args.format)
+
+    # Clasificación y posiciones del grafo dibujado, compartidas por ambos renderers
+    merged_classes = G_view.node_classes()
+    merged_positions = layout(G_view, view_name)
 
     # PNG con etiquetas fijas sobre cada ego
-    draw_graph(G_merged,
-               "Grafo Unificado (entidades compartidas)",
-               os.path.join(args.out, "grafo_unificado.png"),
-               show_labels=False,
-               label_persons=True)
-
-    # Interactivo con tooltips y etiquetas fijas de egos
-    draw_interactive_graph(
-        G_merged,
-        "Grafo interactivo (pasa el cursor para ver nombres)",
-        os.path.join(args.out, "grafo_interactivo.html")
-    )
+    add_png_job(G_view, "Grafo Unificado (entidades compartidas)",
+                os.path.join(args.out, "grafo_unificado.png"),
+                classes=merged_classes, positions=merged_positions, weights=view_weights)
 
-    # Similitud y entidades compartidas
-    overlap_counts, shared_rows = compute_person_overlap(person_blobs)
-    simM = compute_similarity_matrix(person_blobs)
-    simM.to_csv(os.path.join(args.out, "matriz_similitud.csv"))
+    export_interactive(G_view, args.out, args.interactive, classes=merged_classes,
+                       positions=merged_positions)
 
-    shared_df = pd.DataFrame(shared_rows)
-    if not shared_df.empty:
-        shared_df = shared_df.sort_values(["type", "entity", "person_a", "person_b"])
-    shared_df.to_csv(os.path.join(args.out, "entidades_compartidas.csv"), index=False)
+    # Similitud y entidades compartidas (en modo incremental, del estado actualizado)
+    overlap_counts = export_similarity(person_blobs, args.out, args.format, args.similarity,
+                                       num_perm=args.minhash_perm, threshold=args.similarity_threshold,
+                                       state=state)
 
     # Meta-grafo de personas ponderado por entidades compartidas
-    H = nx.Graph()
-    for p in [b["person"] for b in person_blobs]:
-        H.add_node(p, type="person")
-    for (a, b), w in overlap_counts.items():
-        H.add_edge(a, b, weight=w)
+    render_jobs.append(person_connections_job([b["person"] for b in person_blobs], overlap_counts, args.out))
 
-    plt.figure(figsize=(6, 5))
-    posH = nx.spring_layout(H, seed=LAYOUT_SEED)
-    weights = [H[u][v]["weight"] for u, v in H.edges()] if H.number_of_edges() else []
-    nx.draw_networkx_nodes(H, posH, node_color="#2f4858", node_size=900)
-    nx.draw_networkx_labels(H, posH, font_size=10, font_color="white")
-    if weights:
-        nx.draw_networkx_edges(H, posH, width=[0.8 + 0.4*w for w in weights], edge_color="#888888")
-        nx.draw_networkx_edge_labels(H, posH, edge_labels={(u, v): H[u][v]["weight"] for u, v in H.edges()}, font_size=9)
-    plt.title("Personas conectadas por entidades compartidas (peso = conteo)")
-    plt.axis("off")
-    plt.tight_layout()
-    plt.savefig(os.path.join(args.out, "conexiones_entre_personas.png"), dpi=140)
-    plt.close()
+    # Render de los PNG en paralelo (omite los que no cambiaron)
+    rendered, skipped = render_pngs(render_jobs, args.out, workers=args.render_workers,
+                                    force=args.force_render)
+    if skipped:
+        print(f"PNG: {len(rendered)} dibujados, {len(skipped)} sin cambios")
+
+    if state is not None:
+        state.save(state_path(args.out))
 
     print("Listo. Revisa la carpeta:", os.path.abspath(args.out))
 
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Grafo dirigido compacto (CSR) para los grafos ego y el grafo unificado.
+
+En lugar de un nx.DiGraph con un dict de atributos por nodo y por arista:
+- node_ids:  ID de símbolo de cada nodo (int64)
+- node_type: KIND_PERSON / KIND_ACCOUNT / KIND_TOPIC (uint8)
+- indptr / indices: adyacencia de salida en formato CSR (int64 / int32)
+- edge_type: EDGE_FOLLOWER / EDGE_FOLLOWING / EDGE_TOPIC (uint8)
+
+Los nodos y aristas siguen el mismo orden que build_ego_graph + compose_all,
+así que to_networkx() reproduce el grafo de NetworkX cuando se necesita.
+"""
+
+import numpy as np
+
+from simbolos import SYMBOLS, SymbolTable, KIND_PERSON, KIND_ACCOUNT, KIND_TOPIC, KIND_NAMES
+
+# Tipos de arista
+EDGE_FOLLOWER, EDGE_FOLLOWING, EDGE_TOPIC = 0, 1, 2
+EDGE_ATTRS = (
+    {"edge_type": "follows", "direction": "inbound"},   # account -> persona
+    {"edge_type": "follows", "direction": "outbound"},  # persona -> account
+    {"edge_type": "has_topic"},                         # persona -> topic
+)
+
+
+class CSRGraph:
+    def __init__(self, node_ids, node_type, indptr, indices, edge_type, symbols=SYMBOLS):
+        self.node_ids = node_ids
+        self.node_type = node_type
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_type = edge_type
+        self.symbols = symbols
+        self._local = None
+
+    # ----------------------------
+    # Construcción
+    # ----------------------------
+    @classmethod
+    def from_blobs(cls, person_blobs, symbols=SYMBOLS):
+        """
+        Construye el grafo directamente desde los blobs internados (ver
+        simbolos.intern_blobs). Con un blob es el grafo ego; con varios, el
+        grafo unificado (sin pasar por compose_all).
+        """
+        local = {}
+        node_ids, node_type = [], []
+        src, dst, etype = [], [], []
+        by_name = symbols.name
+
+        def node(i, kind):
+            j = local.get(i)
+            if j is None:
+                j = local[i] = len(node_ids)
+                node_ids.append(i)
+                node_type.append(kind)
+            return j
+
+        for blob in person_blobs:
+            ego = node(blob["person_id"], KIND_PERSON)
+            for acc in sorted(blob["followers"], key=by_name):
+                src.append(node(acc, KIND_ACCOUNT)); dst.append(ego); etype.append(EDGE_FOLLOWER)
+            for acc in sorted(blob["following"], key=by_name):
+                src.append(ego); dst.append(node(acc, KIND_ACCOUNT)); etype.append(EDGE_FOLLOWING)
+            for t in sorted(blob["topics"], key=by_name):
+                src.append(ego); dst.append(node(t, KIND_TOPIC)); etype.append(EDGE_TOPIC)
+
+        return cls.from_edges(node_ids, node_type, src, dst, etype, symbols)
+
+    @classmethod
+    def from_edges(cls, node_ids, node_type, src, dst, etype, symbols=SYMBOLS):
+        """CSR a partir de listas de aristas (índices locales), conservando su orden por origen"""
+        n = len(node_ids)
+        src = np.asarray(src, dtype=np.int32)
+        order = np.argsort(src, kind="stable")  # agrupa por origen sin cambiar el orden de inserción
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(
+            np.asarray(node_ids, dtype=np.int64),
+            np.asarray(node_type, dtype=np.uint8),
+            indptr,
+            np.asarray(dst, dtype=np.int32)[order],
+            np.asarray(etype, dtype=np.uint8)[order],
+            symbols,
+        )
+
+    # ----------------------------
+    # Consultas básicas
+    # ----------------------------
+    @property
+    def n_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.node_ids, self.node_type, self.indptr, self.indices, self.edge_type))
+
+    def edge_sources(self):
+        return np.repeat(np.arange(self.n_nodes, dtype=np.int32), np.diff(self.indptr))
+
+    def edges(self):
+        """(origen, destino, tipo) como arrays, en el orden de la CSR"""
+        return self.edge_sources(), self.indices, self.edge_type
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        return np.bincount(self.indices, minlength=self.n_nodes)
+
+    def degree(self):
+        return self.out_degree() + self.in_degree()
+
+    def nodes_of_type(self, kind):
+        return np.flatnonzero(self.node_type == kind)
+
+    def label(self, i):
+        return self.symbols.name(int(self.node_ids[i]))
+
+    def type_name(self, i):
+        return KIND_NAMES[self.node_type[i]]
+
+    def node_key(self, i):
+        return self.symbols.node_key(int(self.node_ids[i]))
+
+    def local_index(self):
+        """{ID de símbolo: índice local} (se arma una sola vez)"""
+        if self._local is None:
+            self._local = dict(zip(self.node_ids.tolist(), range(self.n_nodes)))
+        return self._local
+
+    def ego_nodes(self, blob):
+        """
+        Índices locales de los nodos del grafo ego de 'blob' dentro de este
+        grafo, en el mismo orden que CSRGraph.from_blobs([blob]).
+        """
+        local = self.local_index()
+        by_name = self.symbols.name
+        ids = [blob["person_id"]]
+        for cat in ("followers", "following", "topics"):
+            ids.extend(sorted(blob[cat], key=by_name))
+        return np.fromiter((local[i] for i in dict.fromkeys(ids)), dtype=np.int64)
+
+    # ----------------------------
+    # Conversión a NetworkX (solo bajo pedido)
+    # ----------------------------
+    def to_networkx(self, attrs=True, node_keys=False):
+        """
+        - attrs=False: solo estructura, nodos = índices locales (para layouts y
+          algoritmos de NetworkX sin pagar los dicts de atributos)
+        - node_keys=True: nodos con su clave textual ("acc:x", "topic:y", persona)
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        if node_keys:
+            names = [self.node_key(i) for i in range(self.n_nodes)]
+        elif attrs:
+            names = self.node_ids.tolist()
+        else:
+            names = list(range(self.n_nodes))
+
+        if attrs:
+            G.add_nodes_from(
+                (names[i], {"type": self.type_name(i), "label": self.label(i)})
+                for i in range(self.n_nodes)
+            )
+        else:
+            G.add_nodes_from(names)
+
+        src, dst, et = self.edges()
+        if attrs:
+            G.add_edges_from((names[u], names[v], dict(EDGE_ATTRS[t]))
+                             for u, v, t in zip(src.tolist(), dst.tolist(), et.tolist()))
+        else:
+            G.add_edges_from((names[u], names[v]) for u, v in zip(src.tolist(), dst.tolist()))
+        return G
+
+    # ----------------------------
+    # Relación de cada nodo con los nodos persona
+    # ----------------------------
+    def node_classes(self):
+        """Tabla NodeClasses del grafo (una pasada vectorizada sobre las aristas)"""
+        return NodeClasses.from_graph(self)
+
+
+class NodeClasses:
+    """
+    Clasificación de cada nodo respecto de los nodos persona, compartida por
+    los renderers (PNG e interactivo):
+    - follower:  tiene arista nodo -> persona
+    - following: tiene arista persona -> nodo (following / tópico)
+    - mutual:    ambas
+    - n_persons: número de personas distintas enlazadas en cualquier sentido
+    - person_mask: máscara de bits (n_nodos × palabras de 64 bits); el bit b
+      corresponde a la persona persons[b]
+    """
+
+    def __init__(self, persons, follower, following, n_persons, person_mask):
+        self.persons = persons
+        self.follower = follower
+        self.following = following
+        self.mutual = follower & following
+        self.n_persons = n_persons
+        self.person_mask = person_mask
+
+    @classmethod
+    def from_graph(cls, G):
+        n = G.n_nodes
+        src, dst, _ = G.edges()
+        is_person = G.node_type == KIND_PERSON
+        persons = np.flatnonzero(is_person)
+        bit = np.full(n, -1, dtype=np.int64)
+        bit[persons] = np.arange(len(persons))
+
+        p_dst = is_person[dst]
+        p_src = is_person[src]
+        follower = np.zeros(n, dtype=bool)
+        follower[src[p_dst]] = True
+        following = np.zeros(n, dtype=bool)
+        following[dst[p_src]] = True
+
+        # Pares (nodo, persona) únicos, en cualquier sentido
+        nodes = np.concatenate([src[p_dst], dst[p_src]]).astype(np.int64)
+        person_bits = bit[np.concatenate([dst[p_dst], src[p_src]])]
+        pairs = np.unique(nodes * max(len(persons), 1) + person_bits)
+        nodes, person_bits = np.divmod(pairs, max(len(persons), 1))
+
+        n_persons = np.bincount(nodes, minlength=n)
+        person_mask = np.zeros((n, max(1, -(-len(persons) // 64))), dtype=np.uint64)
+        np.bitwise_or.at(person_mask, (nodes, person_bits // 64),
+                         np.left_shift(np.uint64(1), (person_bits % 64).astype(np.uint64)))
+        return cls(persons, follower, following, n_persons, person_mask)
+
+    def linked_persons(self, i):
+        """Índices locales de las personas enlazadas con el nodo i"""
+        words = self.person_mask[i]
+        bits = np.unpackbits(words.astype("<u8").view(np.uint8), bitorder="little")[:len(self.persons)]
+        return self.persons[bits.astype(bool)]
+
+
+# ----------------------------
+# Vista agregada
+# ----------------------------
+AGG_FOLLOWERS, AGG_FOLLOWING, AGG_MUTUAL = 0, 1, 2
+AGG_NAMES = ("seguidores", "seguidos", "mutuos")
+
+
+def coarsen(G, classes=None):
+    """
+    Vista agregada del grafo: las cuentas enlazadas con una sola persona se
+    reemplazan por un supernodo por persona y categoría (solo follower, solo
+    following, mutua); personas, cuentas compartidas y tópicos se conservan.
+    Los supernodos van al final, con una arista por sentido hacia su persona.
+
+    Devuelve (Gc, weight, groups):
+    - Gc: CSRGraph con su propia tabla de símbolos (la etiqueta de un
+      supernodo es "<persona>: <n> <categoría>"; no se agrega nada a SYMBOLS)
+    - weight: cuentas que representa cada nodo de Gc (1 si no es supernodo)
+    - groups: [(persona, categoría, cuentas)] de cada supernodo
+    """
+    if classes is None:
+        classes = G.node_classes()
+    n = G.n_nodes
+    src, dst, etype = G.edges()
+    is_person = G.node_type == KIND_PERSON
+    collapsed = (G.node_type == KIND_ACCOUNT) & (classes.n_persons == 1)
+
+    # Persona de cada cuenta colapsada (la única enlazada) y su categoría
+    owner = np.full(n, -1, dtype=np.int64)
+    owner[src[is_person[dst]]] = dst[is_person[dst]]
+    owner[dst[is_person[src]]] = src[is_person[src]]
+    category = np.where(classes.mutual, AGG_MUTUAL,
+                        np.where(classes.follower, AGG_FOLLOWERS, AGG_FOLLOWING))
+    group_key = owner * 3 + category
+    keys, counts = np.unique(group_key[collapsed], return_counts=True)
+
+    # Nodos conservados (en el orden de G) y luego los supernodos
+    kept = np.flatnonzero(~collapsed)
+    local = np.full(n, -1, dtype=np.int64)
+    local[kept] = np.arange(len(kept))
+    local[collapsed] = len(kept) + np.searchsorted(keys, group_key[collapsed])
+
+    symbols = SymbolTable()
+    node_ids = [symbols.intern(int(G.node_type[i]), G.label(i)) for i in kept.tolist()]
+    node_type = G.node_type[kept].tolist()
+    groups = []
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        person, cat = divmod(key, 3)
+        groups.append((G.label(person), AGG_NAMES[cat], count))
+        node_ids.append(symbols.intern(KIND_ACCOUNT, f"{G.label(person)}: {count} {AGG_NAMES[cat]}"))
+        node_type.append(KIND_ACCOUNT)
+
+    # Aristas: las de nodos conservados tal cual; las de cuentas colapsadas,
+    # una por supernodo y sentido
+    keep_edge = ~(collapsed[src] | collapsed[dst])
+    e_src, e_dst, e_type = [local[src[keep_edge]]], [local[dst[keep_edge]]], [etype[keep_edge]]
+    super_nodes = len(kept) + np.arange(len(keys))
+    persons_of = local[keys // 3]
+    cats = keys % 3
+    inbound = cats != AGG_FOLLOWING    # supernodo -> persona
+    outbound = cats != AGG_FOLLOWERS   # persona -> supernodo
+    e_src += [super_nodes[inbound], persons_of[outbound]]
+    e_dst += [persons_of[inbound], super_nodes[outbound]]
+    e_type += [np.full(inbound.sum(), EDGE_FOLLOWER, dtype=np.uint8),
+               np.full(outbound.sum(), EDGE_FOLLOWING, dtype=np.uint8)]
+
+    Gc = CSRGraph.from_edges(node_ids, node_type, np.concatenate(e_src), np.concatenate(e_dst),
+                             np.concatenate(e_type), symbols)
+    weight = np.ones(Gc.n_nodes, dtype=np.int64)
+    weight[len(kept):] = counts
+    return Gc, weight, groups
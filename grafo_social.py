@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Punto de entrada único con subcomandos, uno por etapa del pipeline:
+
+    ingest       parsea los JSON, escribe el snapshot y la exportación para Gephi
+    similarity   matriz de similitud (o pares aproximados) y entidades compartidas
+    centrality   tablas de centralidad (unificado y por persona)
+    render-png   PNG de cada ego, del grafo unificado y de las conexiones entre personas
+    render-html  grafo interactivo
+    report       análisis de consola y reporte completo (analizar_datos_sociales)
+
+Cada subcomando carga solo las bibliotecas pesadas que usa: los módulos del
+proyecto importan NetworkX, pandas, matplotlib, plotly, SciPy y pyarrow dentro
+de las funciones que los necesitan, así que 'ingest' no carga ninguna y
+'render-html' no carga matplotlib. Las etapas parten del snapshot del grafo
+unificado en --out (lo escribe la primera que parsea los JSON), de modo que
+correrlas por separado no vuelve a parsear nada.
+
+generar_grafos_instagram.py sigue haciendo todas las etapas en una ejecución.
+"""
+
+import argparse
+import os
+
+from generar_grafos_instagram import (
+    add_io_arguments, add_format_arguments, add_similarity_arguments, add_centrality_arguments,
+    add_layout_arguments, add_png_arguments, add_html_arguments, centrality_options,
+    check_format, find_groups, ensure_dir, load_unified, graph_layout, png_job,
+    person_connections_job, unified_view, export_interactive, export_similarity,
+    export_centrality, export_unified_centrality, compute_person_overlap,
+)
+from ingesta import cache_from_args
+
+
+def load(args):
+    """(blobs por persona, grafo unificado) desde el snapshot de --out o desde los JSON"""
+    groups = find_groups(args)
+    ensure_dir(args.out)
+    return load_unified(groups, args.out, stream=args.stream, cache=cache_from_args(args),
+                        workers=args.workers, snapshot=not args.no_snapshot)
+
+
+def layout_function(args):
+    """layout(G, nombre) con la caché y el modo incremental de las opciones"""
+    from layout_grafo import LayoutCache
+
+    cache = None if args.no_cache else LayoutCache(args.layout_cache_dir)
+    return lambda G, name: graph_layout(G, name, args.out, engine=args.layout, cache=cache,
+                                        incremental=args.layout_incremental)
+
+
+# ----------------------------
+# Subcomandos
+# ----------------------------
+def cmd_ingest(args):
+    from exportar_grafo import write_graph
+
+    person_blobs, G = load(args)
+    write_graph(G, os.path.join(args.out, "grafo_unificado"), args.graph_format,
+                compress=args.graph_compress)
+    print(f"Grafo unificado: {len(person_blobs)} persona(s), {G.n_nodes} nodos, {G.n_edges} aristas")
+
+
+def cmd_similarity(args):
+    check_format(args)
+    person_blobs, _ = load(args)
+    export_similarity(person_blobs, args.out, args.format, args.similarity,
+                      num_perm=args.minhash_perm, threshold=args.similarity_threshold)
+
+
+def cmd_centrality(args):
+    check_format(args)
+    person_blobs, G = load(args)
+    opts = centrality_options(args)
+    if args.centrality == "ego":
+        from grafo_csr import CSRGraph
+
+        for blob in person_blobs:
+            export_centrality(CSRGraph.from_blobs([blob]), blob["person"], args.out, **opts)
+    export_unified_centrality(G, person_blobs, args.out, per_person=args.centrality == "unified", **opts)
+
+
+def cmd_render_png(args):
+    from grafo_csr import CSRGraph
+    from render_paralelo import render_pngs
+
+    check_format(args)
+    if args.render_workers is None:
+        args.render_workers = args.workers
+    person_blobs, G = load(args)
+    layout = layout_function(args)
+
+    jobs = []
+    for blob in person_blobs:
+        Gp = CSRGraph.from_blobs([blob])
+        jobs.append(png_job(Gp, f"Grafo: {blob['person']}",
+                            os.path.join(args.out, f"grafo_individual_{blob['person']}.png"),
+                            args.png_renderer, positions=layout(Gp, blob["person"])))
+
+    G_view, weights, name = unified_view(G, args.out, args.unified_view, args.format)
+    jobs.append(png_job(G_view, "Grafo Unificado (entidades compartidas)",
+                        os.path.join(args.out, "grafo_unificado.png"), args.png_renderer,
+                        classes=G_view.node_classes(), positions=layout(G_view, name), weights=weights))
+
+    overlap_counts, _ = compute_person_overlap(person_blobs)
+    jobs.append(person_connections_job([b["person"] for b in person_blobs], overlap_counts, args.out))
+
+    rendered, skipped = render_pngs(jobs, args.out, workers=args.render_workers, force=args.force_render)
+    print(f"PNG: {len(rendered)} dibujados, {len(skipped)} sin cambios")
+
+
+def cmd_render_html(args):
+    check_format(args)
+    _, G = load(args)
+    G_view, _, name = unified_view(G, args.out, args.unified_view, args.format)
+    export_interactive(G_view, args.out, args.interactive, classes=G_view.node_classes(),
+                       positions=layout_function(args)(G_view, name))
+
+
+def cmd_report(args):
+    from analizar_datos_sociales import run_analysis
+
+    run_analysis(args)
+
+
+def build_parser():
+    from analizar_datos_sociales import add_report_arguments
+    from exportar_grafo import GRAPH_FORMATS
+
+    ap = argparse.ArgumentParser(description="Grafo social de Instagram, por etapas")
+    sub = ap.add_subparsers(dest="command", required=True, metavar="subcomando")
+
+    p = sub.add_parser("ingest", help="Parsea los JSON y escribe el snapshot y la exportación para Gephi")
+    add_io_arguments(p)
+    p.add_argument("--graph-format", choices=GRAPH_FORMATS, default="gexf",
+                   help="Exportación del grafo unificado: gexf, graphml o edgelist")
+    p.add_argument("--graph-compress", action="store_true",
+                   help="Comprime la exportación del grafo unificado con gzip (.gz)")
+    p.set_defaults(run=cmd_ingest)
+
+    p = sub.add_parser("similarity", help="Similitud y entidades compartidas entre personas")
+    add_io_arguments(p)
+    add_format_arguments(p)
+    add_similarity_arguments(p)
+    p.set_defaults(run=cmd_similarity)
+
+    p = sub.add_parser("centrality", help="Tablas de centralidad")
+    add_io_arguments(p)
+    add_format_arguments(p)
+    add_centrality_arguments(p)
+    p.set_defaults(run=cmd_centrality)
+
+    p = sub.add_parser("render-png", help="PNG de egos, grafo unificado y conexiones entre personas")
+    add_io_arguments(p)
+    add_format_arguments(p)
+    add_layout_arguments(p)
+    add_png_arguments(p)
+    p.set_defaults(run=cmd_render_png)
+
+    p = sub.add_parser("render-html", help="Grafo interactivo")
+    add_io_arguments(p)
+    add_format_arguments(p)
+    add_layout_arguments(p)
+    add_html_arguments(p)
+    p.set_defaults(run=cmd_render_html)
+
+    p = sub.add_parser("report", help="Análisis de consola y reporte completo")
+    add_report_arguments(p)
+    p.set_defaults(run=cmd_report)
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Índice invertido entidad -> personas.
+
+Se construye una vez a partir de los sets (de IDs) de cada persona y de él
+salen, en una sola pasada por categoría:
+- las entidades compartidas por cada par de personas
+- las entidades que tienen TODAS las personas
+
+El costo es O(total de pertenencias + tamaño de la salida), en lugar de
+intersecar los sets completos de cada par una y otra vez.
+
+Categorías: "followers", "following", "topics" y "entities"
+(followers ∪ following ∪ topics, lo que usan la similitud y el solapamiento).
+"""
+
+from collections import defaultdict
+
+CATEGORIES = ("followers", "following", "topics", "entities")
+
+
+class EntityIndex:
+    def __init__(self, persons, sets_by_category):
+        """
+        persons: nombres de persona en orden (el índice i de cada persona)
+        sets_by_category: {categoría: [set de IDs de la persona i, ...]}
+        """
+        self.persons = list(persons)
+        self.sets = sets_by_category
+        self.postings = {}
+        for cat, sets in sets_by_category.items():
+            post = defaultdict(list)
+            for i, s in enumerate(sets):
+                for e in s:
+                    post[e].append(i)   # listas crecientes por construcción
+            self.postings[cat] = dict(post)
+        self._pairs = {}
+
+    @classmethod
+    def from_blobs(cls, person_blobs):
+        blobs = sorted(person_blobs, key=lambda b: b["person"])
+        sets = {
+            "followers": [b["followers"] for b in blobs],
+            "following": [b["following"] for b in blobs],
+            "topics":    [b["topics"] for b in blobs],
+        }
+        sets["entities"] = [f | g | t for f, g, t in zip(sets["followers"], sets["following"], sets["topics"])]
+        return cls([b["person"] for b in blobs], sets)
+
+    @classmethod
+    def from_person_data(cls, person_data):
+        """Para el dict {persona: {'followers', 'following', 'topics'}} de analizar_datos_sociales"""
+        return cls.from_blobs([dict(data, person=p) for p, data in person_data.items()])
+
+    def pairs(self, category):
+        """{(i, j): [entidades]} con i < j, solo para pares con algo en común"""
+        if category not in self._pairs:
+            out = defaultdict(list)
+            for e, members in self.postings[category].items():
+                k = len(members)
+                if k < 2:
+                    continue
+                for x in range(k):
+                    a = members[x]
+                    for y in range(x + 1, k):
+                        out[(a, members[y])].append(e)
+            self._pairs[category] = dict(out)
+        return self._pairs[category]
+
+    def pair_items(self, category):
+        """
+        [((persona_a, persona_b), entidades)] para TODOS los pares i < j en orden,
+        con lista vacía si no comparten nada.
+        """
+        shared = self.pairs(category)
+        n = len(self.persons)
+        return [((self.persons[i], self.persons[j]), shared.get((i, j), []))
+                for i in range(n) for j in range(i + 1, n)]
+
+    def shared_pairs(self, category):
+        """[((persona_a, persona_b), entidades)] solo de los pares con algo en común, en orden i < j"""
+        shared = self.pairs(category)
+        return [((self.persons[i], self.persons[j]), shared[(i, j)]) for i, j in sorted(shared)]
+
+    def shared_by_all(self, category):
+        n = len(self.persons)
+        return {e for e, members in self.postings[category].items() if len(members) == n}
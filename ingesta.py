@@ -0,0 +1,407 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Capa de ingesta compartida por generar_grafos_instagram.py y analizar_datos_sociales.py.
+
+- Detección de archivos por persona (*_followers / *_following / *_topics)
+- Normalización de usuarios y tópicos
+- Parsers (json.load o lectura por eventos con json_incremental)
+- Caché en disco de los datos ya parseados de cada persona, con huella
+  (ruta, tamaño, mtime, hash de contenido) por archivo y expulsión LRU
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+
+from json_incremental import (
+    FOLLOWERS_PREFIX, FOLLOWING_PREFIX, TOPICS_PREFIX, iter_string_values
+)
+
+# ----------------------------
+# Patrones de nombres de archivo
+# ----------------------------
+FOLLOWERS_PATTERN = re.compile(r"(.+?)_followers\.json$", re.IGNORECASE)
+FOLLOWING_PATTERN = re.compile(r"(.+?)_following\.json$", re.IGNORECASE)
+TOPICS_PATTERN   = re.compile(r"(.+?)_topics\.json$",   re.IGNORECASE)
+
+DEFAULT_CACHE_DIR = "./.cache_ingesta"
+DEFAULT_CACHE_MAX_MB = 512
+
+
+# ----------------------------
+# Utilidades generales
+# ----------------------------
+def normalize_username(s: str) -> str:
+    if s is None: return ""
+    s = s.strip().lower()
+    if s.startswith("@"):
+        s = s[1:]
+    return s
+
+def normalize_topic(s: str) -> str:
+    if s is None: return ""
+    return s.strip().lower()
+
+def load_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def find_triplets_by_person(data_dir):
+    """persona -> lista de rutas JSON"""
+    files = glob(os.path.join(data_dir, "*.json"))
+    buckets = defaultdict(list)
+    for p in files:
+        base = os.path.basename(p)
+        m = FOLLOWERS_PATTERN.search(base) or FOLLOWING_PATTERN.search(base) or TOPICS_PATTERN.search(base)
+        if m:
+            buckets[m.group(1)].append(p)
+    return dict(buckets)
+
+def find_person_files(data_dir):
+    """persona -> {'followers'|'following'|'topics': ruta}"""
+    files = glob(os.path.join(data_dir, "*.json"))
+    buckets = defaultdict(dict)
+    for p in files:
+        base = os.path.basename(p)
+        for kind, pat in (("followers", FOLLOWERS_PATTERN),
+                          ("following", FOLLOWING_PATTERN),
+                          ("topics", TOPICS_PATTERN)):
+            m = pat.search(base)
+            if m:
+                buckets[m.group(1)][kind] = p
+                break
+    return dict(buckets)
+
+
+# ----------------------------
+# Parsers EXACTOS al formato indicado
+# ----------------------------
+def parse_followers(path: str, stream: bool = False) -> set:
+    """
+    followers: lista raíz; cada item con "string_list_data": [{ "value": "<usuario>" }, ...]
+    - stream: si True, lee el archivo por eventos (memoria constante)
+    """
+    if stream:
+        return {u for u in map(normalize_username, iter_string_values(path, FOLLOWERS_PREFIX)) if u}
+    data = load_json(path)
+    out = set()
+    if isinstance(data, list):
+        for item in data:
+            sld = item.get("string_list_data") or []
+            if isinstance(sld, list):
+                for e in sld:
+                    val = e.get("value")
+                    if val:
+                        out.add(normalize_username(val))
+    return {u for u in out if u}
+
+def parse_following(path: str, stream: bool = False) -> set:
+    """
+    following: objeto con "relationships_following": [ {"title": "<usuario>"}, ... ]
+    - stream: si True, lee el archivo por eventos (memoria constante)
+    """
+    if stream:
+        return {u for u in map(normalize_username, iter_string_values(path, FOLLOWING_PREFIX)) if u}
+    data = load_json(path)
+    out = set()
+    rel = data.get("relationships_following") or []
+    if isinstance(rel, list):
+        for item in rel:
+            title = item.get("title")
+            if title:
+                out.add(normalize_username(title))
+    return {u for u in out if u}
+
+def parse_topics(path: str, stream: bool = False) -> set:
+    """
+    topics: objeto con "topics_your_topics": [
+      {"string_map_data": {"Name": {"value": "<topic>"}}}, ...
+    ]
+    - stream: si True, lee el archivo por eventos (memoria constante)
+    """
+    if stream:
+        return {t for t in map(normalize_topic, iter_string_values(path, TOPICS_PREFIX)) if t}
+    data = load_json(path)
+    out = set()
+    arr = data.get("topics_your_topics") or []
+    if isinstance(arr, list):
+        for item in arr:
+            smd = item.get("string_map_data") or {}
+            name = (smd.get("Name") or {}).get("value")
+            if name:
+                out.add(normalize_topic(name))
+    return {t for t in out if t}
+
+def parse_person_files(filepaths, stream=False):
+    """
+    Devuelve dict con:
+      - person: nombre base del archivo (prefijo)
+      - followers, following, topics: sets
+    """
+    person_name = None
+    for p in filepaths:
+        base = os.path.basename(p)
+        for pat in (FOLLOWERS_PATTERN, FOLLOWING_PATTERN, TOPICS_PATTERN):
+            m = pat.search(base)
+            if m:
+                person_name = m.group(1)
+                break
+        if person_name:
+            break
+    if not person_name:
+        person_name = os.path.basename(os.path.dirname(filepaths[0]))
+
+    followers, following, topics = set(), set(), set()
+    for p in filepaths:
+        base = os.path.basename(p)
+        if FOLLOWERS_PATTERN.search(base):
+            followers |= parse_followers(p, stream=stream)
+        elif FOLLOWING_PATTERN.search(base):
+            following |= parse_following(p, stream=stream)
+        elif TOPICS_PATTERN.search(base):
+            topics |= parse_topics(p, stream=stream)
+
+    return {
+        "person": person_name,
+        "followers": followers,
+        "following": following,
+        "topics": topics
+    }
+
+
+# ----------------------------
+# Caché de datos parseados
+# ----------------------------
+def file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def file_fingerprint(path):
+    """(tamaño, mtime_ns, sha1) de un archivo"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns, file_sha1(path)
+
+def fingerprints_fresh(files):
+    """
+    Comprueba {ruta: (tamaño, mtime_ns, sha1)} contra el disco.
+    - tamaño y mtime iguales -> sin cambios, sin releer el archivo
+    - solo cambió mtime y el sha1 coincide -> sin cambios (se actualiza mtime en 'files')
+    Devuelve (sin_cambios, se_actualizó_algún_mtime).
+    """
+    changed = False
+    for path, (size, mtime_ns, sha1) in files.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False, False
+        if st.st_size != size:
+            return False, False
+        if st.st_mtime_ns != mtime_ns:
+            if file_sha1(path) != sha1:
+                return False, False
+            files[path] = (size, st.st_mtime_ns, sha1)
+            changed = True
+    return True, changed
+
+
+class ParseCache:
+    """
+    Caché en disco (pickle binario) de los sets parseados de cada persona.
+
+    Cada entrada se identifica por el conjunto de rutas de la persona y guarda
+    la huella de cada archivo. Al leer:
+    - tamaño y mtime iguales -> válida sin releer el archivo
+    - mtime distinto pero mismo tamaño y mismo sha1 -> válida (se actualiza mtime)
+    - cualquier otro caso -> obsoleta, se descarta
+    El total en disco se limita a max_bytes expulsando las entradas menos usadas.
+    """
+
+    INDEX_NAME = "index.pkl"
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_MB * 2**20):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    # -- índice --
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_NAME)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return {}
+
+    def _save_index(self):
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self.index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._index_path())
+
+    @staticmethod
+    def key_for(filepaths):
+        joined = "\n".join(sorted(os.path.abspath(p) for p in filepaths))
+        return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _is_fresh(self, entry):
+        return fingerprints_fresh(entry["files"])
+
+    def _drop(self, key):
+        self.index.pop(key, None)
+        try:
+            os.remove(self._blob_path(key))
+        except OSError:
+            pass
+
+    # -- API --
+    def get(self, filepaths):
+        key = self.key_for(filepaths)
+        entry = self.index.get(key)
+        if entry is None or set(entry["files"]) != {os.path.abspath(p) for p in filepaths}:
+            self.misses += 1
+            return None
+        fresh, changed = self._is_fresh(entry)
+        if not fresh:
+            self._drop(key)
+            self._dirty = True
+            self.misses += 1
+            return None
+        try:
+            with open(self._blob_path(key), "rb") as f:
+                blob = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self._drop(key)
+            self._dirty = True
+            self.misses += 1
+            return None
+        entry["atime"] = time.time()
+        self._dirty = True
+        self.hits += 1
+        return blob
+
+    def put(self, filepaths, blob, fingerprints=None):
+        """fingerprints: huellas tomadas ANTES de parsear (evita carreras)"""
+        key = self.key_for(filepaths)
+        if fingerprints is None:
+            fingerprints = {os.path.abspath(p): file_fingerprint(p) for p in filepaths}
+        tmp = self._blob_path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(blob, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._blob_path(key))
+        self.index[key] = {
+            "files": fingerprints,
+            "size": os.path.getsize(self._blob_path(key)),
+            "atime": time.time(),
+        }
+        self._dirty = True  # el índice se escribe una vez, en flush()
+
+    def flush(self, force=False):
+        """Escribe el índice (accesos LRU) si hubo cambios"""
+        if self._dirty or force:
+            self._evict()
+            self._save_index()
+            self._dirty = False
+
+    def _evict(self):
+        total = sum(e["size"] for e in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]["atime"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.index[key]["size"]
+            self._drop(key)
+
+
+def load_person(filepaths, stream=False, cache=None, fingerprints=None):
+    """
+    parse_person_files con caché opcional (el índice de la caché queda
+    pendiente: lo escribe cache.flush()). fingerprints: huellas ya tomadas.
+    """
+    if cache is None:
+        return parse_person_files(filepaths, stream=stream)
+    blob = cache.get(filepaths)
+    if blob is not None:
+        return blob
+    fingerprints, blob = _fingerprint_and_parse((filepaths, stream, fingerprints))
+    cache.put(filepaths, blob, fingerprints)
+    return blob
+
+def _fingerprint_and_parse(task):
+    """Tarea de un proceso del pool: huellas (antes de parsear, si no vienen dadas) + blob"""
+    filepaths, stream, fingerprints = task
+    if fingerprints is None:
+        fingerprints = {os.path.abspath(p): file_fingerprint(p) for p in filepaths}
+    return fingerprints, parse_person_files(filepaths, stream=stream)
+
+def load_groups(groups, stream=False, cache=None, workers=1, fingerprints=None):
+    """
+    Parsea los grupos {persona: rutas} y devuelve los blobs ordenados por persona.
+    - workers > 1: los grupos que no están en caché se parsean en un pool de
+      procesos; la caché solo se lee/escribe desde el proceso principal y el
+      orden del resultado es el mismo que en serie.
+    - fingerprints: {persona: huellas} ya tomadas por el llamador (p.ej. el
+      estado incremental), para no volver a calcular el sha1 de cada archivo.
+    El índice de la caché se escribe una sola vez, al final.
+    """
+    persons = sorted(groups)
+    fingerprints = fingerprints or {}
+    if workers <= 1:
+        blobs = [load_person(groups[p], stream=stream, cache=cache, fingerprints=fingerprints.get(p))
+                 for p in persons]
+    else:
+        blobs = [cache.get(groups[p]) if cache is not None else None for p in persons]
+        pending = [i for i, b in enumerate(blobs) if b is None]
+        if pending:
+            tasks = [(groups[persons[i]], stream, fingerprints.get(persons[i])) for i in pending]
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as ex:
+                results = ex.map(_fingerprint_and_parse, tasks, chunksize=max(1, len(tasks) // (4 * workers)))
+                for i, (fingerprints, blob) in zip(pending, results):
+                    blobs[i] = blob
+                    if cache is not None:
+                        cache.put(groups[persons[i]], blob, fingerprints)
+    if cache is not None:
+        cache.flush()
+    return blobs
+
+def load_person_blobs(data_dir, stream=False, cache=None, workers=1):
+    """Lista de blobs (uno por persona) ordenada por nombre de persona"""
+    return load_groups(find_triplets_by_person(data_dir), stream=stream, cache=cache, workers=workers)
+
+
+# ----------------------------
+# Opciones de línea de comandos comunes
+# ----------------------------
+def add_ingest_arguments(ap):
+    ap.add_argument("--stream", action="store_true",
+                    help="Lee los JSON por eventos, sin cargarlos completos en memoria")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                    help=f"Carpeta de la caché de datos parseados (default: {DEFAULT_CACHE_DIR})")
+    ap.add_argument("--cache-max-mb", type=int, default=DEFAULT_CACHE_MAX_MB,
+                    help=f"Tamaño máximo de la caché en MB (default: {DEFAULT_CACHE_MAX_MB})")
+    ap.add_argument("--no-cache", action="store_true", help="Desactiva la caché de datos parseados")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Procesos para parsear personas en paralelo (default: 1)")
+
+def cache_from_args(args):
+    if args.no_cache:
+        return None
+    return ParseCache(args.cache_dir, max_bytes=args.cache_max_mb * 2**20)
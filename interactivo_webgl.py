@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Grafo interactivo para grafos grandes (WebGL).
+
+En lugar de un HTML autocontenido con un go.Scatter de aristas armado como
+listas [x0, x1, None] por arista, se escriben:
+- <base>.html: página mínima (carga plotly.min.js desde la misma carpeta)
+- <base>.bin:  columnas binarias (little-endian, alineadas a 8 bytes):
+               x, y (float32), degree (uint32), kind, color (uint8),
+               src, dst (uint32, extremos de cada arista),
+               order (uint32, nodos no persona por grado decreciente)
+- <base>.json: descripción de las columnas, paleta, etiquetas, leyenda y
+               presupuesto de nodos
+- plotly-<versión>.min.js: copia local de plotly.js (una por carpeta; se
+               reemplaza al cambiar la versión instalada de plotly)
+
+La página dibuja nodos y aristas con trazos scattergl (GPU) y arma los
+arreglos de coordenadas en el navegador. Nivel de detalle por vista: se
+muestran siempre las personas y, de los nodos que caen en la vista actual,
+los 'budget' de mayor grado; al acercar o desplazar se recalcula sobre la
+nueva vista. Como toda arista toca a una persona, una arista se ve si su otro
+extremo está entre los nodos mostrados.
+
+El navegador no deja leer archivos locales con fetch desde file://, así que
+la página debe abrirse servida por HTTP, p.ej.:
+    python -m http.server -d out
+"""
+
+import glob
+import html
+import json
+import os
+
+import numpy as np
+
+from simbolos import KIND_PERSON
+
+PERSON_COLOR = "#2f4858"
+EDGE_COLOR = "#cfcfcf"
+NODE_BUDGET = 20000
+PLOTLY_JS_PATTERN = "plotly*.min.js"
+
+
+def plotly_js_name():
+    """Nombre de la copia local de plotly.js, con la versión instalada"""
+    import plotly
+    return f"plotly-{plotly.__version__}.min.js"
+
+
+def degree_order(degree, kind):
+    """Nodos no persona ordenados por grado decreciente (estable), para elegir los de una vista"""
+    others = np.flatnonzero(kind != KIND_PERSON)
+    return others[np.argsort(-degree[others].astype(np.int64), kind="stable")].astype(np.uint32)
+
+
+def _write_columns(path, columns):
+    """Escribe las columnas seguidas (alineadas a 8 bytes) y devuelve su descripción"""
+    meta = {}
+    offset = 0
+    with open(path, "wb") as f:
+        for name, arr in columns.items():
+            arr = np.ascontiguousarray(arr)
+            pad = -offset % 8
+            f.write(b"\0" * pad)
+            offset += pad
+            f.write(arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes())
+            meta[name] = {"dtype": arr.dtype.name, "offset": offset, "length": int(arr.size)}
+            offset += arr.nbytes
+    return meta
+
+
+def _ensure_plotly_js(out_dir):
+    """Copia plotly.js de la versión instalada (quitando las de otras versiones); devuelve su nombre"""
+    name = plotly_js_name()
+    path = os.path.join(out_dir, name)
+    for old in glob.glob(os.path.join(out_dir, PLOTLY_JS_PATTERN)):
+        if os.path.basename(old) != name:
+            os.remove(old)
+    if not os.path.exists(path):
+        from plotly.offline import get_plotlyjs
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+        os.replace(path + ".tmp", path)
+    return name
+
+
+def remove_webgl_files(out_html):
+    """Quita los archivos de datos y plotly.js de una salida WebGL anterior (al volver al HTML autocontenido)"""
+    base = os.path.splitext(out_html)[0]
+    out_dir = os.path.dirname(os.path.abspath(out_html))
+    for path in [base + ".bin", base + ".json"] + glob.glob(os.path.join(out_dir, PLOTLY_JS_PATTERN)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def write_webgl_graph(G, title, out_html, positions, colors, legend_items, budget=NODE_BUDGET):
+    """
+    Escribe la página y sus archivos de datos.
+    - positions: array n × 2 (layout_grafo)
+    - colors: color por nodo (None en personas), como node_colors
+    - legend_items: [(nombre, color, símbolo)]
+    Devuelve las rutas escritas.
+    """
+    out_dir = os.path.dirname(os.path.abspath(out_html))
+    base = os.path.splitext(out_html)[0]
+    name = os.path.basename(base)
+
+    kind = G.node_type.astype(np.uint8)
+    degree = G.degree().astype(np.uint32)
+    palette = sorted({c for c in colors if c is not None} | {PERSON_COLOR})
+    color_idx = {c: i for i, c in enumerate(palette)}
+    color = np.fromiter((color_idx[c or PERSON_COLOR] for c in colors), dtype=np.uint8, count=G.n_nodes)
+    src, dst, _ = G.edges()
+
+    columns = _write_columns(base + ".bin", {
+        "x": positions[:, 0].astype(np.float32),
+        "y": positions[:, 1].astype(np.float32),
+        "degree": degree,
+        "kind": kind,
+        "color": color,
+        "src": src.astype(np.uint32),
+        "dst": dst.astype(np.uint32),
+        "order": degree_order(degree, kind),
+    })
+    meta = {
+        "title": title,
+        "columns": columns,
+        "palette": palette,
+        "labels": [G.label(i) for i in range(G.n_nodes)],
+        "legend": [list(item) for item in legend_items],
+        "budget": int(budget),
+        "edge_color": EDGE_COLOR,
+    }
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, separators=(",", ":"))
+
+    plotly_js = _ensure_plotly_js(out_dir)
+    with open(out_html, "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.replace("__TITLE__", html.escape(title))
+                .replace('"__BASE__"', json.dumps(name).replace("</", "<\\/"))
+                .replace("__PLOTLY__", html.escape(plotly_js)))
+    return [out_html, base + ".bin", base + ".json"]
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<script src="__PLOTLY__"></script>
+<style>
+  html, body { margin: 0; height: 100%; font-family: sans-serif; }
+  #grafo { width: 100%; height: 100%; }
+  #estado { position: absolute; left: 12px; bottom: 8px; font-size: 12px; color: #555; }
+</style>
+</head>
+<body>
+<div id="grafo"></div>
+<div id="estado">Cargando datos…</div>
+<script>
+(async function () {
+  const BASE = "__BASE__";
+  const estado = document.getElementById("estado");
+  let meta, buf;
+  try {
+    meta = await (await fetch(BASE + ".json")).json();
+    buf = await (await fetch(BASE + ".bin")).arrayBuffer();
+  } catch (e) {
+    estado.textContent = "No se pudieron cargar " + BASE + ".json/.bin. " +
+      "Abre la página servida por HTTP, p.ej.: python -m http.server -d <carpeta>";
+    return;
+  }
+  const TYPES = { float32: Float32Array, uint32: Uint32Array, uint8: Uint8Array };
+  const col = {};
+  for (const [name, c] of Object.entries(meta.columns)) {
+    col[name] = new TYPES[c.dtype](buf, c.offset, c.length);
+  }
+  const n = col.x.length, m = col.src.length;
+  const SYMBOL = ["square", "circle", "triangle-up"];
+  const SIZE = [16, 8, 7];
+  const SUFFIX = [" (persona)", " (cuenta)", " (tópico)"];
+
+  // view: {x0, x1, y0, y1} o null (todo el grafo). Personas siempre; del resto,
+  // los meta.budget de mayor grado que caen en la vista (col.order: grado decreciente)
+  function build(view) {
+    const visible = new Uint8Array(n);
+    const idx = [];
+    for (let i = 0; i < n; i++) if (col.kind[i] === 0) { visible[i] = 1; idx.push(i); }
+    let picked = 0, hidden = 0, minDegree = 0;
+    for (let r = 0; r < col.order.length; r++) {
+      const i = col.order[r];
+      if (view && (col.x[i] < view.x0 || col.x[i] > view.x1 || col.y[i] < view.y0 || col.y[i] > view.y1)) continue;
+      if (picked >= meta.budget) { hidden++; continue; }
+      visible[i] = 1; idx.push(i); picked++; minDegree = col.degree[i];
+    }
+    const nodes = {
+      x: new Float32Array(idx.length), y: new Float32Array(idx.length),
+      color: new Array(idx.length), symbol: new Array(idx.length),
+      size: new Array(idx.length), text: new Array(idx.length),
+    };
+    idx.forEach((i, j) => {
+      const k = col.kind[i];
+      nodes.x[j] = col.x[i]; nodes.y[j] = col.y[i];
+      nodes.color[j] = meta.palette[col.color[i]];
+      nodes.symbol[j] = SYMBOL[k]; nodes.size[j] = SIZE[k];
+      nodes.text[j] = meta.labels[i] + SUFFIX[k];
+    });
+    let count = 0;
+    for (let e = 0; e < m; e++) if (visible[col.src[e]] && visible[col.dst[e]]) count++;
+    const ex = new Float32Array(3 * count), ey = new Float32Array(3 * count);
+    let j = 0;
+    for (let e = 0; e < m; e++) {
+      const u = col.src[e], v = col.dst[e];
+      if (!(visible[u] && visible[v])) continue;
+      ex[j] = col.x[u]; ey[j] = col.y[u];
+      ex[j + 1] = col.x[v]; ey[j + 1] = col.y[v];
+      ex[j + 2] = NaN; ey[j + 2] = NaN;   // corte entre aristas
+      j += 3;
+    }
+    return { nodes, ex, ey, shown: idx.length, edges: count, hidden, minDegree };
+  }
+
+  let data = build(null);
+  const persons = [];
+  for (let i = 0; i < n; i++) if (col.kind[i] === 0) persons.push(i);
+
+  const traces = [
+    { type: "scattergl", mode: "lines", x: data.ex, y: data.ey, hoverinfo: "none",
+      line: { width: 0.5, color: meta.edge_color }, showlegend: false },
+    { type: "scattergl", mode: "markers", x: data.nodes.x, y: data.nodes.y, text: data.nodes.text,
+      marker: { size: data.nodes.size, color: data.nodes.color, symbol: data.nodes.symbol, line: { width: 0 } },
+      hovertemplate: "%{text}<extra></extra>", showlegend: false },
+    { type: "scatter", mode: "text", x: persons.map(i => col.x[i]), y: persons.map(i => col.y[i]),
+      text: persons.map(i => meta.labels[i]), textposition: "top center",
+      textfont: { size: 12, color: "#111" }, hoverinfo: "skip", showlegend: false },
+  ];
+  for (const [name, color, symbol] of meta.legend) {
+    traces.push({ type: "scatter", mode: "markers", x: [null], y: [null], name: name,
+      marker: { size: 10, color: color, symbol: symbol }, hoverinfo: "skip", showlegend: true });
+  }
+  const layout = {
+    title: meta.title, hovermode: "closest", margin: { l: 10, r: 10, t: 50, b: 10 },
+    paper_bgcolor: "white", plot_bgcolor: "white",
+    xaxis: { showgrid: false, zeroline: false }, yaxis: { showgrid: false, zeroline: false },
+    legend: { x: 0.99, y: 0.99, xanchor: "right", yanchor: "top",
+              bgcolor: "rgba(255,255,255,0.8)", font: { size: 10 } },
+  };
+  const div = document.getElementById("grafo");
+  function report() {
+    estado.textContent = data.shown + " de " + n + " nodos, " + data.edges + " de " + m + " aristas" +
+      (data.hidden ? " (en la vista, grado ≥ " + data.minDegree + "; acerca para ver más)" : "");
+  }
+  await Plotly.newPlot(div, traces, layout, { responsive: true });
+  report();
+
+  // Nivel de detalle: se recalcula sobre la vista al acercar o desplazar
+  // (con un margen del 10% para que los bordes no queden vacíos)
+  div.on("plotly_relayout", () => {
+    const xr = div._fullLayout.xaxis.range, yr = div._fullLayout.yaxis.range;
+    const mx = 0.1 * Math.abs(xr[1] - xr[0]), my = 0.1 * Math.abs(yr[1] - yr[0]);
+    data = build({ x0: Math.min(xr[0], xr[1]) - mx, x1: Math.max(xr[0], xr[1]) + mx,
+                   y0: Math.min(yr[0], yr[1]) - my, y1: Math.max(yr[0], yr[1]) + my });
+    Plotly.restyle(div, {
+      x: [data.ex, data.nodes.x], y: [data.ey, data.nodes.y], text: [null, data.nodes.text],
+      "marker.size": [null, data.nodes.size], "marker.color": [null, data.nodes.color],
+      "marker.symbol": [null, data.nodes.symbol],
+    }, [0, 1]);
+    report();
+  });
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Lectura incremental (por eventos) de los JSON exportados de Instagram.
+
+En lugar de cargar todo el archivo con json.load, se recorre el texto por
+bloques y se emiten eventos (prefijo, evento, valor) al estilo de ijson:
+
+    ("", "start_map", None)
+    ("", "map_key", "relationships_following")
+    ("relationships_following", "start_array", None)
+    ("relationships_following.item", "start_map", None)
+    ("relationships_following.item", "map_key", "title")
+    ("relationships_following.item.title", "string", "usuario")
+    ...
+
+La memoria usada depende del tamaño del bloque y de la profundidad del JSON,
+no del tamaño del archivo. Si ijson está instalado se usa su backend en C.
+"""
+
+import json
+import re
+from json.decoder import scanstring
+
+try:
+    import ijson
+except ImportError:  # dependencia opcional
+    ijson = None
+
+# Prefijos de los campos que leen los parsers
+FOLLOWERS_PREFIX = "item.string_list_data.item.value"
+FOLLOWING_PREFIX = "relationships_following.item.title"
+TOPICS_PREFIX    = "topics_your_topics.item.string_map_data.Name.value"
+
+CHUNK_SIZE = 64 * 1024
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+
+
+class _Buffer:
+    """Ventana deslizante sobre el archivo: solo guarda lo que falta por leer."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Salta espacios y devuelve el siguiente carácter ('' al final)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def read_string(self):
+        while True:
+            try:
+                s, end = scanstring(self.buf, self.pos + 1)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            self.pos = end
+            return s
+
+    def read_number(self):
+        # Se toma el tramo completo de caracteres numéricos antes de validarlo,
+        # para no cortar un número que continúa en el siguiente bloque.
+        m = _NUMBER_CHARS.match(self.buf, self.pos)
+        while m.end() == len(self.buf) and self.fill():
+            m = _NUMBER_CHARS.match(self.buf, self.pos)
+        txt = m.group(0)
+        if not _NUMBER.fullmatch(txt):
+            raise ValueError(f"Número JSON inválido en posición {self.pos}")
+        self.pos = m.end()
+        if "." in txt or "e" in txt or "E" in txt:
+            return float(txt)
+        return int(txt)
+
+    def read_literal(self, c):
+        word, value = _LITERALS[c]
+        while len(self.buf) - self.pos < len(word) and self.fill():
+            pass
+        if self.buf[self.pos:self.pos + len(word)] != word:
+            raise ValueError(f"Literal JSON inválido en posición {self.pos}")
+        self.pos += len(word)
+        return value
+
+
+def _parse_events_py(f, chunk_size=CHUNK_SIZE):
+    """Tokenizador en Python puro (sin dependencias)."""
+    b = _Buffer(f, chunk_size)
+    path = []    # componentes del prefijo actual
+    stack = []   # 'map' | 'array'
+    state = "value"  # value | key | after
+
+    while True:
+        c = b.peek()
+        if c == "":
+            if stack or state != "after":
+                raise ValueError("JSON incompleto")
+            return
+
+        if state == "after":
+            if not stack:
+                raise ValueError(f"Datos extra después del JSON en posición {b.pos}")
+            b.pos += 1
+            if c == ",":
+                state = "key" if stack[-1] == "map" else "value"
+            elif c == "}" and stack[-1] == "map":
+                stack.pop(); path.pop()
+                yield ".".join(path), "end_map", None
+            elif c == "]" and stack[-1] == "array":
+                stack.pop(); path.pop()
+                yield ".".join(path), "end_array", None
+            else:
+                raise ValueError(f"Carácter inesperado {c!r} en posición {b.pos - 1}")
+            continue
+
+        if state == "key":
+            if c == "}" and path[-1] is None:  # objeto vacío
+                b.pos += 1
+                stack.pop(); path.pop()
+                yield ".".join(path), "end_map", None
+                state = "after"
+                continue
+            if c != '"':
+                raise ValueError(f"Se esperaba una clave en posición {b.pos}")
+            key = b.read_string()
+            if b.peek() != ":":
+                raise ValueError(f"Se esperaba ':' en posición {b.pos}")
+            b.pos += 1
+            path[-1] = key
+            yield ".".join(path[:-1]), "map_key", key
+            state = "value"
+            continue
+
+        # state == "value"
+        prefix = ".".join(path)
+        if c == "{":
+            b.pos += 1
+            yield prefix, "start_map", None
+            stack.append("map"); path.append(None)
+            state = "key"
+            continue
+        if c == "[":
+            b.pos += 1
+            yield prefix, "start_array", None
+            if b.peek() == "]":  # arreglo vacío
+                b.pos += 1
+                yield prefix, "end_array", None
+                state = "after"
+                continue
+            stack.append("array"); path.append("item")
+            continue
+        if c == '"':
+            yield prefix, "string", b.read_string()
+        elif c in _LITERALS:
+            value = b.read_literal(c)
+            yield prefix, ("null" if value is None else "boolean"), value
+        else:
+            yield prefix, "number", b.read_number()
+        state = "after"
+
+
+def parse_events(f, chunk_size=CHUNK_SIZE):
+    """
+    Genera eventos (prefijo, evento, valor) a partir de un archivo abierto.
+    - f en modo binario y con ijson instalado: backend de ijson
+    - en otro caso: tokenizador propio (texto)
+    """
+    if ijson is not None and isinstance(f.read(0), bytes):
+        return ijson.parse(f, buf_size=chunk_size)
+    return _parse_events_py(f, chunk_size)
+
+
+def iter_string_values(path, prefix, chunk_size=CHUNK_SIZE):
+    """Recorre el archivo y devuelve los strings que aparecen en 'prefix'."""
+    if ijson is not None:
+        f = open(path, "rb")
+    else:
+        f = open(path, "r", encoding="utf-8")
+    with f:
+        for pfx, event, value in parse_events(f, chunk_size):
+            if event == "string" and pfx == prefix:
+                yield value
@@ -0,0 +1,437 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Posiciones de los nodos para los renderers (PNG e interactivo).
+
+Dos motores, ambos con las personas ancladas en círculo (nodos fijos):
+- "spring": nx.spring_layout, el de siempre. Se usa en grafos chicos
+  (hasta SPRING_MAX_NODES nodos), así los dibujos no cambian.
+- "barnes-hut": Fruchterman–Reingold vectorizado con NumPy. La repulsión se
+  aproxima con un quadtree: en cada nivel, cada celda ocupada interactúa con
+  las celdas no adyacentes hijas de los vecinos de su padre (su centro de
+  masa), y en el nivel más fino con las 9 celdas vecinas. El costo por
+  iteración es O(N · profundidad) en lugar de O(N²).
+
+Las posiciones se guardan en disco (LayoutCache) con una clave que depende
+del grafo (nodos, tipos y aristas), del motor, la semilla y los parámetros,
+así ambos renderers y las ejecuciones siguientes las reutilizan.
+
+Modo incremental (incremental_layout): se parte de la foto anterior del
+layout (posición y firma de vecinos de cada nodo, por nombre). Los nodos
+conocidos con los mismos vecinos quedan fijos; los nuevos arrancan junto a
+sus personas y solo ellos, los que cambiaron de vecinos y sus vecinos se
+relajan unas pocas iteraciones.
+"""
+
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from simbolos import KIND_PERSON
+
+SPRING_MAX_NODES = 5000
+DEFAULT_LAYOUT_CACHE_DIR = "./.cache_layout"
+MAX_DEPTH = 10          # 4^10 celdas en el nivel más fino
+MIN_DISTANCE = 0.01     # distancia mínima en las fuerzas (como NetworkX)
+INCREMENTAL_ITERATIONS = 30
+_SIG_OUT, _SIG_IN = np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+# ----------------------------
+# Posicionamiento anclado de personas
+# ----------------------------
+def anchored_person_positions(persons, radius=3.2):
+    """
+    Devuelve posiciones ancla en círculo para los nodos persona.
+    - 1 persona: centro (0,0)
+    - 2+ personas: ubicadas en círculo de radio 'radius'
+    """
+    pos = {}
+    n = len(persons)
+    if n == 1:
+        pos[persons[0]] = (0.0, 0.0)
+        return pos
+    for i, p in enumerate(sorted(persons)):
+        theta = 2.0 * math.pi * i / n
+        pos[p] = (radius * math.cos(theta), radius * math.sin(theta))
+    return pos
+
+
+# ----------------------------
+# Clave y caché en disco
+# ----------------------------
+def graph_hash(G, **params):
+    """sha1 de la estructura del grafo (por nombre de nodo) y de los parámetros"""
+    h = hashlib.sha1()
+    h.update("\0".join(G.node_key(i) for i in range(G.n_nodes)).encode("utf-8"))
+    for arr in (G.node_type, G.indptr, G.indices, G.edge_type):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    h.update(repr(sorted(params.items())).encode("utf-8"))
+    return h.hexdigest()
+
+
+class LayoutCache:
+    """Posiciones (array n × 2) por clave, un .npy por entrada; conserva las max_entries más recientes"""
+
+    def __init__(self, cache_dir=DEFAULT_LAYOUT_CACHE_DIR, max_entries=64):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            pos = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # marca de uso reciente para la expulsión
+        return pos
+
+    def put(self, key, pos):
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, pos)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".npy")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime_ns)
+        for e in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+
+# ----------------------------
+# Motor spring (NetworkX)
+# ----------------------------
+def spring_positions(G, anchors, k, iterations, seed):
+    import networkx as nx
+
+    persons = list(anchors)
+    pos = nx.spring_layout(
+        G.to_networkx(attrs=False),
+        seed=seed,
+        k=k,
+        iterations=iterations,
+        pos=anchors or None,
+        fixed=persons or None
+    )
+    # se conserva el dtype de NetworkX (float32 en grafos de 500+ nodos)
+    return np.array([pos[i] for i in range(G.n_nodes)]).reshape(-1, 2)
+
+
+# ----------------------------
+# Motor Barnes–Hut (quadtree vectorizado)
+# ----------------------------
+def _repulsion(P, k2, targets=None):
+    """
+    Fuerza de repulsión k² · m / d (dirección unitaria) sobre cada nodo de
+    targets (default: todos), aproximada con el quadtree por niveles. Los
+    centros de masa se arman con todos los nodos; solo se evalúa en targets.
+    """
+    n = len(P)
+    if targets is None:
+        targets = np.arange(n)
+    F = np.zeros((len(targets), 2))
+    if n < 2 or not len(targets):
+        return F
+    lo = P.min(axis=0)
+    span = max(float((P.max(axis=0) - lo).max()), 1e-9) * (1 + 1e-9)
+    depth = int(min(MAX_DEPTH, max(2, math.ceil(math.log(n, 4)))))
+    side = 1 << depth
+    leaf = np.minimum(((P - lo) / span * side).astype(np.int64), side - 1)
+    leaf_t = leaf[targets]
+    P_t = P[targets]
+
+    def far_field(base, own, centers, mass, comx, comy, s, dx, dy):
+        """Aporte de la celda base + (dx, dy) si no es adyacente a la propia"""
+        tx, ty = base[0] + dx, base[1] + dy
+        valid = (tx >= 0) & (tx < s) & (ty >= 0) & (ty < s)
+        valid &= (np.abs(tx - own[0]) > 1) | (np.abs(ty - own[1]) > 1)
+        t = np.where(valid, tx * s + ty, 0)
+        m = np.where(valid, mass[t], 0.0)
+        ddx = centers[:, 0] - comx[t]
+        ddy = centers[:, 1] - comy[t]
+        d2 = np.maximum(ddx * ddx + ddy * ddy, MIN_DISTANCE ** 2)
+        f = k2 * m / d2
+        return ddx * f, ddy * f
+
+    # Campo lejano por niveles, evaluado en el centro de masa de cada celda
+    for L in range(2, depth + 1):
+        s = 1 << L
+        shift = depth - L
+        cid = (leaf[:, 0] >> shift) * s + (leaf[:, 1] >> shift)
+        cid_t = (leaf_t[:, 0] >> shift) * s + (leaf_t[:, 1] >> shift)
+        mass = np.bincount(cid, minlength=s * s).astype(float)
+        comx = np.bincount(cid, weights=P[:, 0], minlength=s * s)
+        comy = np.bincount(cid, weights=P[:, 1], minlength=s * s)
+        occ = np.flatnonzero(mass)
+        comx[occ] /= mass[occ]
+        comy[occ] /= mass[occ]
+        cells = np.unique(cid_t)  # solo las celdas con nodos a evaluar
+        ox, oy = cells // s, cells % s
+        centers = np.column_stack([comx[cells], comy[cells]])
+        fx = np.zeros(len(cells))
+        fy = np.zeros(len(cells))
+        base = (2 * (ox >> 1), 2 * (oy >> 1))
+        for dx in range(-2, 4):
+            for dy in range(-2, 4):
+                ax, ay = far_field(base, (ox, oy), centers, mass, comx, comy, s, dx, dy)
+                fx += ax
+                fy += ay
+        pos_in_cells = np.searchsorted(cells, cid_t)
+        F[:, 0] += fx[pos_in_cells]
+        F[:, 1] += fy[pos_in_cells]
+
+    # Campo cercano: las 9 celdas vecinas del nivel más fino (sin el propio nodo)
+    s = side
+    cid = leaf[:, 0] * s + leaf[:, 1]
+    mass = np.bincount(cid, minlength=s * s).astype(float)
+    sumx = np.bincount(cid, weights=P[:, 0], minlength=s * s)
+    sumy = np.bincount(cid, weights=P[:, 1], minlength=s * s)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            tx, ty = leaf_t[:, 0] + dx, leaf_t[:, 1] + dy
+            valid = (tx >= 0) & (tx < s) & (ty >= 0) & (ty < s)
+            t = np.where(valid, tx * s + ty, 0)
+            m = np.where(valid, mass[t], 0.0)
+            sx, sy = sumx[t], sumy[t]
+            if dx == 0 and dy == 0:  # se quita el propio nodo de su celda
+                m = m - 1
+                sx, sy = sx - P_t[:, 0], sy - P_t[:, 1]
+            has = m > 0
+            mm = np.where(has, m, 1.0)
+            ddx = np.where(has, P_t[:, 0] - sx / mm, 0.0)
+            ddy = np.where(has, P_t[:, 1] - sy / mm, 0.0)
+            d2 = np.maximum(ddx * ddx + ddy * ddy, MIN_DISTANCE ** 2)
+            f = np.where(has, k2 * m / d2, 0.0)
+            F[:, 0] += ddx * f
+            F[:, 1] += ddy * f
+    return F
+
+
+def _relax(G, P, movable, k, iterations, t):
+    """
+    Iteraciones de Fruchterman–Reingold que solo mueven los nodos 'movable'
+    (índices); el resto queda fijo pero sigue aportando fuerzas. La
+    temperatura (paso máximo) baja linealmente desde t.
+    """
+    n = G.n_nodes
+    k2 = k * k
+    src, dst, _ = G.edges()
+    is_movable = np.zeros(n, dtype=bool)
+    is_movable[movable] = True
+    touch = is_movable[src] | is_movable[dst]
+    src, dst = src[touch], dst[touch]
+    dt = t / (iterations + 1)
+    for _ in range(iterations):
+        F = np.zeros((n, 2))
+        F[movable] = _repulsion(P, k2, movable)
+        # atracción k: d² / k a lo largo de cada arista (en ambos extremos)
+        d = P[src] - P[dst]
+        dist = np.maximum(np.sqrt((d * d).sum(axis=1)), MIN_DISTANCE)
+        a = d * (dist / k)[:, None]
+        for j in (0, 1):
+            F[:, j] -= np.bincount(src, weights=a[:, j], minlength=n)
+            F[:, j] += np.bincount(dst, weights=a[:, j], minlength=n)
+        F = F[movable]
+        length = np.maximum(np.sqrt((F * F).sum(axis=1)), MIN_DISTANCE)
+        P[movable] += F * (np.minimum(length, t) / length)[:, None]
+        t -= dt
+    return P
+
+
+def _initial_positions(G, anchors, rng):
+    """
+    Cada nodo libre arranca en el promedio de las personas a las que está
+    enlazado (más ruido); los que no tocan personas, al azar.
+    """
+    n = G.n_nodes
+    P = np.zeros((n, 2))
+    if anchors:
+        idx = np.fromiter(anchors, dtype=np.int64, count=len(anchors))
+        P[idx] = np.array([anchors[i] for i in idx.tolist()], dtype=float)
+        lo, hi = P[idx].min(axis=0) - 1.0, P[idx].max(axis=0) + 1.0
+    else:
+        lo, hi = np.zeros(2), np.ones(2)
+
+    src, dst, _ = G.edges()
+    is_person = G.node_type == KIND_PERSON
+    other = np.concatenate([src[is_person[dst]], dst[is_person[src]]])
+    person = np.concatenate([dst[is_person[dst]], src[is_person[src]]])
+    cnt = np.bincount(other, minlength=n).astype(float)
+    sx = np.bincount(other, weights=P[person, 0], minlength=n)
+    sy = np.bincount(other, weights=P[person, 1], minlength=n)
+    linked = (cnt > 0) & ~is_person
+    free = ~is_person
+    noise = rng.random((n, 2))
+    init = lo + noise * (hi - lo)
+    init[linked, 0] = sx[linked] / cnt[linked] + (noise[linked, 0] - 0.5)
+    init[linked, 1] = sy[linked] / cnt[linked] + (noise[linked, 1] - 0.5)
+    P[free] = init[free]
+    if not anchors:
+        P[is_person] = init[is_person]
+    return P
+
+
+def barnes_hut_layout(G, anchors=None, k=None, iterations=80, seed=0):
+    """
+    Fruchterman–Reingold con repulsión aproximada por quadtree.
+    - anchors: {nodo: (x, y)} fijos (personas)
+    - k: distancia ideal entre nodos (default: sqrt(área / n))
+    Devuelve un array n × 2 en el orden de G.
+    """
+    anchors = anchors or {}
+    n = G.n_nodes
+    rng = np.random.default_rng(seed)
+    P = _initial_positions(G, anchors, rng)
+    if n < 2:
+        return P
+
+    fixed = np.zeros(n, dtype=bool)
+    fixed[list(anchors)] = True
+    span = float((P.max(axis=0) - P.min(axis=0)).max()) or 1.0
+    if k is None:
+        k = span / math.sqrt(n)
+    return _relax(G, P, np.flatnonzero(~fixed), k, iterations, 0.1 * span)
+
+
+# ----------------------------
+# Entrada común para los renderers
+# ----------------------------
+def choose_engine(G, engine="auto"):
+    if engine == "auto":
+        return "spring" if G.n_nodes <= SPRING_MAX_NODES else "barnes-hut"
+    return engine
+
+
+def _effective_k(G, k, engine):
+    if engine == "barnes-hut" and G.n_nodes > SPRING_MAX_NODES:
+        return k * math.sqrt(SPRING_MAX_NODES / G.n_nodes)
+    return k
+
+
+def compute_layout(G, seed, k=0.45, iterations=80, engine="auto", cache=None, radius=3.2):
+    """
+    Posiciones (array n × 2) del CSRGraph con las personas ancladas en círculo.
+    Con cache (LayoutCache) se reutilizan las de una ejecución anterior.
+
+    En el motor barnes-hut k se reescala con sqrt(SPRING_MAX_NODES / n) para
+    que el dibujo ocupe un área parecida a la de los grafos chicos.
+    """
+    engine = choose_engine(G, engine)
+    persons = G.nodes_of_type(KIND_PERSON).tolist()
+    anchors = anchored_person_positions(persons, radius=radius) if persons else {}
+    k = _effective_k(G, k, engine)
+
+    key = None
+    if cache is not None:
+        params = dict(engine=engine, seed=seed, k=k, iterations=iterations, radius=radius)
+        if engine == "spring":
+            import networkx as nx
+            params["networkx"] = nx.__version__
+        key = graph_hash(G, **params)
+        pos = cache.get(key)
+        if pos is not None and len(pos) == G.n_nodes:
+            return pos
+
+    if engine == "spring":
+        pos = spring_positions(G, anchors, k, iterations, seed)
+    else:
+        pos = barnes_hut_layout(G, anchors, k=k, iterations=iterations, seed=seed)
+    if key is not None:
+        cache.put(key, pos)
+    return pos
+
+
+# ----------------------------
+# Layout incremental
+# ----------------------------
+def node_signatures(G):
+    """
+    Firma de los vecinos de cada nodo (uint64): suma, módulo 2^64, de un hash
+    estable de la clave de cada vecino, distinto según el sentido de la
+    arista. No depende del orden de las aristas ni de los IDs internos.
+    """
+    n = G.n_nodes
+    h = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(G.node_key(i).encode("utf-8"), digest_size=8).digest(), "little")
+         for i in range(n)),
+        dtype=np.uint64, count=n)
+    src, dst, _ = G.edges()
+    sig = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        np.add.at(sig, src, h[dst] * _SIG_OUT)
+        np.add.at(sig, dst, h[src] * _SIG_IN)
+    return sig
+
+
+def save_layout_snapshot(path, G, pos):
+    keys = np.array([G.node_key(i) for i in range(G.n_nodes)], dtype=str)
+    tmp = path + ".tmp.npz"  # np.savez agrega .npz si falta
+    np.savez(tmp, keys=keys, pos=pos, sig=node_signatures(G), type=G.node_type)
+    os.replace(tmp, path)
+
+
+def load_layout_snapshot(path):
+    """Foto guardada por save_layout_snapshot ({keys, pos, sig, type}) o None"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {"keys": data["keys"].tolist(), "pos": data["pos"],
+                    "sig": data["sig"], "type": data["type"]}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def incremental_layout(G, snapshot, seed, k=0.45, iterations=INCREMENTAL_ITERATIONS,
+                       engine="auto", cache=None, radius=3.2):
+    """
+    Posiciones (array n × 2) partiendo de la foto anterior, y cuántos nodos
+    se movieron. Sin foto, o si cambió el conjunto de personas (cambian las
+    anclas), se hace un layout completo con compute_layout.
+    """
+    n = G.n_nodes
+    keys = [G.node_key(i) for i in range(n)]
+    is_person = G.node_type == KIND_PERSON
+    if snapshot is not None:
+        prev_persons = {key for key, t in zip(snapshot["keys"], snapshot["type"].tolist()) if t == KIND_PERSON}
+    if snapshot is None or prev_persons != {keys[p] for p in np.flatnonzero(is_person).tolist()}:
+        return compute_layout(G, seed, k=k, engine=engine, cache=cache, radius=radius), n
+
+    prev_index = {key: i for i, key in enumerate(snapshot["keys"])}
+    prev_i = np.fromiter((prev_index.get(key, -1) for key in keys), dtype=np.int64, count=n)
+    known = prev_i >= 0
+    sig = node_signatures(G)
+    same = known & (snapshot["sig"][np.maximum(prev_i, 0)] == sig)
+    if same.all():
+        return snapshot["pos"][prev_i], 0
+
+    # Se relajan los nodos nuevos o con otros vecinos, y sus vecinos (no personas)
+    changed = ~same & ~is_person
+    src, dst, _ = G.edges()
+    movable = changed.copy()
+    movable[dst[changed[src]]] = True
+    movable[src[changed[dst]]] = True
+    movable &= ~is_person
+
+    P = np.zeros((n, 2))
+    P[known] = snapshot["pos"][prev_i[known]]
+    anchors = {p: tuple(P[p]) for p in np.flatnonzero(is_person).tolist()}
+    new = ~known
+    P[new] = _initial_positions(G, anchors, np.random.default_rng(seed))[new]
+
+    k = _effective_k(G, k, choose_engine(G, engine))
+    span = float((P.max(axis=0) - P.min(axis=0)).max()) or 1.0
+    P = _relax(G, P, np.flatnonzero(movable), k, iterations, 0.1 * span)
+    return P, int(movable.sum())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Etapa de render de los PNG.
+
+Cada figura es un trabajo (función de dibujo + argumentos) y los trabajos se
+reparten en un pool de procesos con el backend Agg de matplotlib (sin
+ventana). Cada proceso dibuja figuras completas, así que el PNG resultante es
+el mismo que dibujando en serie.
+
+Cada trabajo lleva una clave (render_key: hash del grafo, de las posiciones y
+de los parámetros de dibujo). Si la clave coincide con la de la ejecución
+anterior y el PNG sigue en la carpeta, no se vuelve a dibujar. Las claves se
+guardan en <out>/.render_hashes.json.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from layout_grafo import graph_hash
+
+MANIFEST = ".render_hashes.json"
+# Subir al cambiar el dibujo, para invalidar los PNG de ejecuciones anteriores
+RENDER_VERSION = 1
+
+
+class RenderJob:
+    """
+    Una figura a dibujar: fn(*args, **kwargs) escribe out_path.
+    - key: render_key de sus entradas
+    - cost: estimación del trabajo (p.ej. aristas); los caros se reparten primero
+    """
+
+    def __init__(self, out_path, key, fn, args=(), kwargs=None, cost=0):
+        self.out_path = out_path
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.cost = cost
+
+    def run(self):
+        self.fn(*self.args, **self.kwargs)
+
+
+def pyplot():
+    """matplotlib.pyplot con el backend Agg (matplotlib se importa recién al dibujar)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def render_key(G=None, positions=None, **params):
+    """sha1 del grafo (CSRGraph), las posiciones y los parámetros de dibujo"""
+    import matplotlib
+
+    h = hashlib.sha1()
+    if G is not None:
+        h.update(graph_hash(G).encode("ascii"))
+    if positions is not None:
+        positions = np.ascontiguousarray(positions)
+        h.update(f"{positions.dtype.str}{positions.shape}".encode("ascii"))
+        h.update(positions.tobytes())
+    h.update(repr(sorted(params.items())).encode("utf-8"))
+    h.update(f"{RENDER_VERSION}/{matplotlib.__version__}".encode("ascii"))
+    return h.hexdigest()
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# ----------------------------
+# Pool de procesos
+# ----------------------------
+_JOBS = None  # trabajos pendientes, por proceso
+
+
+def _set_jobs(jobs):
+    global _JOBS
+    _JOBS = jobs
+
+
+def _init_worker(jobs):
+    _set_jobs(jobs)
+    pyplot()
+
+
+def _run_job(i):
+    _JOBS[i].run()
+    return i
+
+
+def render_pngs(jobs, out_dir, workers=1, force=False):
+    """
+    Dibuja los trabajos cuya clave cambió (o todos con force=True).
+    - workers > 1: pool de procesos; con fork los procesos heredan los
+      trabajos, si no se les envían una vez al arrancar (no por trabajo, así
+      la tabla de símbolos compartida por los grafos se serializa una vez)
+    Devuelve (dibujados, omitidos) como listas de rutas.
+    """
+    manifest = {name: key for name, key in load_manifest(out_dir).items()
+                if os.path.exists(os.path.join(out_dir, name))}
+    todo, skipped = [], []
+    for job in jobs:
+        name = os.path.basename(job.out_path)
+        if not force and manifest.get(name) == job.key and os.path.exists(job.out_path):
+            skipped.append(job.out_path)
+        else:
+            todo.append(job)
+    todo.sort(key=lambda j: -j.cost)
+
+    done = []
+    try:
+        if workers <= 1 or len(todo) < 2:
+            for job in todo:
+                job.run()
+                done.append(job)
+        else:
+            _set_jobs(todo)
+            pyplot()  # antes del fork, así los procesos heredan matplotlib ya importado
+            inherit = multiprocessing.get_start_method() == "fork"
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo)),
+                                     initializer=None if inherit else _init_worker,
+                                     initargs=() if inherit else (todo,)) as ex:
+                for i in ex.map(_run_job, range(len(todo))):
+                    done.append(todo[i])
+    finally:
+        _set_jobs(None)
+        for job in done:
+            manifest[os.path.basename(job.out_path)] = job.key
+        save_manifest(out_dir, manifest)
+    return [job.out_path for job in done], skipped
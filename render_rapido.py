@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dibujo estático vectorizado con colecciones de matplotlib.
+
+nx.draw_networkx_edges con arrows=True crea un FancyArrowPatch por arista
+(cada uno con su propio recorte y transformación), lo que se vuelve muy lento
+y pesado en memoria con miles de aristas. Aquí:
+- todas las aristas de un estilo son un solo LineCollection
+- las puntas de flecha (opcionales) son un solo PolyCollection de triángulos,
+  dimensionados en pulgadas y ubicados en el borde del nodo destino
+- los nodos son un scatter por forma, con un color por nodo
+
+Con rasterized=True las colecciones se guardan como imagen dentro de salidas
+vectoriales (SVG/PDF), para que el archivo no crezca con cada arista.
+"""
+
+import numpy as np
+
+# Punta de flecha (puntos tipográficos), parecida a arrowstyle="-|>" de NetworkX
+ARROW_LENGTH = 5.0
+ARROW_HALF_WIDTH = 2.0
+
+
+def draw_nodes(ax, positions, nodes, marker, size, colors, alpha=1.0, rasterized=False, label=None):
+    """Un scatter para todos los nodos de una forma (size en puntos², como node_size)"""
+    if len(nodes) == 0:
+        return None
+    xy = positions[nodes]
+    return ax.scatter(xy[:, 0], xy[:, 1], s=size, c=colors, marker=marker, alpha=alpha,
+                      linewidths=0, zorder=2, rasterized=rasterized, label=label)
+
+
+def draw_edges(ax, positions, src, dst, width=0.5, alpha=1.0, color="k", rasterized=False):
+    """Todas las aristas como un solo LineCollection (segmentos centro a centro)"""
+    from matplotlib.collections import LineCollection
+
+    if len(src) == 0:
+        return None
+    segments = np.stack([positions[src], positions[dst]], axis=1)
+    lines = LineCollection(segments, linewidths=width, colors=color, alpha=alpha,
+                           zorder=1, rasterized=rasterized)
+    ax.add_collection(lines, autolim=False)
+    # Mismo margen que nx.draw_networkx_edges (5% del ancho/alto de las aristas)
+    lo, hi = segments.reshape(-1, 2).min(axis=0), segments.reshape(-1, 2).max(axis=0)
+    pad = 0.05 * (hi - lo)
+    ax.update_datalim([lo - pad, hi + pad])
+    ax.autoscale_view()
+    return lines
+
+
+def draw_arrowheads(ax, positions, src, dst, target_size, color="k", alpha=1.0,
+                    rasterized=False):
+    """
+    Puntas de flecha de las aristas src -> dst como un solo PolyCollection.
+    Cada triángulo se ancla en la posición del destino (offset en datos) y se
+    dibuja en pulgadas, retrocedido el radio del marcador destino
+    (target_size: puntos², escalar o por arista).
+
+    La dirección se calcula con la escala actual de los ejes, así que debe
+    llamarse con los límites y el tamaño de la figura ya definitivos
+    (después de tight_layout).
+    """
+    if len(src) == 0:
+        return None
+    from matplotlib.collections import PolyCollection
+
+    # Escala datos -> pulgadas de cada eje (los ejes no tienen aspecto igual)
+    fig = ax.figure
+    bbox = ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
+    (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+    scale = np.array([bbox.width / ((x1 - x0) or 1), bbox.height / ((y1 - y0) or 1)])
+
+    d = (positions[dst] - positions[src]) * scale
+    norm = np.hypot(d[:, 0], d[:, 1])
+    norm[norm == 0] = 1
+    u = d / norm[:, None]                  # dirección (pulgadas)
+    v = np.stack([-u[:, 1], u[:, 0]], axis=1)  # normal
+
+    radius = np.sqrt(np.broadcast_to(np.asarray(target_size, dtype=float), (len(src),))) / 2 / 72
+    tip = -u * radius[:, None]
+    base = tip - u * (ARROW_LENGTH / 72)
+    half = v * (ARROW_HALF_WIDTH / 72)
+    verts = np.stack([tip, base + half, base - half], axis=1)
+
+    heads = PolyCollection(verts, offsets=positions[dst], offset_transform=ax.transData,
+                           transform=fig.dpi_scale_trans, facecolors=color, edgecolors="none",
+                           alpha=alpha, zorder=1, rasterized=rasterized)
+    ax.add_collection(heads, autolim=False)
+    return heads
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Motor de reportes de analizar_datos_sociales.
+
+build_report calcula una sola vez todos los agregados (conteos, conexiones
+mutuas, entidades compartidas por todos y por cada par) en un ReportData que
+comparten el reporte en archivo y los análisis de consola:
+- los IDs se ordenan por nombre con un rango precalculado (name_ranks), así
+  ordenar una lista es un argsort de enteros en lugar de comparar strings
+- donde solo se muestra un prefijo ("primeros 5") se seleccionan los k
+  primeros con argpartition, sin ordenar el set completo
+- los nombres se recuperan recién al escribir cada sección
+
+Las secciones se generan de a una y se escriben por un buffer grande, en
+texto (mismo contenido que el reporte anterior) o en JSON Lines (un registro
+por persona, par o lista).
+"""
+
+import json
+
+import numpy as np
+
+from simbolos import SYMBOLS
+from indice import EntityIndex
+
+TOP_K = 5
+WRITE_BUFFER = 1 << 20
+RULE = "=" * 70
+THIN_RULE = "-" * 70
+
+
+def name_ranks(symbols=SYMBOLS):
+    """Posición de cada ID en el orden alfabético de los nombres (un solo sort de strings)"""
+    names = symbols.names
+    rank = np.empty(len(names), dtype=np.int32)
+    rank[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names), dtype=np.int32)
+    return rank
+
+
+def _ids(values):
+    return np.fromiter(values, dtype=np.int32, count=len(values))
+
+
+class ReportData:
+    """Agregados del reporte (IDs ya ordenados por nombre), calculados una vez"""
+
+    def __init__(self, persons, stats, topics, first, shared_all, pairs, top_k):
+        self.persons = persons        # nombres, en orden
+        self.stats = stats            # {persona: {followers, following, topics, mutual}} (conteos)
+        self.topics = topics          # {persona: IDs de tópicos ordenados}
+        self.first = first            # {"following"/"followers"/"mutual": {persona: primeros top_k IDs}}
+        self.shared_all = shared_all  # {"topics"/"following": IDs compartidos por todas}
+        self.pairs = pairs            # {categoría: {(i, j): IDs compartidos ordenados}} (i < j)
+        self.top_k = top_k
+
+    def pair_items(self, category):
+        """((persona_a, persona_b), IDs) de todos los pares i < j (generador), con array vacío si no comparten"""
+        shared = self.pairs[category]
+        empty = np.zeros(0, dtype=np.int32)
+        n = len(self.persons)
+        for i in range(n):
+            for j in range(i + 1, n):
+                yield (self.persons[i], self.persons[j]), shared.get((i, j), empty)
+
+    def shared_pairs_by_size(self, category):
+        """Pares con algo en común, de mayor a menor (empates en orden i < j)"""
+        shared = self.pairs[category]
+        items = [((self.persons[i], self.persons[j]), shared[(i, j)]) for i, j in sorted(shared)]
+        return sorted(items, key=lambda x: len(x[1]), reverse=True)
+
+
+def build_report(person_data, index=None, symbols=SYMBOLS, top_k=TOP_K):
+    """Todos los agregados del reporte y de los análisis de consola en una pasada"""
+    if index is None:
+        index = EntityIndex.from_person_data(person_data)
+    rank = name_ranks(symbols)
+
+    def ordered(ids):
+        return ids[np.argsort(rank[ids], kind="stable")]
+
+    def first_k(ids):
+        if len(ids) > top_k:
+            ids = ids[np.argpartition(rank[ids], top_k)[:top_k]]
+        return ordered(ids)
+
+    persons = sorted(person_data)
+    stats, topics = {}, {}
+    first = {"following": {}, "followers": {}, "mutual": {}}
+    for person in persons:
+        data = person_data[person]
+        mutual = data["followers"] & data["following"]
+        stats[person] = {
+            "followers": len(data["followers"]),
+            "following": len(data["following"]),
+            "topics": len(data["topics"]),
+            "mutual": len(mutual),
+        }
+        topics[person] = ordered(_ids(data["topics"]))
+        first["following"][person] = first_k(_ids(data["following"]))
+        first["followers"][person] = first_k(_ids(data["followers"]))
+        first["mutual"][person] = first_k(_ids(mutual))
+
+    shared_all = {}
+    if len(persons) > 1:
+        for category in ("topics", "following"):
+            shared_all[category] = ordered(_ids(index.shared_by_all(category)))
+    pairs = {category: {pair: ordered(np.asarray(ents, dtype=np.int32))
+                        for pair, ents in index.pairs(category).items()}
+             for category in ("topics", "following", "followers")}
+    return ReportData(persons, stats, topics, first, shared_all, pairs, top_k)
+
+
+# ----------------------------
+# Salida de texto
+# ----------------------------
+def bullet_lines(ids, names, limit=None):
+    """Líneas "  • nombre" de los IDs (los primeros 'limit' si se indica)"""
+    return "".join(f"  • {names[i]}\n" for i in ids[:limit].tolist())
+
+
+def _header(title):
+    return "\n" + RULE + "\n" + title + "\n" + RULE + "\n"
+
+
+def text_sections(report, symbols=SYMBOLS):
+    """Secciones del reporte completo, como bloques de texto en orden"""
+    names = symbols.names
+    persons = report.persons
+    k = report.top_k
+    yield (RULE + "\nREPORTE COMPLETO DE ANÁLISIS SOCIAL - INSTAGRAM\n" + RULE + "\n\n"
+           f"Número de personas analizadas: {len(persons)}\n"
+           f"Personas: {', '.join(persons)}\n\n")
+
+    # Estadísticas generales
+    out = ["ESTADÍSTICAS GENERALES:\n", THIN_RULE + "\n"]
+    for person in persons:
+        s = report.stats[person]
+        out.append(f"\n{person.upper()}:\n"
+                   f"  Seguidores: {s['followers']}\n"
+                   f"  Siguiendo: {s['following']}\n"
+                   f"  Tópicos de interés: {s['topics']}\n"
+                   f"  Conexiones mutuas: {s['mutual']}\n")
+    yield "".join(out)
+
+    # Tópicos individuales completos
+    out = [_header("TÓPICOS/GUSTOS POR PERSONA (COMPLETO):")]
+    for person in persons:
+        topics = report.topics[person]
+        out.append(f"\n{person.upper()} - {len(topics)} tópicos:\n")
+        out.append(bullet_lines(topics, names) if len(topics) else "  (sin tópicos)\n")
+    yield "".join(out)
+
+    if "topics" in report.shared_all:
+        all_topics = report.shared_all["topics"]
+        yield (_header(f"TÓPICOS COMPARTIDOS POR TODAS LAS PERSONAS ({len(all_topics)}):")
+               + (bullet_lines(all_topics, names) if len(all_topics)
+                  else "\n(No hay tópicos compartidos por todas las personas)\n"))
+
+    yield _header("TÓPICOS/GUSTOS COMPARTIDOS ENTRE PARES:")
+    for (p1, p2), common in report.pair_items("topics"):
+        yield (f"\n{p1} ↔ {p2}: {len(common)} tópicos en común\n"
+               + (bullet_lines(common, names) if len(common) else "  (sin tópicos en común)\n"))
+
+    # Primeros k de cada persona
+    for category, title, line, empty in (
+            ("following", "CUENTAS QUE SIGUE CADA PERSONA", "sigue a {n} cuentas", "(no sigue a nadie)"),
+            ("followers", "SEGUIDORES DE CADA PERSONA", "{n} seguidores", "(sin seguidores)"),
+            ("mutual", "CONEXIONES MUTUAS POR PERSONA", "{n} conexiones mutuas", "(sin conexiones mutuas)")):
+        out = [_header(f"{title} (primeros {k}):")]
+        for person in persons:
+            n = report.stats[person][category]
+            out.append(f"\n{person.upper()} - {line.format(n=n)}:\n")
+            if n:
+                out.append(bullet_lines(report.first[category][person], names))
+                if n > k:
+                    out.append(f"  ... y {n - k} más\n")
+            else:
+                out.append(f"  {empty}\n")
+        yield "".join(out)
+
+    if "following" in report.shared_all:
+        all_following = report.shared_all["following"]
+        yield (_header(f"CUENTAS QUE TODAS LAS PERSONAS SIGUEN ({len(all_following)}):")
+               + (bullet_lines(all_following, names) if len(all_following)
+                  else "\n(No hay cuentas que todas las personas sigan)\n"))
+
+    for category, title, what in (("following", "CUENTAS SEGUIDAS EN COMÚN ENTRE PARES (COMPLETO):", "cuentas"),
+                                  ("followers", "SEGUIDORES COMPARTIDOS ENTRE PARES (COMPLETO):", "seguidores")):
+        yield _header(title)
+        for (p1, p2), common in report.pair_items(category):
+            yield (f"\n{p1} ↔ {p2}: {len(common)} {what} en común\n"
+                   + (bullet_lines(common, names) if len(common) else f"  (sin {what} en común)\n"))
+
+
+# ----------------------------
+# Salida JSON Lines
+# ----------------------------
+def jsonl_records(report, symbols=SYMBOLS):
+    """Un registro (dict) por persona, lista compartida por todas y par de personas"""
+    names = symbols.names
+
+    def listed(ids):
+        return [names[i] for i in ids.tolist()]
+
+    yield {"record": "summary", "persons": report.persons, "top_k": report.top_k}
+    for person in report.persons:
+        yield {"record": "person", "person": person, **report.stats[person],
+               "topic_names": listed(report.topics[person]),
+               **{f"first_{c}": listed(report.first[c][person]) for c in ("following", "followers", "mutual")}}
+    for category, ids in report.shared_all.items():
+        yield {"record": "shared_by_all", "category": category, "count": len(ids), "entities": listed(ids)}
+    for category in ("topics", "following", "followers"):
+        for (p1, p2), common in report.pair_items(category):
+            yield {"record": "pair", "category": category, "person_a": p1, "person_b": p2,
+                   "count": len(common), "entities": listed(common)}
+
+
+def write_report(report, path, fmt="text", symbols=SYMBOLS):
+    """Escribe el reporte (fmt: text o jsonl) sección por sección con un buffer grande"""
+    with open(path, "w", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        if fmt == "jsonl":
+            for record in jsonl_records(report, symbols):
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+        else:
+            for block in text_sections(report, symbols):
+                f.write(block)
+    return path
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tabla de símbolos: cada persona, cuenta y tópico normalizado recibe un ID
+entero denso una sola vez, al terminar la ingesta.
+
+Los conjuntos, grafos y similitudes trabajan con esos IDs; los nombres (y los
+prefijos "acc:" / "topic:" de las salidas) solo se recuperan al escribir.
+Personas, cuentas y tópicos tienen diccionarios separados, así que una cuenta
+y un tópico con el mismo texto reciben IDs distintos.
+"""
+
+from array import array
+
+KIND_PERSON, KIND_ACCOUNT, KIND_TOPIC = 0, 1, 2
+KIND_NAMES  = ("person", "account", "topic")
+KIND_PREFIX = ("", "acc:", "topic:")
+
+
+class SymbolTable:
+    def __init__(self):
+        self.names = []           # id -> nombre normalizado
+        self.kinds = array("B")   # id -> KIND_*
+        self._ids = ({}, {}, {})  # por tipo: nombre -> id
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, kind, name):
+        ids = self._ids[kind]
+        i = ids.get(name)
+        if i is None:
+            i = ids[name] = len(self.names)
+            self.names.append(name)
+            self.kinds.append(kind)
+        return i
+
+    def intern_many(self, kind, names):
+        """Set de IDs; se recorre en orden alfabético para que los IDs sean
+        reproducibles (el orden de un set de strings depende de PYTHONHASHSEED)."""
+        return {self.intern(kind, n) for n in sorted(names)}
+
+    @classmethod
+    def from_names(cls, names, kinds):
+        """Tabla con los nombres y tipos dados (ID = posición), p.ej. leída de un snapshot"""
+        table = cls()
+        table.names = names
+        table.kinds = array("B", kinds)
+        for i, (name, kind) in enumerate(zip(names, table.kinds)):
+            table._ids[kind][name] = i
+        return table
+
+    def restore(self, other):
+        """Toma el contenido de otra tabla (la persistida en un estado anterior)"""
+        if len(self):
+            raise ValueError("La tabla de símbolos ya tiene contenido; no se puede restaurar")
+        self.names, self.kinds, self._ids = other.names, other.kinds, other._ids
+
+    def lookup(self, kind, name):
+        return self._ids[kind].get(name)
+
+    def name(self, i):
+        return self.names[i]
+
+    def kind(self, i):
+        return self.kinds[i]
+
+    def kind_name(self, i):
+        return KIND_NAMES[self.kinds[i]]
+
+    def node_key(self, i):
+        """Identificador textual del nodo en las salidas ("acc:x", "topic:y", persona)"""
+        return KIND_PREFIX[self.kinds[i]] + self.names[i]
+
+    def sorted_names(self, ids):
+        return sorted(self.names[i] for i in ids)
+
+
+# Tabla global del proceso
+SYMBOLS = SymbolTable()
+
+
+def intern_blobs(person_blobs, symbols=SYMBOLS):
+    """
+    Convierte los blobs de la ingesta (sets de strings) a sets de IDs.
+    Con una tabla restaurada (estado incremental, snapshot) las personas
+    nuevas reciben IDs mayores que las existentes: el orden de los IDs no es
+    el de los nombres, y todo lo que necesita orden alfabético ordena por
+    blob["person"].
+    """
+    for blob in sorted(person_blobs, key=lambda b: b["person"]):
+        symbols.intern(KIND_PERSON, blob["person"])
+    return [{
+        "person": b["person"],
+        "person_id": symbols.lookup(KIND_PERSON, b["person"]),
+        "followers": symbols.intern_many(KIND_ACCOUNT, b["followers"]),
+        "following": symbols.intern_many(KIND_ACCOUNT, b["following"]),
+        "topics": symbols.intern_many(KIND_TOPIC, b["topics"]),
+    } for b in person_blobs]
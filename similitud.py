@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Similitud de Jaccard entre personas con matrices dispersas.
+
+Cada persona es una fila de la matriz de incidencia persona × entidad (las
+columnas son los IDs de la tabla de símbolos). Todas las intersecciones salen
+de un único producto X · Xᵀ y las uniones de las sumas por fila:
+
+    |A ∩ B| = (X Xᵀ)[a, b]
+    |A ∪ B| = |A| + |B| - |A ∩ B|
+"""
+
+import numpy as np
+
+
+def incidence_matrix(entity_sets, n_cols=None):
+    """Matriz CSR binaria (personas × entidades) a partir de sets de IDs"""
+    import scipy.sparse as sp
+
+    indptr = np.zeros(len(entity_sets) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(s) for s in entity_sets])
+    indices = np.fromiter((e for s in entity_sets for e in s), dtype=np.int64, count=int(indptr[-1]))
+    if n_cols is None:
+        n_cols = int(indices.max()) + 1 if indices.size else 0
+    data = np.ones(indices.size, dtype=np.int32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(entity_sets), n_cols))
+
+
+def jaccard_matrix(entity_sets, n_cols=None):
+    """
+    Matriz densa P×P de Jaccard. Dos conjuntos vacíos tienen similitud 0.0
+    (igual que jaccard_similarity).
+    """
+    X = incidence_matrix(entity_sets, n_cols)
+    sizes = np.asarray(X.sum(axis=1)).ravel()
+    inter = (X @ X.T).tocoo()
+
+    J = np.zeros((X.shape[0], X.shape[0]), dtype=float)
+    union = sizes[inter.row] + sizes[inter.col] - inter.data
+    J[inter.row, inter.col] = inter.data / np.maximum(union, 1)
+    return J
+
+
+# ----------------------------
+# Modo aproximado: MinHash + LSH por bandas
+# ----------------------------
+MINHASH_PRIME = (1 << 31) - 1  # primo de Mersenne; a·x + b cabe en uint64
+_EMPTY = np.uint64(MINHASH_PRIME)
+
+
+def minhash_signatures(entity_sets, num_perm=128, seed=1, block=1 << 16):
+    """
+    Firma MinHash (P × num_perm) con hashes universales h(x) = (a·x + b) mod p.
+    Un set vacío queda con todas sus posiciones en p (y se ignora en LSH).
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MINHASH_PRIME, size=num_perm, dtype=np.uint64)
+    sig = np.full((len(entity_sets), num_perm), _EMPTY, dtype=np.uint64)
+    for i, s in enumerate(entity_sets):
+        if not s:
+            continue
+        x = np.fromiter(s, dtype=np.uint64, count=len(s))
+        for start in range(0, x.size, block):
+            h = (np.outer(a, x[start:start + block]) + b[:, None]) % MINHASH_PRIME
+            np.minimum(sig[i], h.min(axis=1), out=sig[i])
+    return sig
+
+
+def lsh_params(num_perm, threshold):
+    """
+    (bandas, filas) con bandas·filas <= num_perm cuyo umbral efectivo
+    (1/bandas)^(1/filas) queda más cerca de 'threshold'.
+    """
+    best = None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        t = (1.0 / bands) ** (1.0 / rows)
+        if best is None or abs(t - threshold) < best[0]:
+            best = (abs(t - threshold), bands, rows)
+    return best[1], best[2]
+
+
+def lsh_candidate_pairs(sig, bands, rows):
+    """Pares (i, j), i < j, que coinciden en al menos una banda de la firma"""
+    valid = np.flatnonzero((sig != _EMPTY).any(axis=1))
+    pairs = set()
+    for band in range(bands):
+        chunk = np.ascontiguousarray(sig[valid, band * rows:(band + 1) * rows])
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        for g in np.flatnonzero(counts > 1):
+            members = valid[order[bounds[g]:bounds[g + 1]]]
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((int(members[x]), int(members[y])))
+    return pairs
+
+
+def approx_similar_pairs(entity_sets, num_perm=128, threshold=0.5, seed=1):
+    """
+    Lista dispersa [(i, j, jaccard_estimado)] de los pares con estimación
+    >= threshold, sin recorrer todas las parejas.
+    """
+    sig = minhash_signatures(entity_sets, num_perm=num_perm, seed=seed)
+    bands, rows = lsh_params(num_perm, threshold)
+    out = []
+    for i, j in sorted(lsh_candidate_pairs(sig, bands, rows)):
+        est = float(np.count_nonzero(sig[i] == sig[j])) / num_perm
+        if est >= threshold:
+            out.append((i, j, est))
+    return out
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Snapshot binario del grafo unificado, para arrancar sin releer los JSON.
+
+generar_grafos_instagram escribe out/.grafo_unificado.snap al terminar de
+armar el grafo; en las ejecuciones siguientes (de ese script o de
+analizar_datos_sociales) se abre con mmap y, si los JSON de --data no
+cambiaron, el grafo, la tabla de símbolos y los sets de cada persona salen de
+ahí sin parsear nada. Formato (little-endian, cada sección alineada a 8 bytes):
+
+    cabecera    MAGIC, versión, largo de meta, n_símbolos, bytes de nombres,
+                n_nodos, n_aristas (struct HEADER)
+    meta        JSON: huellas de los archivos de datos por persona
+    símbolos    offsets (uint64, n_símbolos + 1, en caracteres), nombres
+                (UTF-8 concatenados), tipo de cada símbolo (uint8)
+    nodos       node_ids (int64), node_type (uint8)
+    CSR         indptr (int64, n_nodos + 1), indices (int32), edge_type (uint8)
+
+Los arrays del grafo son vistas sobre el mmap (no se copian); solo los
+nombres se decodifican a la lista de la tabla de símbolos.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from grafo_csr import CSRGraph, EDGE_FOLLOWER, EDGE_FOLLOWING, EDGE_TOPIC
+from ingesta import file_fingerprint, fingerprints_fresh
+from simbolos import SYMBOLS, SymbolTable, KIND_PERSON
+
+SNAPSHOT_NAME = ".grafo_unificado.snap"
+MAGIC = b"IGSNAP\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQ")
+
+
+def snapshot_path(out_dir):
+    return os.path.join(out_dir, SNAPSHOT_NAME)
+
+
+def data_fingerprints(groups):
+    """{persona: {ruta absoluta: huella}} de los archivos de datos (tomar ANTES de parsear)"""
+    return {p: {os.path.abspath(f): file_fingerprint(f) for f in groups[p]} for p in sorted(groups)}
+
+
+def _pad(n):
+    return -n % 8
+
+
+def _sections(G):
+    """(nombre, array) de cada sección, en el orden del archivo"""
+    symbols = G.symbols
+    names = symbols.names
+    lengths = np.fromiter(map(len, names), dtype=np.uint64, count=len(names))
+    offsets = np.zeros(len(names) + 1, dtype=np.uint64)
+    np.cumsum(lengths, out=offsets[1:])
+    text = np.frombuffer("".join(names).encode("utf-8"), dtype=np.uint8)
+    return [
+        ("offsets", offsets),
+        ("names", text),
+        ("kinds", np.frombuffer(symbols.kinds, dtype=np.uint8)),
+        ("node_ids", np.ascontiguousarray(G.node_ids, dtype=np.int64)),
+        ("node_type", np.ascontiguousarray(G.node_type, dtype=np.uint8)),
+        ("indptr", np.ascontiguousarray(G.indptr, dtype=np.int64)),
+        ("indices", np.ascontiguousarray(G.indices, dtype=np.int32)),
+        ("edge_type", np.ascontiguousarray(G.edge_type, dtype=np.uint8)),
+    ]
+
+
+def write_snapshot(path, G, files):
+    """
+    Escribe el snapshot de G (CSRGraph, con su tabla de símbolos) junto con
+    las huellas 'files' ({persona: {ruta: huella}}) de los datos de los que salió.
+    """
+    meta = json.dumps({"files": files}, ensure_ascii=False).encode("utf-8")
+    sections = _sections(G)
+    header = HEADER.pack(MAGIC, VERSION, len(meta), len(G.symbols),
+                         len(sections[1][1]), G.n_nodes, G.n_edges)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(meta + b"\0" * _pad(len(header) + len(meta)))
+        for _, array in sections:
+            data = array.tobytes()
+            f.write(data + b"\0" * _pad(len(data)))
+    os.replace(tmp, path)
+    return path
+
+
+def _read(path):
+    """(meta, {sección: array sobre el mmap}) o None si el archivo no es un snapshot válido"""
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # no existe o está vacío
+        return None
+    if len(mm) < HEADER.size:
+        return None
+    magic, version, meta_len, n_symbols, names_bytes, n_nodes, n_edges = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    pos = HEADER.size
+    meta = json.loads(bytes(mm[pos:pos + meta_len]))
+    pos += meta_len + _pad(HEADER.size + meta_len)
+
+    layout = [("offsets", np.uint64, n_symbols + 1), ("names", np.uint8, names_bytes),
+              ("kinds", np.uint8, n_symbols), ("node_ids", np.int64, n_nodes),
+              ("node_type", np.uint8, n_nodes), ("indptr", np.int64, n_nodes + 1),
+              ("indices", np.int32, n_edges), ("edge_type", np.uint8, n_edges)]
+    arrays = {}
+    for name, dtype, count in layout:
+        size = np.dtype(dtype).itemsize * count
+        if pos + size > len(mm):
+            return None  # truncado
+        arrays[name] = np.frombuffer(mm, dtype=dtype, count=count, offset=pos)
+        pos += size + _pad(size)
+    return meta, arrays
+
+
+def _fresh(files, groups):
+    """¿Las personas y archivos de 'groups' son los mismos del snapshot, sin cambios?"""
+    if set(files) != set(groups):
+        return False
+    for person, paths in groups.items():
+        entry = {path: tuple(fp) for path, fp in files[person].items()}
+        if set(entry) != {os.path.abspath(p) for p in paths} or not fingerprints_fresh(entry)[0]:
+            return False
+    return True
+
+
+def load_symbols(arrays, symbols):
+    """Restaura en 'symbols' (vacía) la tabla guardada"""
+    text = arrays["names"].tobytes().decode("utf-8")
+    offsets = arrays["offsets"].tolist()
+    names = [text[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+    symbols.restore(SymbolTable.from_names(names, arrays["kinds"].tobytes()))
+
+
+def open_snapshot(path, groups, symbols=SYMBOLS):
+    """
+    CSRGraph del snapshot si existe y sus datos coinciden con 'groups'
+    ({persona: rutas}); restaura la tabla de símbolos en 'symbols'. None si
+    no hay snapshot, está desactualizado o 'symbols' ya tiene contenido.
+    """
+    if len(symbols):
+        return None
+    data = _read(path)
+    if data is None:
+        return None
+    meta, arrays = data
+    if not _fresh(meta["files"], groups):
+        return None
+    load_symbols(arrays, symbols)
+    return CSRGraph(arrays["node_ids"], arrays["node_type"], arrays["indptr"],
+                    arrays["indices"], arrays["edge_type"], symbols)
+
+
+def person_blobs_from_graph(G):
+    """
+    Blobs internados (mismo formato que simbolos.intern_blobs, ordenados por
+    persona) reconstruidos desde las aristas del grafo unificado.
+    """
+    src, dst, etype = G.edges()
+    ids = G.node_ids
+    # Aristas account -> persona agrupadas por persona (una sola pasada)
+    inbound = np.flatnonzero(etype == EDGE_FOLLOWER)
+    inbound = inbound[np.argsort(dst[inbound], kind="stable")]
+    bounds = np.searchsorted(dst[inbound], np.arange(G.n_nodes + 1))
+    blobs = []
+    for p in G.nodes_of_type(KIND_PERSON).tolist():
+        out = slice(G.indptr[p], G.indptr[p + 1])
+        out_ids, out_type = ids[G.indices[out]], G.edge_type[out]
+        blobs.append({
+            "person": G.label(p),
+            "person_id": int(ids[p]),
+            "followers": set(ids[src[inbound[bounds[p]:bounds[p + 1]]]].tolist()),
+            "following": set(out_ids[out_type == EDGE_FOLLOWING].tolist()),
+            "topics": set(out_ids[out_type == EDGE_TOPIC].tolist()),
+        })
+    return sorted(blobs, key=lambda b: b["person"])
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Escritura de las tablas de salida en CSV, Parquet o Arrow (IPC / Feather v2).
+
+En los formatos columnares:
+- las columnas indicadas (tipo, etiqueta, personas...) se guardan
+  codificadas por diccionario, así cada texto repetido se guarda una vez
+- con partition=<columna> las filas se ordenan por esa columna y cada valor
+  queda en sus propios row groups (Parquet) o record batches (Arrow); la
+  ubicación de cada valor se guarda en los metadatos del esquema, así
+  read_partition lee las filas de una persona sin recorrer el archivo
+- con partition=(<columna>, <otras>...) el orden lo da la primera y, para
+  cada una de las otras, los metadatos guardan en qué row groups aparece
+  cada valor. Es el caso de las tablas de pares (person_a, person_b), que
+  guardan cada par una vez con person_a < person_b: read_partition(path, p)
+  devuelve todas las filas donde p aparece en cualquiera de las columnas
+  (sus row groups como person_a más los que lo mencionan como person_b,
+  filtrados), así la última persona en orden alfabético también tiene
+  partición
+
+pyarrow es una dependencia opcional: solo se necesita (y se importa) para
+parquet/arrow.
+"""
+
+import importlib.util
+import json
+import os
+
+import numpy as np
+
+FORMATS = ("csv", "parquet", "arrow")
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+PARTITIONS_KEY = b"partitions"
+ROW_GROUP_SIZE = 1 << 20
+
+
+def columnar_available():
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _arrow():
+    """Módulos de pyarrow (pyarrow, compute, parquet), importados al usarse"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    return pa, pc, pq
+
+
+def table_path(out_dir, name, fmt):
+    return os.path.join(out_dir, name + EXTENSIONS[fmt])
+
+
+def _partition_slices(df, column):
+    """{valor: (inicio, filas)} de un DataFrame ya ordenado por column"""
+    values, starts, counts = np.unique(df[column].to_numpy(), return_index=True, return_counts=True)
+    return {str(v): (int(s), int(c)) for v, s, c in zip(values, starts, counts)}
+
+
+def _encode(table, columns):
+    _, pc, _ = _arrow()
+    for col in columns:
+        i = table.schema.get_field_index(col)
+        table = table.set_column(i, col, pc.dictionary_encode(table[col]))
+    return table
+
+
+def _secondary_groups(df, slices, groups, columns):
+    """{columna: {valor: [row groups donde aparece]}} de las columnas de partición secundarias"""
+    if not columns or not slices:
+        return {}
+    row_group = np.empty(len(df), dtype=np.int64)
+    for value, (start, rows) in slices.items():
+        row_group[start:start + rows] = groups[value][0] + np.arange(rows) // ROW_GROUP_SIZE
+    found = {}
+    for col in columns:
+        values = df[col].astype(str).to_numpy()
+        pairs = sorted(set(zip(values.tolist(), row_group.tolist())))
+        found[col] = {}
+        for value, group in pairs:
+            found[col].setdefault(value, []).append(group)
+    return found
+
+
+def write_table(df, path, fmt, partition=None, dictionary=()):
+    """
+    Escribe df en path con el formato indicado (csv sin índice, como el resto
+    de las salidas). partition es una columna o una tupla de columnas (la
+    primera ordena el archivo). Devuelve path.
+    """
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return path
+    if not columnar_available():
+        raise ImportError(f"El formato {fmt} requiere pyarrow (pip install pyarrow)")
+    pa, _, pq = _arrow()
+
+    if isinstance(partition, str):
+        partition = (partition,)
+    if partition:
+        df = df.sort_values(partition[0], kind="stable").reset_index(drop=True)
+        slices = _partition_slices(df, partition[0])
+    else:
+        slices = {}
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+
+    # Ubicación de cada partición: [primer row group / batch, cantidad]
+    groups, first = {}, 0
+    for value, (start, rows) in sorted(slices.items(), key=lambda kv: kv[1][0]):
+        count = max(1, -(-rows // ROW_GROUP_SIZE))
+        groups[value] = [first, count]
+        first += count
+    metadata = dict(table.schema.metadata or {})
+    metadata[PARTITIONS_KEY] = json.dumps(
+        {"column": partition[0] if partition else None, "groups": groups,
+         "also": _secondary_groups(df, slices, groups, partition[1:] if partition else ())},
+        ensure_ascii=False).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    tmp = path + ".tmp"
+    if fmt == "parquet":
+        # Diccionario por row group: cada uno guarda solo los valores que usa
+        parts = [_encode(table.slice(start, rows), dictionary)
+                 for start, rows in sorted(slices.values())] or [_encode(table, dictionary)]
+        with pq.ParquetWriter(tmp, parts[0].schema) as writer:
+            for part in parts:
+                writer.write_table(part, row_group_size=ROW_GROUP_SIZE)
+    else:
+        # El formato de archivo IPC exige un solo diccionario por columna
+        table = _encode(table, dictionary)
+        parts = [table.slice(start, rows) for start, rows in sorted(slices.values())] or [table]
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            for part in parts:
+                writer.write_table(part, max_chunksize=ROW_GROUP_SIZE)
+    os.replace(tmp, path)
+    return path
+
+
+def _partitions(schema):
+    raw = (schema.metadata or {}).get(PARTITIONS_KEY)
+    return json.loads(raw) if raw else {"column": None, "groups": {}}
+
+
+def _partition_groups(schema, value):
+    """(row groups / batches a leer para value, columnas secundarias donde filtrar)"""
+    meta = _partitions(schema)
+    first, count = meta["groups"].get(str(value), (0, 0))
+    indices = set(range(first, first + count))
+    also = {col: found[str(value)] for col, found in meta.get("also", {}).items() if str(value) in found}
+    for found in also.values():
+        indices.update(found)
+    return sorted(indices), [meta["column"], *also] if also else []
+
+
+def _filter(df, columns, value):
+    """Filas de df donde alguna de columns vale value (todas si columns está vacía)"""
+    if not columns:
+        return df
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        mask |= (df[col].astype(str) == str(value)).to_numpy()
+    return df[mask].reset_index(drop=True)
+
+
+def read_table(path):
+    """Tabla completa como DataFrame (csv, parquet o arrow según la extensión)"""
+    if path.endswith(".csv"):
+        import pandas as pd
+        return pd.read_csv(path)
+    pa, _, pq = _arrow()
+    if path.endswith(".parquet"):
+        return pq.read_table(path).to_pandas()
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def read_partition(path, value):
+    """
+    Filas donde alguna columna de partición vale value, de una tabla escrita
+    con write_table(partition=...), leyendo solo los row groups / batches que
+    lo contienen (DataFrame vacío si el valor no está).
+    """
+    pa, _, pq = _arrow()
+    if path.endswith(".parquet"):
+        f = pq.ParquetFile(path)
+        indices, columns = _partition_groups(f.schema_arrow, value)
+        return _filter(f.read_row_groups(indices).to_pandas(), columns, value)
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        indices, columns = _partition_groups(reader.schema, value)
+        batches = [reader.get_batch(i) for i in indices]
+        return _filter(pa.Table.from_batches(batches, reader.schema).to_pandas(), columns, value)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Estado persistido del grafo unificado para actualizaciones incrementales.
+
+Todas las aristas del grafo unificado tocan a una persona, así que el grafo es
+la unión de un bloque de aristas por persona (followers -> persona,
+persona -> following, persona -> tópicos). El estado guarda:
+- la tabla de símbolos (IDs estables entre ejecuciones)
+- el último parse (blob internado) y las huellas de archivo de cada persona
+- edge_blocks: persona -> (destinos, tipos) de su bloque de aristas, ya en el
+  orden del grafo unificado (por nombre dentro de cada tipo)
+- members: entidad -> personas que la tienen (nodos cuenta/tópico vivos)
+- shared: entidad -> pares de personas que la comparten (filas de
+  entidades_compartidas)
+- pair_counts: (persona_a, persona_b) -> |A ∩ B|, y sizes: persona -> |A|
+
+Agregar, reemplazar o quitar una persona aplica solo la diferencia entre su
+blob anterior y el nuevo: O(tamaño de la persona × personas que comparten cada
+entidad tocada), sin recorrer el resto de la cohorte. El solapamiento y las
+filas de similitud salen de pair_counts y sizes:
+
+    J(a, b) = |A ∩ B| / (|A| + |B| - |A ∩ B|)
+
+Lo que sigue siendo proporcional a la cohorte: unified_graph() concatena los
+bloques guardados (operaciones vectorizadas de NumPy, sin volver a ordenar
+nombres ni recorrer aristas en Python), overlap() emite todas las filas (el
+tamaño de la salida), y generar_grafos_instagram recalcula sobre el grafo
+completo la centralidad unificada y la exportación para Gephi, que dependen de
+todo el grafo.
+"""
+
+import os
+import pickle
+from collections import defaultdict
+
+import numpy as np
+
+from grafo_csr import CSRGraph, EDGE_FOLLOWER, EDGE_FOLLOWING, EDGE_TOPIC
+from ingesta import file_fingerprint, fingerprints_fresh, load_groups
+from simbolos import SYMBOLS, intern_blobs
+
+STATE_NAME = ".estado_unificado.pkl"
+
+
+def entity_set(blob):
+    return blob["followers"] | blob["following"] | blob["topics"]
+
+
+def edge_block(blob, symbols=SYMBOLS):
+    """
+    (destinos, tipos) de las aristas de una persona, en el mismo orden que
+    CSRGraph.from_blobs: followers, following y tópicos, cada uno por nombre
+    """
+    by_name = symbols.name
+    targets, types = [], []
+    for key, etype in (("followers", EDGE_FOLLOWER), ("following", EDGE_FOLLOWING), ("topics", EDGE_TOPIC)):
+        ids = sorted(blob[key], key=by_name)
+        targets += ids
+        types += [etype] * len(ids)
+    return np.array(targets, dtype=np.int64), np.array(types, dtype=np.uint8)
+
+
+class UnifiedState:
+    VERSION = 2
+
+    def __init__(self, symbols=SYMBOLS):
+        self.symbols = symbols
+        self.blobs = {}                       # persona -> blob internado
+        self.files = {}                       # persona -> {ruta: huella}
+        self.edge_blocks = {}                 # persona -> (destinos, tipos)
+        self.members = defaultdict(set)       # entidad -> {person_id}
+        self.shared = {}                      # entidad -> [(persona_a, persona_b)], a < b por nombre
+        self.pair_counts = defaultdict(int)   # (pid_a, pid_b), pid_a < pid_b -> |A ∩ B|
+        self.sizes = {}                       # persona -> |A|
+
+    # ----------------------------
+    # Persistencia
+    # ----------------------------
+    @classmethod
+    def load(cls, path, symbols=SYMBOLS):
+        """Estado guardado (restaura su tabla en 'symbols') o uno vacío"""
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return cls(symbols)
+        if data.get("version") != cls.VERSION:
+            return cls(symbols)
+        symbols.restore(data["symbols"])
+        state = cls(symbols)
+        state.blobs = data["blobs"]
+        state.files = data["files"]
+        state.edge_blocks = data["edge_blocks"]
+        state.shared = data["shared"]
+        state.members = defaultdict(set, data["members"])
+        state.pair_counts = defaultdict(int, data["pair_counts"])
+        state.sizes = data["sizes"]
+        return state
+
+    def save(self, path):
+        data = {
+            "version": self.VERSION,
+            "symbols": self.symbols,
+            "blobs": self.blobs,
+            "files": self.files,
+            "edge_blocks": self.edge_blocks,
+            "shared": self.shared,
+            "members": dict(self.members),
+            "pair_counts": dict(self.pair_counts),
+            "sizes": self.sizes,
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    # ----------------------------
+    # Deltas
+    # ----------------------------
+    def _pair(self, a, b):
+        return (a, b) if a < b else (b, a)
+
+    def _update_shared(self, e):
+        """Pares que comparten la entidad e (solo para las entidades tocadas)"""
+        members = self.members.get(e, ())
+        if len(members) < 2:
+            self.shared.pop(e, None)
+            return
+        names = sorted(self.symbols.name(q) for q in members)
+        self.shared[e] = [(names[x], names[y]) for x in range(len(names)) for y in range(x + 1, len(names))]
+
+    def _apply_delta(self, pid, old_entities, new_entities):
+        for e in old_entities - new_entities:
+            members = self.members[e]
+            members.discard(pid)
+            for q in members:
+                key = self._pair(pid, q)
+                self.pair_counts[key] -= 1
+                if not self.pair_counts[key]:
+                    del self.pair_counts[key]
+            if not members:
+                del self.members[e]
+            self._update_shared(e)
+        for e in new_entities - old_entities:
+            members = self.members[e]
+            for q in members:
+                self.pair_counts[self._pair(pid, q)] += 1
+            members.add(pid)
+            self._update_shared(e)
+
+    def upsert(self, blob, files=None):
+        """Agrega o reemplaza una persona (blob internado)"""
+        name = blob["person"]
+        old = self.blobs.get(name)
+        old_entities = entity_set(old) if old else set()
+        new_entities = entity_set(blob)
+        self._apply_delta(blob["person_id"], old_entities, new_entities)
+        self.blobs[name] = blob
+        self.edge_blocks[name] = edge_block(blob, self.symbols)
+        self.sizes[name] = len(new_entities)
+        if files is not None:
+            self.files[name] = files
+
+    def remove(self, name):
+        old = self.blobs.pop(name)
+        self._apply_delta(old["person_id"], entity_set(old), set())
+        self.sizes.pop(name, None)
+        self.files.pop(name, None)
+        self.edge_blocks.pop(name, None)
+
+    # ----------------------------
+    # Sincronización con la carpeta de datos
+    # ----------------------------
+    def refresh(self, groups, stream=False, cache=None, workers=1):
+        """
+        Sincroniza el estado con {persona: rutas}. Solo se parsean e internan
+        las personas nuevas o con archivos cambiados; las que ya no están se
+        quitan. Devuelve (cambiadas, quitadas).
+        """
+        changed = []
+        for person in sorted(groups):
+            paths = {os.path.abspath(p) for p in groups[person]}
+            files = self.files.get(person)
+            if files is None or set(files) != paths or not fingerprints_fresh(files)[0]:
+                changed.append(person)
+        removed = sorted(set(self.blobs) - set(groups))
+
+        for person in removed:
+            self.remove(person)
+        if changed:
+            fingerprints = {p: {os.path.abspath(f): file_fingerprint(f) for f in groups[p]} for p in changed}
+            parsed = load_groups({p: groups[p] for p in changed}, stream=stream, cache=cache,
+                                 workers=workers, fingerprints=fingerprints)
+            for blob in intern_blobs(parsed, self.symbols):
+                self.upsert(blob, fingerprints[blob["person"]])
+        return changed, removed
+
+    # ----------------------------
+    # Salidas
+    # ----------------------------
+    def person_blobs(self):
+        return [self.blobs[p] for p in sorted(self.blobs)]
+
+    def unified_graph(self):
+        """
+        CSRGraph en el mismo orden que una reconstrucción completa, armado
+        desde los bloques de aristas guardados: los nodos en orden de primera
+        aparición (persona y luego sus destinos, persona por persona).
+        """
+        persons = sorted(self.blobs)
+        if not persons:
+            return CSRGraph.from_blobs([], self.symbols)
+        blocks = [self.edge_blocks[p] for p in persons]
+        egos = np.array([self.blobs[p]["person_id"] for p in persons], dtype=np.int64)
+        lengths = np.array([len(t) for t, _ in blocks], dtype=np.int64)
+        targets = np.concatenate([t for t, _ in blocks])
+        etype = np.concatenate([e for _, e in blocks])
+
+        # Secuencia de apariciones: ego, destinos del ego, siguiente ego, ...
+        seq = np.empty(len(persons) + len(targets), dtype=np.int64)
+        ego_pos = np.arange(len(persons)) + np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        is_ego = np.zeros(len(seq), dtype=bool)
+        is_ego[ego_pos] = True
+        seq[is_ego] = egos
+        seq[~is_ego] = targets
+
+        uniq, first, inverse = np.unique(seq, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        rank = np.empty(len(uniq), dtype=np.int64)
+        rank[order] = np.arange(len(uniq))
+        local = rank[inverse]
+        node_ids = uniq[order]
+        node_type = np.frombuffer(self.symbols.kinds, dtype=np.uint8)[node_ids]
+
+        ego_local = np.repeat(local[is_ego], lengths)
+        target_local = local[~is_ego]
+        inbound = etype == EDGE_FOLLOWER
+        src = np.where(inbound, target_local, ego_local)
+        dst = np.where(inbound, ego_local, target_local)
+        return CSRGraph.from_edges(node_ids, node_type, src, dst, etype, self.symbols)
+
+    def overlap(self):
+        """Mismo formato que compute_person_overlap: (overlap_counts, shared_rows)"""
+        persons = sorted(self.blobs)
+        pid = {p: self.blobs[p]["person_id"] for p in persons}
+        overlap_counts = {}
+        for i in range(len(persons)):
+            for j in range(i + 1, len(persons)):
+                a, b = persons[i], persons[j]
+                overlap_counts[(a, b)] = self.pair_counts.get(self._pair(pid[a], pid[b]), 0)
+
+        shared_rows = []
+        for e, pairs in self.shared.items():
+            entity, kind = self.symbols.name(e), self.symbols.kind_name(e)
+            shared_rows += [{"person_a": a, "person_b": b, "entity": entity, "type": kind}
+                            for a, b in pairs]
+        return overlap_counts, shared_rows
+
+    def similarity_frame(self):
+        """Matriz de Jaccard (mismo formato que compute_similarity_matrix)"""
+        import pandas as pd
+
+        persons = sorted(self.blobs)
+        n = len(persons)
+        sizes = np.array([self.sizes[p] for p in persons], dtype=float)
+        inter = np.zeros((n, n), dtype=float)
+        index = {self.blobs[p]["person_id"]: i for i, p in enumerate(persons)}
+        for (a, b), c in self.pair_counts.items():
+            inter[index[a], index[b]] = inter[index[b], index[a]] = c
+        np.fill_diagonal(inter, sizes)
+        union = sizes[:, None] + sizes[None, :] - inter
+        J = np.divide(inter, np.maximum(union, 1))
+        return pd.DataFrame(J, index=persons, columns=persons, dtype=float)
+
+
+def state_path(out_dir):
+    return os.path.join(out_dir, STATE_NAME)